@@ -347,18 +347,8 @@ def WELCOME(game):
 
 def IS_INHABITED(game, RM):
     """Check if room is inhabited by a person"""
-    # Get the first object contained in the room
-    F = game.GET_FIRST_IN(RM)
-    if not F:
-        return False
-    
-    while True:
-        if game.IS_FSET(F, "PERSON"):
-            return True
-        # Get the next object also in the same container (room)
-        F = game.GET_NEXT_IN(F)
-        if not F:
-            return False
+    # The world keeps a per-room index of people, so no need to walk the room contents
+    return game.HEAD_COUNT(RM) > 0
         
 
 def WEST_DOOR_F(game, RARG=None):
@@ -3608,19 +3598,10 @@ def KITCHEN_WINDOW_F(game):
 
 def POPULATION(game, RM, PR=False):
     """Count and optionally print people in room"""
-    CNT = 0
-    OBJ = game.FIRST(RM)
-    if not OBJ:
-        return CNT
-    
-    while True:
-        if game.FSET(OBJ, "PERSON"):
-            CNT = CNT + 1
-            if PR:
-                game.DESCRIBE_PERSON(OBJ, "there")
-        OBJ = game.NEXT(OBJ)
-        if not OBJ:
-            return CNT
+    if PR:
+        for PERSON in game.OCCUPANTS(RM):
+            game.DESCRIBE_PERSON(PERSON, "there")
+    return game.HEAD_COUNT(RM)
 
 def SHED_WINDOW_F(game):
     """Shed window handler"""
@@ -4384,8 +4365,7 @@ def FOLLOWED(game, PERSON):
         return True
     elif game.HERE == "GUEST-ROOM":
         return False
-    elif game.BAND(game.GETP(L, "P?CORRIDOR"), 
-                    game.GETP(game.HERE, "P?CORRIDOR")) != 0:
+    elif game.CAN_SEE(L, game.HERE):
         return True
     else:
         return False
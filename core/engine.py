@@ -8,19 +8,29 @@
 #   this time.
 #   
 ###############################################################################
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, List, Callable
 from enum import Flag, auto, Enum
 import logging
+import functools
+import copy
+import time
 from pathlib import Path
 import json
 from dataclasses import dataclass
 
 from core.game_object import Manifest
 from world.world_manager import WorldManager
-from core.exceptions import GameException
+from world.fingerprint import mix64, name_key, state_fingerprint
+from world.symbols import SymbolRef
+from game_time.interrupts import Interrupt, InterruptScheduler
+from game_time.time_manager import TimeManager
+from core.exceptions import GameException, ObjectNotFoundError
+from core.tracing import Tracer
+from core.undo import UndoLog
+from core.rng import SessionRandom
+from game_io.output import MemorySink, OutputBuffer, OutputSink
+from game_io.save_system import SaveManager
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
     
@@ -56,12 +66,25 @@ class Engine:
         # Game subsystems (will be initialized separately)
         self.world_manager: WorldManager = None
         self.api: API = None
+        self.interrupts: InterruptScheduler = None
         self.parser = None
-        self.time_manager = None
+        self.time_manager: TimeManager = None
         self.command_processor = None
         self.interface = None
         self.save_manager = None
         
+        # Player output, flushed to its sink (stdout by default) once per turn
+        self.output: OutputBuffer = OutputBuffer()
+
+        # Recent API calls, when tracing is switched on
+        self.tracer: Tracer = Tracer()
+
+        # Reversible records of the last few turns (UNDO/REDO)
+        self.undo_log: Optional[UndoLog] = None
+
+        # Random numbers for RANDOM/PROB/PICK_ONE - every session has its own (see reseed)
+        self.rng: SessionRandom = SessionRandom()
+
         # Game data storage (XXX does this make sense?)
         self.game_data: Dict[str, Any] = {}
         
@@ -119,12 +142,16 @@ class Engine:
             # Initialize world manager
             self.world_manager = WorldManager(self.manifest, self.data_path)
             self.world_manager.initialize_world() # should deal with init failure
+            self.interrupts = InterruptScheduler(self.world_manager.function_registry)
+            self.time_manager = TimeManager(self.world_manager, self.interrupts)
 
             self.api = API(self)
+            self.save_manager = SaveManager(self)
+            self.undo_log = UndoLog(self.world_manager, self.interrupts)
+            self.undo_log.attach()
             # XXX porting starts here..
             # from parser.parser import GameParser
 
-            # from game_time.time_manager import TimeManager
             # from commands.base_command import CommandProcessor
             # from game_io.interface import GameInterface
             # from game_io.save_system import SaveManager
@@ -157,28 +184,224 @@ class Engine:
         except Exception as e:
             pass
 
+    def initialize_game(self) -> None:
+        """Set up the game's starting state by running the action module's init_globals"""
+        self.world_manager.function_registry["init_globals"](self.api)
+        self.output.flush()
+
+    def run_turn(self, command: str) -> bool:
+        """
+        Run one player turn - carry out the command, then run the clock (which flushes the turn's output).
+        XXX Until the parser and command processor are ported only WAIT [minutes] (and UNDO/REDO) is understood here.
+
+        Args:
+            command: The player's input line
+
+        Returns:
+            True if the command was understood
+        """
+        start = time.perf_counter()
+        words = command.lower().split()
+        understood = True
+
+        if words and words[0] in ("undo", "redo"):
+            done = self.undo() if words[0] == "undo" else self.redo()
+            if words[0] == "undo":
+                self.api.TELL("Undone." if done else "There is nothing to undo.")
+            else:
+                self.api.TELL("Redone." if done else "There is nothing to redo.")
+            self.api.FLUSH()
+            return True
+
+        self.undo_log.begin(self.api)
+        if self.command_processor is not None:
+            understood = self.command_processor.process(command)
+        elif words and words[0] in ("wait", "z"):
+            minutes = int(words[1]) if len(words) > 1 and words[1].isdigit() else 1
+            self.api.TELL("Time passes...")
+            if minutes > 1:
+                self.api.INT_WAIT(minutes - 1)
+        elif words:
+            self.api.TELL("I don't understand that.")
+            understood = False
+
+        if understood:
+            self.api.CLOCKER()
+        else:
+            self.api.FLUSH()
+        self.undo_log.end(self.api)
+
+        stats = self.performance_stats
+        stats['commands_processed'] += 1
+        stats['total_processing_time'] += time.perf_counter() - start
+        stats['average_response_time'] = stats['total_processing_time'] / stats['commands_processed']
+        return understood
+
+    def new_session(self, sink: Optional[OutputSink] = None, seed: Optional[int] = None) -> 'Engine':
+        """
+        Start another game session on this engine's loaded world.  The session gets a copy-on-write overlay
+        of the world state (see WorldManager.overlay) and its own clock, interrupts, output and API, so many
+        sessions can share one loaded world.  This engine's world is the shared base from then on and should
+        not be played itself.
+
+        Args:
+            sink: Where the session's output goes (stdout if not given)
+            seed: Seed for the session's random numbers (by default drawn from this engine's generator, so
+                  sessions opened in the same order from the same seed replay identically)
+
+        Returns:
+            An engine for the new session
+        """
+        rng = SessionRandom(seed) if seed is not None else self.rng.spawn()
+        return self._session(self.world_manager.overlay(), self.interrupts.copy(), sink, rng)
+
+    def fork(self, sink: Optional[OutputSink] = None) -> 'Engine':
+        """
+        Branch this session for a search or what-if simulation - the fork can play on and be thrown away
+        without affecting this one.  The cost is proportional to what the session has changed (see
+        WorldManager.fork).  Only sessions can be forked; fork a session from new_session() rather than the base.
+
+        Args:
+            sink: Where the fork's output goes (discarded if not given)
+
+        Returns:
+            An engine for the fork
+        """
+        if self.world_manager.base is None:
+            raise GameException("Only a session can be forked - start one with new_session()")
+        session = self._session(self.world_manager.fork(), self.interrupts.copy(),
+                                sink if sink else MemorySink(), SessionRandom(0))
+        session.restore_state(self.capture_state())
+        return session
+
+    def fingerprint(self) -> int:
+        """Stable 64-bit fingerprint of the game state, for recognising states already seen (world/fingerprint.py)"""
+        return state_fingerprint(self.world_manager, self.interrupts, (self.api.HERE, self.api.WINNER))
+
+    def _session(self, world: WorldManager, interrupts: InterruptScheduler,
+                 sink: Optional[OutputSink], rng: SessionRandom) -> 'Engine':
+        session = copy.copy(self)
+        session.rng = rng
+        session.world_manager = world
+        session.interrupts = interrupts
+        session.time_manager = TimeManager(world, interrupts)
+        session.output = OutputBuffer(sink)
+        session.tracer = Tracer()
+        session.performance_stats = dict(self.performance_stats)
+        session.api = API(session)
+        session.save_manager = SaveManager(session)
+        session.undo_log = UndoLog(world, interrupts)
+        session.undo_log.attach()
+        return session
+
+    def capture_session(self) -> Dict[str, Any]:
+        """
+        The mutable state of a session (see new_session) as plain, picklable data - what it has changed in
+        the world, its interrupts and clock, and the parser/player state.  Nothing shared with the base engine
+        is included, so the record is small.
+        """
+        record = self.capture_state()
+        record["world"] = self.world_manager.capture_delta()
+        return record
+
+    def restore_session(self, record: Dict[str, Any], sink: Optional[OutputSink] = None) -> 'Engine':
+        """
+        Rebuild a session from capture_session() data over this (base) engine.
+
+        Args:
+            record: Data returned by capture_session() on a session of this engine
+            sink: Where the restored session's output goes (stdout if not given)
+
+        Returns:
+            An engine for the restored session
+        """
+        world = self.world_manager.restore_delta(record["world"])
+        interrupts = InterruptScheduler.restore(self.interrupts.function_registry, record["interrupts"])
+        session = self._session(world, interrupts, sink, SessionRandom(0))
+        session.restore_state(record)
+        return session
+
+    def capture_state(self) -> Dict[str, Any]:
+        """Everything but the world state that a saved game or session needs - interrupts, clock, parser state"""
+        api = self.api
+        return {
+            "interrupts": self.interrupts.capture(),
+            "turns_skipped": self.time_manager.turns_skipped,
+            "state": self.state.name,
+            "api": {name: getattr(api, name) for name in API.SESSION_STATE},
+            "stats": dict(self.performance_stats),
+            "rng": (self.rng.initial_seed, self.rng.getstate()),
+        }
+
+    def restore_state(self, record: Dict[str, Any], interrupts: bool = False) -> None:
+        """
+        Put back what capture_state() recorded.
+
+        Args:
+            record: Data returned by capture_state()
+            interrupts: Also reload the interrupt queue (restore_session builds a new scheduler instead)
+        """
+        if interrupts:
+            self.interrupts.load(record["interrupts"])
+        self.time_manager.turns_skipped = record["turns_skipped"]
+        self.state = GameState[record["state"]]
+        for name, value in record["api"].items():
+            setattr(self.api, name, value)
+        self.performance_stats = dict(record["stats"])
+        if "rng" in record:                         # not in records written before sessions had their own
+            self.rng.initial_seed, state = record["rng"]
+            self.rng.setstate(state)
+
+    def reseed(self, seed: Optional[int]) -> None:
+        """Restart this engine's random numbers from a seed (None for a fresh random seed)"""
+        self.rng.seed(seed)
+
+    def set_tracing(self, enabled: bool) -> None:
+        """Start/stop recording the API primitives called by the action scripts into self.tracer"""
+        if enabled:
+            self.tracer.attach(self.api, lambda: self.interrupts.turn)
+        else:
+            self.tracer.detach()
+
+    def undo(self) -> bool:
+        """Take back the last turn (UNDO).  Returns False if there is nothing to undo."""
+        return self.undo_log.undo(self.api)
+
+    def redo(self) -> bool:
+        """Replay the last undone turn (REDO).  Returns False if there is nothing to redo."""
+        return self.undo_log.redo(self.api)
+
+    def save_game(self, filename: str) -> bool:
+        """
+        Save the game state  -  Equivalent to ZIL's SAVE routine
+        """
+        try:
+            return self.save_manager.save(filename)
+        except Exception as e:
+            logger.error(f"Save failed: {e}")
+            return False
+
     def load_game(self, filename: str) -> bool:
         """
         Load a saved game state  -  Equivalent to ZIL's RESTORE routine
         """
         try:
-            # XXX Nothing here - a lot of work to implement this
             print(f"Loading game from {filename}...")
-            return True
-            #return self.save_manager.load(filename)
+            return self.save_manager.load(filename)
         except Exception as e:
             logger.error(f"Load failed: {e}")
             return False
 
-    def start_game(self) -> None:
-        """Start the main game loop"""
+    def start_game(self, initialize: bool = True) -> None:
+        """Start the main game loop (initialize is False when a saved game was loaded)"""
         print("Starting game loop...")
 
         print("##############################################################################################")
         print("#\tTesting API calls and so on here...")
         print("##############################################################################################")
 
-        function = self.world_manager.function_registry.get("init_globals")(self.api)
+        if initialize:
+            self.initialize_game()
         
         print("AGGHHAA!!!")
         
@@ -192,8 +415,53 @@ class API:
     game state and provides the interface for game actions to interact with the game world.
     """
     
+    # Parser/player state that belongs to a session (saved with it)
+    SESSION_STATE = ("PRSO", "PRSI", "PRSA", "P_NUMBER", "WINNER", "HERE")
+
     def __init__(self, engine: Engine = None):
         self.engine = engine
+        self.world: WorldManager = engine.world_manager if engine else None
+        self.output: OutputBuffer = engine.output if engine else OutputBuffer()
+        self.rng: SessionRandom = engine.rng if engine else SessionRandom()
+
+        # Global slots and values, for the SETG/GETG fast path
+        self._global_slots: Dict[str, int] = self.world.globals.slots if self.world else {}
+        self._global_values: List[Any] = self.world.globals.values if self.world else []
+
+        # Parser state
+        self.PRSO: Optional[str] = None         # Direct object
+        self.PRSI: Optional[str] = None         # Indirect object
+        self.PRSA: Optional[str] = None         # Current action/verb
+        self.P_NUMBER: Optional[int] = None     # Parsed number
+
+        # Player state
+        self.WINNER: Optional[str] = None       # Current actor (usually the player)
+        self.HERE: Optional[str] = None         # Current location
+        if self.world and self.world.player:
+            self.WINNER = self.world.player.name
+            self.HERE = self.LOC(self.WINNER)
+
+    def __getattr__(self, name: str) -> Callable:
+        """
+        Action scripts call routines defined in the game's action modules (POPULATION, WINDOW_SHOP, ...) as
+        game.NAME(...) just like the built in primitives.  Anything that is not an API method is resolved from
+        the function registry, bound to this API and cached.
+        """
+        world = self.__dict__.get("world")
+        if world is None or name.startswith("_") or name not in world.function_registry:
+            raise AttributeError(f"{type(self).__name__} has no attribute {name}")
+
+        routine = functools.partial(world.function_registry[name], self)
+        self.__dict__[name] = routine
+        return routine
+
+    def _name(self, handle: int) -> Optional[str]:
+        """Handles are used internally, but names are what action scripts compare against"""
+        return self.world.name_of(handle)
+
+    def _flag(self, flag: Union[int, str]) -> int:
+        """Flag names are resolved to bit positions by the world's flag store"""
+        return self.world.flags.bit(flag)
 
     # ========== OUTPUT FUNCTIONS ==========
     def TELL(self, text: str, end: str = "\n") -> None:
@@ -205,15 +473,10 @@ class API:
             text: Text to output
             end: End character (default newline)
         """
-        try:
-            self.output_buffer.append(text)
-            if end == "\n":
-                print(''.join(self.output_buffer))
-                self.output_buffer.clear()
-            logger.debug(f"TELL: {text}")
-        except Exception as e:
-            logger.error(f"Error in TELL: {e}")
-            raise GameException(f"Output error: {e}")
+        write = self.output.write
+        write(text if isinstance(text, str) else str(text))
+        if end:
+            write(end)
     
     def TELL_N(self, number: Union[int, float]) -> None:
         """
@@ -223,49 +486,606 @@ class API:
         Args:
             number: Number to output
         """
+        self.output.write(str(number))
+
+    def N(self, number: Union[int, float]) -> None:
+        """Same as TELL_N - ZIL's N in a TELL"""
+        self.output.write(str(number))
+
+    def CRLF(self) -> None:
+        """
+        Output a newline.
+        Equivalent to ZIL's CRLF.
+        """
+        self.output.write("\n")
+
+    def D(self, obj_id: SymbolRef) -> str:
+        """
+        Short description of an object or room (its DESC).
+        Equivalent to ZIL's D in a TELL, but returns the text.
+        """
+        entity = self.world.lookup(obj_id) if obj_id else None
+        return entity.description if entity else ""
+
+    def TELL_D(self, obj_id: SymbolRef) -> None:
+        """
+        Output the short description of an object.
+        Equivalent to ZIL's PRINTD.
+        """
+        self.output.write(self.D(obj_id))
+
+    def FLUSH(self) -> str:
+        """
+        Send the output written so far to the session's sink.  Called at the end of each turn.
+
+        Returns:
+            The text that was sent
+        """
         try:
-            self.TELL(str(number), end="")
-            logger.debug(f"TELL_N: {number}")
+            return self.output.flush()
         except Exception as e:
-            logger.error(f"Error in TELL_N: {e}")
-            raise GameException(f"Output number error: {e}")
+            logger.error(f"Error flushing output: {e}")
+            raise GameException(f"Output error: {e}")
 
 
     # ========== GLOBAL VARIABLE FUNCTIONS ==========
-    def SETG(self, name: str, value: Any) -> None:
+    def SETG(self, name: SymbolRef, value: Any) -> None:
         """
         Set a global variable.
         Equivalent to ZIL's SETG.
         
         Args:
-            name: Variable name
+            name: Variable name or handle
             value: Value to set
         """
+        # Names with a slot (every literal name in the action modules) cannot fail
+        slot = self._global_slots.get(name)
+        if slot is not None:
+            self.world.set_global(slot, value)
+            return
+
         try:
-            self.engine.world_manager.global_vars[name] = value
-            logger.debug(f"SETG: {name} = {value}")
+            self.world.set_global(self.world.global_handle(name), value)
         except Exception as e:
             logger.error(f"Error setting global {name}: {e}")
             raise GameException(f"Cannot set global variable {name}: {e}")
+        self._rebind_globals()
     
-    def GETG(self, name: str, default: Any = None) -> Any:
+    def GETG(self, name: SymbolRef, default: Any = None) -> Any:
         """
         Get a global variable value.
         Equivalent to ZIL's GVAL.
         
         Args:
-            name: Variable name
+            name: Variable name or handle
             default: Default value if not found
             
         Returns:
             The global variable value or default
         """
+        slot = self._global_slots.get(name)
+        if slot is not None:
+            value = self._global_values[slot]
+            return default if value is None else value
+
         try:
-            value = self.engine.world_manager.global_objects.get(name, None)
-            logger.debug(f"GETG: {name} = {value}")
-            return value
+            value = self.world.get_global(self.world.global_handle(name), default)
         except Exception as e:
             logger.error(f"Error getting global {name}: {e}")
             raise GameException(f"Cannot get global variable {name}: {e}")
+        self._rebind_globals()
+        return value
+
+    def _rebind_globals(self) -> None:
+        """
+        A session's globals table copies its name index the first time it interns a new name (see
+        GlobalsTable.intern), so pick the current one up again after every slow path lookup.
+        """
+        self._global_slots = self.world.globals.slots
+        self._global_values = self.world.globals.values
+
+
+    # ========== FLAG FUNCTIONS ==========
+    def FSET(self, obj_id: SymbolRef, flag: Union[int, str]) -> None:
+        """
+        Set a flag on an object.
+        Equivalent to ZIL's FSET.
+        
+        Args:
+            obj_id: Object name or handle
+            flag: Flag name or bit position
+        """
+        try:
+            self.world.set_flag(self.world.handle(obj_id), self._flag(flag))
+        except Exception as e:
+            logger.error(f"Error setting flag {flag} on {obj_id}: {e}")
+            raise GameException(f"Cannot set flag: {e}")
+    
+    def FCLEAR(self, obj_id: SymbolRef, flag: Union[int, str]) -> None:
+        """
+        Clear a flag from an object.
+        Equivalent to ZIL's FCLEAR.
+        
+        Args:
+            obj_id: Object name or handle
+            flag: Flag name or bit position
+        """
+        try:
+            self.world.clear_flag(self.world.handle(obj_id), self._flag(flag))
+        except Exception as e:
+            logger.error(f"Error clearing flag {flag} on {obj_id}: {e}")
+            raise GameException(f"Cannot clear flag: {e}")
+    
+    def IS_FSET(self, obj_id: SymbolRef, flag: Union[int, str]) -> bool:
+        """
+        Check if an object has a flag set.
+        Equivalent to ZIL's FSET?.
+        
+        Args:
+            obj_id: Object name or handle
+            flag: Flag name or bit position
+            
+        Returns:
+            True if flag is set
+        """
+        try:
+            result = self.world.has_flag(self.world.handle(obj_id), self._flag(flag))
+            return result
+        except Exception as e:
+            logger.error(f"Error checking flag {flag} on {obj_id}: {e}")
+            return False
+    
+    def IS_SET(self, obj_id: SymbolRef, flag: Union[int, str]) -> bool:
+        """
+        Alias for IS_FSET for compatibility.
+        """
+        return self.IS_FSET(obj_id, flag)
+
+
+    # ========== OBJECT MANIPULATION FUNCTIONS ==========
+    def MOVE(self, obj_id: SymbolRef, dest_id: SymbolRef) -> None:
+        """
+        Move an object to a new location.
+        Equivalent to ZIL's MOVE.
+        
+        Args:
+            obj_id: Object to move (name or handle)
+            dest_id: Destination room or container (name or handle)
+        """
+        try:
+            self.world.move(self.world.handle(obj_id), self.world.handle(dest_id))
+        except Exception as e:
+            logger.error(f"Error moving {obj_id} to {dest_id}: {e}")
+            raise GameException(f"Cannot move object: {e}")
+    
+    def REMOVE(self, obj_id: SymbolRef) -> None:
+        """
+        Remove an object from play (move to nowhere).
+        Equivalent to ZIL's REMOVE.
+        
+        Args:
+            obj_id: Object to remove (name or handle)
+        """
+        try:
+            self.world.remove(self.world.handle(obj_id))
+        except Exception as e:
+            logger.error(f"Error removing {obj_id}: {e}")
+            raise GameException(f"Cannot remove object: {e}")
+    
+    def IN(self, obj_id: SymbolRef, location_id: SymbolRef) -> bool:
+        """
+        Check if an object is directly in a specific location.
+        Equivalent to ZIL's IN?.
+        
+        Args:
+            obj_id: Object to check (name or handle)
+            location_id: Location to check (name or handle)
+            
+        Returns:
+            True if object is in location
+        """
+        try:
+            return self.world.location_of(self.world.handle(obj_id)) == self.world.handle(location_id)
+        except Exception as e:
+            logger.error(f"Error checking IN({obj_id}, {location_id}): {e}")
+            return False
+
+    def IS_IN(self, obj_id: SymbolRef, location_id: SymbolRef) -> bool:
+        """
+        Alias for IN for compatibility.
+        """
+        return self.IN(obj_id, location_id)
+    
+    def LOC(self, obj_id: SymbolRef) -> Optional[str]:
+        """
+        Get the location of an object.
+        Equivalent to ZIL's LOC.
+        
+        Args:
+            obj_id: Object name or handle
+            
+        Returns:
+            Location name or None
+        """
+        try:
+            return self._name(self.world.location_of(self.world.handle(obj_id)))
+        except Exception as e:
+            logger.error(f"Error getting location of {obj_id}: {e}")
+            return None
+
+
+    def FIRST(self, container_id: SymbolRef) -> Optional[str]:
+        """
+        Get the first object in a container.
+        Equivalent to ZIL's FIRST?.
+        
+        Args:
+            container_id: Container or room name or handle
+            
+        Returns:
+            First object name or None
+        """
+        try:
+            return self._name(self.world.first_in(self.world.handle(container_id)))
+        except Exception as e:
+            logger.error(f"Error getting first object in {container_id}: {e}")
+            return None
+
+    def NEXT(self, obj_id: SymbolRef) -> Optional[str]:
+        """
+        Get the next sibling object in the same container.
+        Equivalent to ZIL's NEXT?.
+        
+        Args:
+            obj_id: Current object name or handle
+            
+        Returns:
+            Next object name or None
+        """
+        try:
+            return self._name(self.world.next_in(self.world.handle(obj_id)))
+        except Exception as e:
+            logger.error(f"Error getting next object after {obj_id}: {e}")
+            return None
+
+    def GET_FIRST_IN(self, container_id: SymbolRef) -> Optional[str]:
+        """
+        Alias for FIRST for compatibility.
+        """
+        return self.FIRST(container_id)
+
+    def GET_NEXT_IN(self, obj_id: SymbolRef) -> Optional[str]:
+        """
+        Alias for NEXT for compatibility.
+        """
+        return self.NEXT(obj_id)
+
+
+    def OCCUPANTS(self, room_id: SymbolRef) -> List[str]:
+        """
+        Get the people (PERSON objects) directly in a room.
+        
+        Args:
+            room_id: Room name or handle
+            
+        Returns:
+            List of person names, in the order they arrived
+        """
+        try:
+            return [self._name(person) for person in self.world.occupants(self.world.handle(room_id))]
+        except Exception as e:
+            logger.error(f"Error getting occupants of {room_id}: {e}")
+            return []
+
+    def HEAD_COUNT(self, room_id: SymbolRef) -> int:
+        """
+        Count the people (PERSON objects) directly in a room.
+        
+        Args:
+            room_id: Room name or handle
+            
+        Returns:
+            Number of people in the room
+        """
+        try:
+            return self.world.head_count(self.world.handle(room_id))
+        except Exception as e:
+            logger.error(f"Error counting people in {room_id}: {e}")
+            return 0
+
+
+    def IS_ACCESSIBLE(self, obj_id: SymbolRef, room_id: Optional[SymbolRef] = None) -> bool:
+        """
+        Check if an object can be referred to from a room - it is in the room (or visible inside something in
+        it), carried by the actor, one of the room's LOCAL-GLOBALS, or in GLOBAL-OBJECTS.
+        
+        Args:
+            obj_id: Object name or handle
+            room_id: Room name or handle (default HERE)
+            
+        Returns:
+            True if the object is in scope
+        """
+        try:
+            room = self.world.handle(room_id if room_id is not None else self.HERE)
+            return self.world.scope.in_scope(self.world.handle(obj_id), room, self.world.handle(self.WINNER))
+        except Exception as e:
+            logger.error(f"Error checking scope of {obj_id}: {e}")
+            return False
+
+    def SCOPE(self, room_id: Optional[SymbolRef] = None) -> List[str]:
+        """
+        Get everything that can be referred to from a room (see IS_ACCESSIBLE).
+        
+        Args:
+            room_id: Room name or handle (default HERE)
+            
+        Returns:
+            List of object names
+        """
+        try:
+            room = self.world.handle(room_id if room_id is not None else self.HERE)
+            return [self._name(handle) for handle in self.world.scope.handles(room, self.world.handle(self.WINNER))]
+        except Exception as e:
+            logger.error(f"Error getting scope of {room_id}: {e}")
+            return []
+
+
+    # ========== NPC MOVEMENT FUNCTIONS ==========
+    def ESTABLISH_GOAL(self, person: SymbolRef, room: SymbolRef, priority: bool = False) -> None:
+        """
+        Send a person toward a room, one step per turn along the shortest open route.
+        Equivalent to ZIL's ESTABLISH-GOAL.
+        
+        Args:
+            person: Person name or handle
+            room: Goal room name or handle
+            priority: Accepted for compatibility with the ZIL call sites
+        """
+        try:
+            self.world.establish_goal(self.world.handle(person), self.world.handle(room))
+        except Exception as e:
+            logger.error(f"Error establishing goal {room} for {person}: {e}")
+            raise GameException(f"Cannot establish goal: {e}")
+
+    def IN_MOTION(self, person: SymbolRef) -> bool:
+        """
+        Check if a person is on their way to a goal.
+        
+        Args:
+            person: Person name or handle
+            
+        Returns:
+            True if the person has a goal they have not reached
+        """
+        try:
+            return self.world.handle(person) in self.world.goals
+        except Exception as e:
+            logger.error(f"Error checking motion of {person}: {e}")
+            return False
+
+
+    # ========== INTERRUPT FUNCTIONS ==========
+    def _interrupt(self, event: Union[Interrupt, str]) -> Interrupt:
+        """ENABLE/DISABLE take what QUEUE/INT return, but a bare name is accepted too"""
+        return event if isinstance(event, Interrupt) else self.engine.interrupts.interrupt(event)
+
+    def QUEUE(self, event_name: str, turns: int) -> Interrupt:
+        """
+        Schedule an interrupt routine to run after a number of turns.
+        Equivalent to ZIL's QUEUE.
+
+        Args:
+            event_name: Interrupt name - "I-MAIL-2" runs I_MAIL_2
+            turns: Number of turns to wait, -1 for every turn, 0 to cancel
+
+        Returns:
+            The interrupt, for ENABLE/DISABLE
+        """
+        try:
+            event = self.engine.interrupts.queue(event_name, turns)
+            return event
+        except Exception as e:
+            logger.error(f"Error queueing event {event_name}: {e}")
+            raise GameException(f"Cannot queue event: {e}")
+
+    def INT(self, event_name: str) -> Interrupt:
+        """
+        Get an interrupt without changing its schedule.
+        Equivalent to ZIL's INT.
+        """
+        try:
+            return self.engine.interrupts.interrupt(event_name)
+        except Exception as e:
+            logger.error(f"Error getting interrupt {event_name}: {e}")
+            raise GameException(f"Cannot get interrupt: {e}")
+
+    def ENABLE(self, event: Union[Interrupt, str]) -> None:
+        """
+        Let an interrupt run (and count down) again.
+        Equivalent to ZIL's ENABLE.
+        """
+        try:
+            self.engine.interrupts.enable(self._interrupt(event))
+        except Exception as e:
+            logger.error(f"Error enabling event {event}: {e}")
+            raise GameException(f"Cannot enable event: {e}")
+
+    def DISABLE(self, event: Union[Interrupt, str]) -> None:
+        """
+        Stop an interrupt from running, keeping its remaining ticks.
+        Equivalent to ZIL's DISABLE.
+        """
+        try:
+            self.engine.interrupts.disable(self._interrupt(event))
+        except Exception as e:
+            logger.error(f"Error disabling event {event}: {e}")
+            raise GameException(f"Cannot disable event: {e}")
+
+    def CLOCKER(self) -> bool:
+        """
+        End of turn processing - advance the clock, move the NPCs and run the interrupts that are due.
+        Equivalent to ZIL's CLOCKER.
+
+        Returns:
+            True if any interrupt routine returned true
+        """
+        try:
+            result = self.engine.time_manager.turn(self)
+        except Exception as e:
+            logger.error(f"Error running interrupts: {e}")
+            raise GameException(f"Cannot run interrupts: {e}")
+        self.FLUSH()
+        return result
+
+    def INT_WAIT(self, turns: int) -> bool:
+        """
+        Let time pass, fast-forwarding over turns on which nothing happens.
+        Equivalent to ZIL's INT-WAIT.
+
+        Args:
+            turns: Number of turns (minutes) to wait
+
+        Returns:
+            True if the wait finished, False if an interrupt cut it short
+        """
+        try:
+            return self.engine.time_manager.wait(self, turns)
+        except Exception as e:
+            logger.error(f"Error waiting {turns} turns: {e}")
+            raise GameException(f"Cannot wait: {e}")
+
+    @property
+    def PRESENT_TIME(self) -> int:
+        """Time of day in minutes since midnight (the PRESENT-TIME global)"""
+        return self.engine.time_manager.present_time
+
+
+    def FINGERPRINT(self) -> int:
+        """
+        64-bit hash of the game state - object locations, flags, properties, globals, pending interrupts and
+        HERE/WINNER.  Kept up to date as the state changes (see world/fingerprint.py), so this is O(1); equal
+        states hash equally in every process.  Unlike Engine.fingerprint() it ignores the order of a
+        container's contents.
+        """
+        return (self.world.zobrist ^ self.engine.interrupts.zobrist ^
+                name_key(f"here:{self.HERE}") ^ mix64(name_key(f"winner:{self.WINNER}")))
+
+
+    # ========== CORRIDOR FUNCTIONS ==========
+    def CAN_SEE(self, room_id: SymbolRef, other_id: SymbolRef) -> bool:
+        """
+        Check if two rooms are the same or lie on a common corridor (their P?CORRIDOR masks share a bit).
+
+        Args:
+            room_id: Room name or handle
+            other_id: Room name or handle
+
+        Returns:
+            True if someone in one room can see into the other
+        """
+        try:
+            if not room_id or not other_id:
+                return False
+            return self.world.corridors.can_see(self.world.handle(room_id), self.world.handle(other_id))
+        except Exception as e:
+            logger.error(f"Error checking line of sight from {room_id} to {other_id}: {e}")
+            return False
+
+    def CORRIDOR_DIRECTION(self, room_id: SymbolRef, other_id: SymbolRef) -> Optional[str]:
+        """
+        Direction along the shared corridor from one room toward another, from the COR-n tables.
+
+        Args:
+            room_id: Room to look from
+            other_id: Room to look toward
+
+        Returns:
+            Direction property name (e.g. "P?WEST"), or None if the rooms do not share a corridor
+        """
+        try:
+            return self.world.corridors.direction(self.world.handle(room_id), self.world.handle(other_id))
+        except Exception as e:
+            logger.error(f"Error getting corridor direction from {room_id} to {other_id}: {e}")
+            return None
+
 
+    # ========== BIT FUNCTIONS ==========
+    def BAND(self, value: Optional[int], mask: Optional[int]) -> int:
+        """
+        Bitwise AND.  Equivalent to ZIL's BAND; a missing (None) operand counts as 0.
+        """
+        return (value or 0) & (mask or 0)
+
+
+    # ========== RANDOM FUNCTIONS ==========
+    def RANDOM(self, max_value: int) -> int:
+        """
+        Random number from 1 to max_value, from the session's own generator.
+        Equivalent to ZIL's RANDOM.
+        """
+        try:
+            return self.rng.randint(1, max_value)
+        except Exception as e:
+            logger.error(f"Error generating random number up to {max_value}: {e}")
+            raise GameException(f"Cannot generate random number up to {max_value}: {e}")
+
+    def PROB(self, percentage: int) -> bool:
+        """
+        True with the given percent chance.
+        Equivalent to ZIL's PROB.
+        """
+        return self.rng.randint(1, 100) <= percentage
 
+    def PICK_ONE(self, table: Union[str, List[Any]]) -> Any:
+        """
+        Random entry of a table - a list or the name of a global holding one.
+        Equivalent to ZIL's PICK-ONE.
+        """
+        entries = self.GETG(table) if isinstance(table, str) else table
+        if not entries:
+            logger.error(f"PICK_ONE of empty or missing table {table}")
+            raise GameException(f"Cannot pick from table {table}")
+        return entries[self.rng.randrange(len(entries))]
+
+
+    # ========== PROPERTY FUNCTIONS ==========
+    def GETP(self, obj_id: SymbolRef, prop_name: SymbolRef, default: Any = None) -> Any:
+        """
+        Get a property value from an object.
+        Equivalent to ZIL's GETP.
+        
+        Args:
+            obj_id: Object name or handle
+            prop_name: Property name ("P?CORRIDOR" or "CORRIDOR") or handle
+            default: Default value if not found
+            
+        Returns:
+            Property value or default
+        """
+        try:
+            prop = self.world.property_symbols.get(prop_name) if isinstance(prop_name, str) else prop_name
+            if prop is None:
+                return default
+            value = self.world.get_property(self.world.handle(obj_id), prop, default)
+            return value
+        except Exception as e:
+            logger.error(f"Error getting property {prop_name} from {obj_id}: {e}")
+            return default
+    
+    def PUTP(self, obj_id: SymbolRef, prop_name: SymbolRef, value: Any) -> None:
+        """
+        Set a property value on an object.
+        Equivalent to ZIL's PUTP.
+        
+        Args:
+            obj_id: Object name or handle
+            prop_name: Property name ("P?CORRIDOR" or "CORRIDOR") or handle
+            value: Property value
+        """
+        try:
+            prop = self.world.property_symbols.intern(prop_name) if isinstance(prop_name, str) else prop_name
+            self.world.put_property(self.world.handle(obj_id), prop, value)
+        except Exception as e:
+            logger.error(f"Error setting property {prop_name} on {obj_id}: {e}")
+            raise GameException(f"Cannot set property: {e}")
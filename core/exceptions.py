@@ -54,4 +54,8 @@ class ActionRegistryError(GameException):
 
 class AttributeNotFoundButInJSON(GameException):
     """Exception raised when deserializing a JSON file and finding that the corresponding class is missing an attribute"""
-    pass
\ No newline at end of file
+    pass
+
+class WorkerLostError(GameException):
+    """Exception raised when a session worker process has exited"""
+    pass
@@ -7,15 +7,12 @@
 ###############################################################################
 import json
 import logging
-import operator
 from typing import ClassVar, List, Dict, Optional, Callable, Any, Set
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
-from functools import reduce
 
 
-from core.flags import ObjectFlag
 from core.exceptions import ResourceLoadError
 
 
@@ -31,8 +28,6 @@ from core.exceptions import ResourceLoadError
 #if TYPE_CHECKING:  - avoid loops and type checking wanks
     #from .property_system import PropertyManager
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
@@ -47,7 +42,7 @@ class BaseObj:
     id: int = field(default_factory=lambda: BaseObj._getObjectID())     # Unique identifier
     name: str  = str()                                                  # Short name (DESC in ZIL)
     description: str = str()                                            # Long description (LDESC)
-    flags: ObjectFlag = ObjectFlag.NONE
+    flags: List[str] = field(default_factory=list)                     # Flag names as loaded (FLAGS), see FlagStore
     location: Optional['Object'] = None                                 # Where this object is (LOC)
 
     # Vocabulary - for parser matching
@@ -63,14 +58,6 @@ class BaseObj:
             BaseObj._classid += 1
             return BaseObj._classid
 
-    @staticmethod
-    def _parse_flags(flag_list):
-        if not flag_list:
-            return ObjectFlag.NONE
-        
-        flags = [ObjectFlag[flag] for flag in flag_list if flag in ObjectFlag.__members__]
-        return reduce(operator.or_, flags) if flags else ObjectFlag.NONE
-    
 
 @dataclass
 class Object(BaseObj) :
@@ -109,7 +96,7 @@ class Object(BaseObj) :
                 # Start with BaseObj attributes first
                 name=obj_id,
                 description=obj_data.get("description", ""),
-                flags=Object._parse_flags(obj_data.get("flags", [])),
+                flags=obj_data.get("flags") or [],
                 location=obj_data.get("location"),
                 synonyms=obj_data.get("synonyms", []),
                 adjectives=obj_data.get("adjectives", []),            
@@ -218,7 +205,7 @@ class Room(BaseObj):
             room = cls(
                 name=room_name,
                 description=room_data.get("description", ""),
-                flags=Room._parse_flags(room_data.get("flags", [])),
+                flags=room_data.get("flags") or [],
                 synonyms=room_data.get("synonyms", []),
                 adjectives=room_data.get("adjectives", []),   
                 action=room_data.get("action"),
@@ -252,11 +239,12 @@ class Room(BaseObj):
             elif isinstance(exit_info, dict):
                 exit_type = exit_info.get("type")
 
+                # rooms.json spells the keys out (destination, door_object...); accept the short forms too
                 if exit_type == "door":
                     exits[direction] = Door_Exit(
                         name=direction,
-                        dest=exit_info.get("dest", ""),
-                        door_obj=exit_info.get("door_obj", "")
+                        dest=exit_info.get("destination", exit_info.get("dest", "")),
+                        door_obj=exit_info.get("door_object", exit_info.get("door_obj", ""))
                     )
                 elif exit_type == "non_exit":
                     exits[direction] = Non_Exit(
@@ -266,9 +254,9 @@ class Room(BaseObj):
                 elif exit_type == "conditional":
                     exits[direction] = Conditional_Exit(
                         name=direction,
-                        dest=exit_info.get("dest", ""),
-                        cond_var=exit_info.get("cond_var", ""),
-                        message=exit_info.get("message", "You can't go that way.")
+                        dest=exit_info.get("destination", exit_info.get("dest", "")),
+                        cond_var=exit_info.get("condition_var", exit_info.get("cond_var", "")),
+                        message=exit_info.get("failure_message", exit_info.get("message", "You can't go that way."))
                     )
         return exits
 
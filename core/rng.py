@@ -0,0 +1,80 @@
+###############################################################################
+#   core/rng.py
+#
+#   Per-session random numbers for RANDOM, PROB and PICK_ONE.  Every
+#   session owns its own generator, so concurrent sessions do not disturb
+#   each other's sequences and a run replays exactly from its seed.  The
+#   generator is SplitMix64, whose whole state is one 64-bit int - cheap to
+#   put in saved games, hibernation records and forks (the Mersenne Twister
+#   behind the random module carries 2.5 KB of state).  It plugs into
+#   random.Random, so randint(), choice() and friends all work on it.
+#
+###############################################################################
+import os
+import random
+from typing import Optional
+
+from world.fingerprint import MASK64, mix64, name_key
+
+
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+class SessionRandom(random.Random):
+    """
+    Seedable SplitMix64 generator with a one-int state.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.state: int = 0
+        self.initial_seed: int = 0                  # the seed the generator was started from (for replays)
+        super().__init__(seed)
+
+
+    def seed(self, seed: Optional[int] = None, version: int = 2) -> None:
+        """Restart the sequence from a seed (a fresh random seed if None)"""
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "big")
+        elif not isinstance(seed, int):
+            seed = name_key(str(seed))              # not hash() - str hashes differ between processes
+        self.initial_seed = seed & MASK64
+        self.state = self.initial_seed
+
+
+    def _next(self) -> int:
+        self.state = (self.state + GOLDEN_GAMMA) & MASK64
+        return mix64(self.state)
+
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            return self._next() >> (64 - k) if k else 0
+        bits = 0
+        for _ in range((k + 63) // 64):
+            bits = (bits << 64) | self._next()
+        return bits >> (-k % 64)
+
+
+    def getstate(self) -> int:
+        return self.state
+
+
+    def setstate(self, state: int) -> None:
+        self.state = state
+
+
+    def spawn(self) -> 'SessionRandom':
+        """A generator for a new session, seeded from this one's sequence"""
+        return SessionRandom(self._next())
+
+
+    def child_seed(self, index: int) -> int:
+        """
+        Seed for the index-th session, from this generator's seed but not its sequence - for sessions opened in
+        forked workers, whose copies of the generator would otherwise all spawn the same seeds.
+        """
+        return mix64(self.initial_seed ^ mix64(index & MASK64))
@@ -0,0 +1,101 @@
+###############################################################################
+#   core/tracing.py
+#
+#   Tracing of the API primitives (TELL, SETG, MOVE ...) called by the
+#   action scripts.  The primitives themselves do no logging at all - when
+#   tracing is switched on every primitive on the API instance is shadowed
+#   by a wrapper that records (turn, primitive, args) into a ring buffer, and
+#   switching it off removes the wrappers again.  Nothing is formatted until
+#   the buffer is dumped, and an API that is not being traced pays nothing.
+#
+###############################################################################
+import functools
+import inspect
+import sys
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, TextIO
+
+
+class TraceEvent(NamedTuple):
+    """One recorded call to an API primitive"""
+    turn: int
+    primitive: str
+    args: tuple
+    kwargs: Dict[str, Any]
+
+
+class Tracer:
+    """
+    Ring buffer of the most recent API primitive calls.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.events: Deque[TraceEvent] = deque(maxlen=capacity)
+        self._api: Any = None
+        self._turn: Callable[[], int] = lambda: 0
+        self._wrapped: List[str] = []
+
+
+    @property
+    def enabled(self) -> bool:
+        return self._api is not None
+
+
+    @staticmethod
+    def primitives(api: Any) -> List[str]:
+        """Names of the API primitives - the upper case methods of its class"""
+        return [name for name, member in inspect.getmembers(type(api), inspect.isfunction) if name[:1].isupper()]
+
+
+    def attach(self, api: Any, turn: Optional[Callable[[], int]] = None) -> None:
+        """
+        Start recording every primitive called on an API instance.
+
+        Args:
+            api: The API to trace
+            turn: Returns the current turn number, recorded with each event
+        """
+        if self._api is not None:
+            self.detach()
+
+        self._api = api
+        self._turn = turn if turn else (lambda: 0)
+        for name in self.primitives(api):
+            setattr(api, name, self._wrap(name, getattr(api, name)))
+            self._wrapped.append(name)
+
+
+    def detach(self) -> None:
+        """Stop recording (the recorded events are kept)"""
+        if self._api is None:
+            return
+        for name in self._wrapped:
+            self._api.__dict__.pop(name, None)
+        self._wrapped.clear()
+        self._api = None
+
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        events = self.events
+        turn = self._turn
+
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            events.append(TraceEvent(turn(), name, args, kwargs))
+            return method(*args, **kwargs)
+
+        return traced
+
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+    def dump(self, out: TextIO = sys.stdout, last: Optional[int] = None) -> None:
+        """Write the recorded events (or the last few of them), oldest first"""
+        events = list(self.events)
+        if last is not None:
+            events = events[-last:]
+        for event in events:
+            args = [repr(arg) for arg in event.args] + [f"{key}={value!r}" for key, value in event.kwargs.items()]
+            out.write(f"[{event.turn:5}] {event.primitive}({', '.join(args)})\n")
@@ -0,0 +1,229 @@
+###############################################################################
+#   core/undo.py
+#
+#   UNDO / REDO.  Rather than copying the world every turn, each turn keeps
+#   a before-image of just the state it wrote: the world and the interrupt
+#   scheduler call touch_*() before each write, and the first touch of a
+#   handle, global slot or interrupt in a turn saves its old value.  When the
+#   turn ends the after-images of the same entries are read, so undoing or
+#   redoing a turn costs as much as the turn changed.  The occupancy of the
+#   containers a turn moved things into or out of is saved the same way.
+#   Both images are written back through WorldManager.apply_delta, which
+#   also brings the derived indexes up to date.
+#
+#   The log keeps the last max_turns turns and drops the oldest ones once
+#   their estimated size goes over max_bytes.
+#
+###############################################################################
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from core.engine import API
+    from game_time.interrupts import InterruptScheduler
+    from world.world_manager import WorldManager
+
+
+# Default limits
+UNDO_TURNS = 16
+UNDO_BYTES = 32 * 1024
+
+# Rough size of one saved entry (key, tuple and value references) - for the byte limit
+ENTRY_BYTES = 96
+
+
+class TurnRecord:
+    """Before/after images of everything one turn wrote"""
+
+    __slots__ = ("tree", "flags", "properties", "globals", "interrupts", "turn", "api", "goals", "occupancy",
+                 "after", "size")
+
+    def __init__(self, turn: int, api: Tuple, goals: Dict[int, int]):
+        self.tree: Dict[int, Tuple[int, int, int, int]] = {}    # handle -> (parent, first, next, prev)
+        self.flags: Dict[int, int] = {}                         # handle -> flag word
+        self.properties: Dict[int, Dict[int, Any]] = {}         # handle -> property dict
+        self.globals: Dict[int, Any] = {}                       # slot -> value
+        self.interrupts: Dict[str, Optional[Tuple]] = {}        # name -> scheduler state (None: did not exist)
+        self.turn: int = turn                                   # scheduler turn count
+        self.api: Tuple = api                                   # parser/player state
+        self.goals: Dict[int, int] = goals
+        self.occupancy: Dict[int, List[int]] = {}               # container handle -> occupants
+        self.after: Optional['TurnRecord'] = None
+        self.size: int = 0
+
+
+    def __len__(self) -> int:
+        return len(self.tree) + len(self.flags) + len(self.properties) + len(self.globals) + len(self.interrupts)
+
+
+class UndoLog:
+    """
+    Bounded ring buffer of reversible turn records, with a redo stack.
+    """
+
+    def __init__(self, world: 'WorldManager', interrupts: 'InterruptScheduler', max_turns: int = UNDO_TURNS,
+                 max_bytes: int = UNDO_BYTES):
+        self.world: 'WorldManager' = world
+        self.interrupts: 'InterruptScheduler' = interrupts
+        self.max_turns: int = max_turns
+        self.max_bytes: int = max_bytes
+        self.undo_stack: Deque[TurnRecord] = deque()
+        self.redo_stack: List[TurnRecord] = []
+        self.size: int = 0                                  # estimated bytes held by undo_stack
+        self.current: Optional[TurnRecord] = None           # turn being recorded
+
+
+    def attach(self) -> None:
+        """Start receiving touches from the world and the scheduler"""
+        self.world.undo_log = self
+        self.interrupts.undo_log = self
+
+
+    def detach(self) -> None:
+        self.world.undo_log = None
+        self.interrupts.undo_log = None
+
+
+    def clear(self) -> None:
+        """Forget the recorded turns (after a restore replaced the whole state)"""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.size = 0
+
+
+    # ========== RECORDING ==========
+    def touch_tree(self, handles: Tuple[int, ...]) -> None:
+        record = self.current
+        if record is None:
+            return
+        tree = self.world.tree
+        occupancy = self.world.occupancy
+        for handle in handles:
+            if handle not in record.tree:
+                record.tree[handle] = (tree.parent[handle], tree.first[handle], tree.next[handle], tree.prev[handle])
+            if handle not in record.occupancy:
+                record.occupancy[handle] = occupancy.occupants(handle)
+
+
+    def touch_flags(self, handle: int) -> None:
+        record = self.current
+        if record is not None and handle not in record.flags:
+            record.flags[handle] = self.world.flags.words[handle]
+            # A PERSON flag change moves the handle in or out of its container's occupants
+            container = self.world.tree.parent[handle]
+            if container not in record.occupancy:
+                record.occupancy[container] = self.world.occupancy.occupants(container)
+
+
+    def touch_property(self, handle: int) -> None:
+        record = self.current
+        if record is not None and handle not in record.properties:
+            record.properties[handle] = self.world.properties[handle]
+
+
+    def touch_global(self, slot: int) -> None:
+        record = self.current
+        if record is not None and slot not in record.globals:
+            record.globals[slot] = self.world.globals.values[slot]
+
+
+    def touch_interrupt(self, name: str) -> None:
+        record = self.current
+        if record is not None and name not in record.interrupts:
+            record.interrupts[name] = self.interrupts.state_of(name)
+
+
+    def begin(self, api: 'API') -> None:
+        """Start recording a turn"""
+        self.current = TurnRecord(self.interrupts.turn, self._api_state(api), dict(self.world.goals))
+
+
+    def end(self, api: 'API') -> None:
+        """Finish the turn being recorded - read its after-images and push it"""
+        record = self.current
+        self.current = None
+        if record is None:
+            return
+
+        after = self._image(record, api)
+        if not len(record) and after.turn == record.turn and after.api == record.api and after.goals == record.goals:
+            return
+        record.after = after
+        record.size = (2 * len(record) + 4) * ENTRY_BYTES
+
+        self.redo_stack.clear()
+        self.undo_stack.append(record)
+        self.size += record.size
+        while self.undo_stack and (len(self.undo_stack) > self.max_turns or self.size > self.max_bytes):
+            self.size -= self.undo_stack.popleft().size
+
+
+    def _api_state(self, api: 'API') -> Tuple:
+        return tuple(getattr(api, name) for name in api.SESSION_STATE)
+
+
+    def _image(self, record: TurnRecord, api: 'API') -> TurnRecord:
+        """The current values of the entries a record holds"""
+        world = self.world
+        tree = world.tree
+        image = TurnRecord(self.interrupts.turn, self._api_state(api), dict(world.goals))
+        image.tree = {handle: (tree.parent[handle], tree.first[handle], tree.next[handle], tree.prev[handle])
+                      for handle in record.tree}
+        image.flags = {handle: world.flags.words[handle] for handle in record.flags}
+        image.properties = {handle: world.properties[handle] for handle in record.properties}
+        image.globals = {slot: world.globals.values[slot] for slot in record.globals}
+        image.interrupts = {name: self.interrupts.state_of(name) for name in record.interrupts}
+        image.occupancy = {container: world.occupancy.occupants(container) for container in record.occupancy}
+        return image
+
+
+    # ========== UNDO / REDO ==========
+    def _apply(self, image: TurnRecord, api: 'API') -> None:
+        world = self.world
+        world.apply_delta({
+            "tree": [{handle: links[i] for handle, links in image.tree.items()} for i in range(4)],
+            "flag_names": None,
+            "flags": image.flags,
+            "properties": image.properties,
+            "global_names": None,
+            "globals": image.globals,
+            "goals": image.goals,
+            "occupancy": image.occupancy,
+        })
+        self.interrupts.turn = image.turn
+        for name, state in image.interrupts.items():
+            self.interrupts.put_state(name, state)
+        for name, value in zip(api.SESSION_STATE, image.api):
+            setattr(api, name, value)
+
+
+    def undo(self, api: 'API') -> bool:
+        """
+        Put the world back the way it was before the last recorded turn.
+
+        Returns:
+            False if there is nothing to undo
+        """
+        if not self.undo_stack:
+            return False
+        record = self.undo_stack.pop()
+        self.size -= record.size
+        self._apply(record, api)
+        self.redo_stack.append(record)
+        return True
+
+
+    def redo(self, api: 'API') -> bool:
+        """
+        Replay the last undone turn's changes.
+
+        Returns:
+            False if there is nothing to redo
+        """
+        if not self.redo_stack:
+            return False
+        record = self.redo_stack.pop()
+        self._apply(record.after, api)
+        self.undo_stack.append(record)
+        self.size += record.size
+        return True
@@ -11,11 +11,6 @@ from enum import Enum, auto
 from pathlib import Path
 import json
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
@@ -205,7 +200,6 @@ class Game:
                 self.output_buffer.clear()
             else:
                 print()
-            logger.debug("CRLF")
         except Exception as e:
             logger.error(f"Error in CRLF: {e}")
             raise GameException(f"Newline error: {e}")
@@ -259,7 +253,6 @@ class Game:
         """
         try:
             result = self.PRSA in verbs
-            logger.debug(f"VERB check: {verbs} -> {result} (current: {self.PRSA})")
             return result
         except Exception as e:
             logger.error(f"Error in VERB check: {e}")
@@ -292,7 +285,6 @@ class Game:
             obj = self._get_object_or_room(obj_id)
             if obj:
                 obj.flags.add(flag)
-                logger.debug(f"FSET: {obj_id}.{flag} = True")
             else:
                 raise ObjectNotFoundError(f"Object {obj_id} not found")
         except Exception as e:
@@ -312,7 +304,6 @@ class Game:
             obj = self._get_object_or_room(obj_id)
             if obj:
                 obj.flags.discard(flag)
-                logger.debug(f"FCLEAR: {obj_id}.{flag} = False")
             else:
                 raise ObjectNotFoundError(f"Object {obj_id} not found")
         except Exception as e:
@@ -335,7 +326,6 @@ class Game:
             obj = self._get_object_or_room(obj_id)
             if obj:
                 result = flag in obj.flags
-                logger.debug(f"IS_FSET: {obj_id}.{flag} = {result}")
                 return result
             return False
         except Exception as e:
@@ -383,8 +373,6 @@ class Game:
                 if obj_id not in new_loc.contents:
                     new_loc.contents.append(obj_id)
                 obj.location = dest_id
-            
-            logger.debug(f"MOVE: {obj_id} -> {dest_id}")
         except Exception as e:
             logger.error(f"Error moving {obj_id} to {dest_id}: {e}")
             raise GameException(f"Cannot move object: {e}")
@@ -409,7 +397,6 @@ class Game:
                     old_loc.contents.remove(obj_id)
             
             obj.location = None
-            logger.debug(f"REMOVE: {obj_id}")
         except Exception as e:
             logger.error(f"Error removing {obj_id}: {e}")
             raise GameException(f"Cannot remove object: {e}")
@@ -533,7 +520,6 @@ class Game:
             obj = self._get_object_or_room(obj_id)
             if obj:
                 value = obj.properties.get(prop_name, default)
-                logger.debug(f"GETP: {obj_id}.{prop_name} = {value}")
                 return value
             return default
         except Exception as e:
@@ -554,7 +540,6 @@ class Game:
             obj = self._get_object_or_room(obj_id)
             if obj:
                 obj.properties[prop_name] = value
-                logger.debug(f"PUTP: {obj_id}.{prop_name} = {value}")
             else:
                 raise ObjectNotFoundError(f"Object {obj_id} not found")
         except Exception as e:
@@ -574,7 +559,6 @@ class Game:
         try:
             if room_id in self.rooms:
                 self.HERE = room_id
-                logger.debug(f"GOTO: Player moved to {room_id}")
             else:
                 raise ObjectNotFoundError(f"Room {room_id} not found")
         except Exception as e:
@@ -604,8 +588,6 @@ class Game:
             if len(objects) > 1:
                 self.PRSI = objects[1]
             
-            logger.debug(f"PERFORM: {verb} {objects}")
-            
             # Here you would call the appropriate action handler
             # For now, we'll just restore the parser state
             result = True
@@ -628,7 +610,6 @@ class Game:
             False
         """
         self.return_value = False
-        logger.debug("RFALSE")
         return False
     
     def RTRUE(self) -> bool:
@@ -640,7 +621,6 @@ class Game:
             True
         """
         self.return_value = True
-        logger.debug("RTRUE")
         return True
     
     # ========== SCHEDULING FUNCTIONS ==========
@@ -658,7 +638,6 @@ class Game:
             if turns == 0:
                 # Cancel the event
                 self.events = [e for e in self.events if e.name != event_name]
-                logger.debug(f"QUEUE: Cancelled {event_name}")
             else:
                 # Add or update event
                 existing = next((e for e in self.events if e.name == event_name), None)
@@ -672,7 +651,6 @@ class Game:
                         callback=lambda: None  # Placeholder
                     )
                     self.events.append(event)
-                logger.debug(f"QUEUE: Scheduled {event_name} in {turns} turns")
         except Exception as e:
             logger.error(f"Error queueing event {event_name}: {e}")
             raise GameException(f"Cannot queue event: {e}")
@@ -685,12 +663,9 @@ class Game:
         Args:
             event: Event to enable
         """
-        try:
-            # Handle the return value from QUEUE
-            logger.debug(f"ENABLE: {event}")
-            # In ZIL, this enables interrupts - we'll treat it as a no-op for now
-        except Exception as e:
-            logger.error(f"Error enabling event: {e}")
+        # Handle the return value from QUEUE
+        # In ZIL, this enables interrupts - we'll treat it as a no-op for now
+        pass
     
     # ========== UTILITY FUNCTIONS ==========
     
@@ -707,7 +682,6 @@ class Game:
         """
         try:
             result = random.randint(1, max_value)
-            logger.debug(f"RANDOM({max_value}) = {result}")
             return result
         except Exception as e:
             logger.error(f"Error generating random number: {e}")
@@ -726,7 +700,6 @@ class Game:
         """
         try:
             result = random.randint(1, 100) <= percentage
-            logger.debug(f"PROB({percentage}) = {result}")
             return result
         except Exception as e:
             logger.error(f"Error in probability check: {e}")
@@ -746,7 +719,6 @@ class Game:
         """
         try:
             result = value in options
-            logger.debug(f"EQUAL({value}, {options}) = {result}")
             return result
         except Exception as e:
             logger.error(f"Error in EQUAL check: {e}")
@@ -782,7 +754,6 @@ class Game:
         """
         try:
             self.SETG("IT", obj_id)
-            logger.debug(f"THIS_IS_IT: {obj_id}")
         except Exception as e:
             logger.error(f"Error setting IT to {obj_id}: {e}")
     
@@ -815,7 +786,6 @@ class Game:
         """
         try:
             self.TELL("China and other valuable objects are not to be handled.")
-            logger.debug("CSCP: China handling")
         except Exception as e:
             logger.error(f"Error in CSCP: {e}")
     
@@ -831,7 +801,6 @@ class Game:
             self.TELL(f"\n{text}:\n")
             self.TELL("reveals slight impressions of the note above!")
             self.SETG("NOTE-READ", True)
-            logger.debug(f"PAD_READ: {text}")
         except Exception as e:
             logger.error(f"Error in PAD_READ: {e}")
     
@@ -843,7 +812,6 @@ class Game:
         try:
             # This would call the fingerprint analysis routine
             self.DO_FINGERPRINT(True)
-            logger.debug("DO_ANALYZE called")
         except Exception as e:
             logger.error(f"Error in DO_ANALYZE: {e}")
     
@@ -855,11 +823,8 @@ class Game:
         Args:
             analysis: Whether this is part of analysis
         """
-        try:
-            # Placeholder for fingerprint analysis logic
-            logger.debug(f"DO_FINGERPRINT: analysis={analysis}")
-        except Exception as e:
-            logger.error(f"Error in DO_FINGERPRINT: {e}")
+        # Placeholder for fingerprint analysis logic
+        pass
     
     # ========== HELPER METHODS ==========
     
@@ -2,12 +2,19 @@
 Input/output system for player interaction
 """
 
+from .output import OutputBuffer, OutputSink, StdoutSink, MemorySink, SocketSink, StreamSink
 #from .interface import GameInterface
-#from .save_system import SaveManager
+from .save_system import SaveManager
 #from .output_formatter import OutputFormatter
 
 __all__ = [
+    'OutputBuffer',
+    'OutputSink',
+    'StdoutSink',
+    'MemorySink',
+    'SocketSink',
+    'StreamSink',
     #'GameInterface',
-    #'SaveManager',
+    'SaveManager',
     #'OutputFormatter'
 ]
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Batch runner - plays a directory of command scripts headlessly, across worker processes.
+
+Every file in the scripts directory is one playthrough: one command per line, blank lines and lines starting with
+'#' skipped.  Each script runs in a fresh session (Engine.new_session) seeded with the same fixed seed, so a
+script plays the same way on every run and in whichever worker it lands.  As in the session host, the parent loads
+the world and runs init_globals once and the workers are forked from it, so starting a script costs only a
+session overlay.
+
+The workers write each script's transcript (the output with the commands echoed after the prompts, as on a
+terminal) to the output directory themselves and send back only a ScriptResult with the per-turn timings; the
+parent collects those into summary.json.  Scripts are handed out a few at a time, so the workers stay busy when
+scripts differ in length.
+"""
+
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from core.engine import Engine
+from game_io.interface import GameInterface
+from game_io.output import MemorySink
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seed used when none is given
+DEFAULT_SEED = 0
+
+# Scripts handed to a worker at a time
+CHUNK_SIZE = 8
+
+# Lines in a script that are not commands
+COMMENT = "#"
+
+
+class ScriptResult(NamedTuple):
+    """Outcome of one script"""
+    script: str                                 # file name
+    turns: List[Tuple[str, float]]              # (command, seconds) per turn played
+    finished: bool                              # the game ended (QUIT, death, ...) before the script did
+    error: Optional[str]                        # exception that stopped the script, None if it ran through
+    seconds: float                              # wall time for the whole script
+
+
+# The engine the forked workers inherit (set in the parent just before forking)
+_engine: Optional[Engine] = None
+
+
+def _run_script(engine: Engine, script: Path, output_dir: Path, seed: int) -> ScriptResult:
+    sink = MemorySink()
+    turns: List[Tuple[str, float]] = []
+    finished = False
+    error = None
+    started = time.perf_counter()
+
+    try:
+        interface = GameInterface(engine.new_session(sink, seed=seed))
+        interface.prompt()
+        with open(script, encoding="utf-8") as f:
+            for line in f:
+                command = line.strip()
+                if not command or command.startswith(COMMENT):
+                    continue
+                sink.write(command + "\n")
+                turn_start = time.perf_counter()
+                playing = interface.handle_line(command)
+                turns.append((command, time.perf_counter() - turn_start))
+                if not playing:
+                    finished = True
+                    break
+    except Exception as e:
+        logger.error(f"Script {script.name} failed after {len(turns)} turns: {e}")
+        error = f"{type(e).__name__}: {e}"
+        sink.write(f"\n[Internal error: {e}]\n")
+
+    (output_dir / f"{script.name}.transcript").write_text(sink.text, encoding="utf-8")
+    return ScriptResult(script.name, turns, finished, error, time.perf_counter() - started)
+
+
+def _worker_run(job: Tuple[Path, Path, int]) -> ScriptResult:
+    """Pool task - runs one script on the engine inherited from the parent"""
+    return _run_script(_engine, *job)
+
+
+class BatchRunner:
+    """
+    Runs every script in a directory against fresh sessions of one loaded engine.
+    """
+
+    def __init__(self, engine: Engine, output_dir: Path, seed: int = DEFAULT_SEED, workers: Optional[int] = None):
+        """
+        Args:
+            engine: Engine with the world loaded and initialized - inherited by every worker
+            output_dir: Where the transcripts and summary.json go
+            seed: Seed every script's session starts from
+            workers: Number of worker processes (one per CPU by default; 1 runs the scripts in this process)
+        """
+        self.engine: Engine = engine
+        self.output_dir: Path = output_dir
+        self.seed: int = seed
+        self.worker_count: int = workers if workers else (os.cpu_count() or 1)
+
+
+    def scripts(self, scripts_dir: Path) -> List[Path]:
+        """The scripts in a directory, in name order (hidden files skipped)"""
+        return sorted(path for path in scripts_dir.iterdir() if path.is_file() and not path.name.startswith("."))
+
+
+    def _results(self, scripts: List[Path]) -> Iterator[ScriptResult]:
+        jobs = [(script, self.output_dir, self.seed) for script in scripts]
+        if self.worker_count == 1 or len(jobs) <= 1:
+            for job in jobs:
+                yield _run_script(self.engine, *job)
+            return
+
+        global _engine
+        _engine = self.engine
+        context = multiprocessing.get_context("fork")
+
+        # Everything loaded so far is shared with the workers - keep the collector from writing to it
+        gc.collect()
+        gc.freeze()
+        try:
+            pool = context.Pool(min(self.worker_count, len(jobs)))
+        finally:
+            gc.unfreeze()
+
+        try:
+            with pool:
+                yield from pool.imap_unordered(_worker_run, jobs, chunksize=CHUNK_SIZE)
+        finally:
+            _engine = None
+
+
+    def run(self, scripts_dir: Path) -> List[ScriptResult]:
+        """
+        Play every script in a directory and write the transcripts and summary.json.
+
+        Returns:
+            The results, in script name order
+        """
+        scripts = self.scripts(scripts_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Running {len(scripts)} scripts from {scripts_dir} on {self.worker_count} workers "
+                    f"(seed {self.seed})")
+
+        started = time.perf_counter()
+        results = sorted(self._results(scripts), key=lambda result: result.script)
+        elapsed = time.perf_counter() - started
+
+        summary = {
+            "seed": self.seed,
+            "workers": self.worker_count,
+            "seconds": elapsed,
+            "scripts": {result.script: {"turns": result.turns, "finished": result.finished, "error": result.error,
+                                        "seconds": result.seconds}
+                        for result in results},
+        }
+        with open(self.output_dir / "summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=1)
+
+        logger.info(f"Ran {len(results)} scripts in {elapsed:.2f}s - {format_summary(results)}")
+        return results
+
+
+def format_summary(results: List[ScriptResult]) -> str:
+    """One line of totals and turn time percentiles"""
+    times = sorted(seconds for result in results for _, seconds in result.turns)
+    failed = sum(1 for result in results if result.error)
+    if not times:
+        return f"{len(results)} scripts, no turns, {failed} failed"
+
+    def percentile(p: float) -> float:
+        return times[min(len(times) - 1, int(p * len(times)))] * 1000
+
+    return (f"{len(results)} scripts, {len(times)} turns, {failed} failed; turn time ms: "
+            f"mean {sum(times) / len(times) * 1000:.3f}, p50 {percentile(0.5):.3f}, p95 {percentile(0.95):.3f}, "
+            f"max {times[-1] * 1000:.3f}")
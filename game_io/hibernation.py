@@ -0,0 +1,200 @@
+"""
+Session hibernation - keeps a bounded number of game sessions resident and parks the rest on disk.
+
+A session that has been idle for a while, or that is the least recently used one when the resident sessions go
+over the memory budget, is hibernated: its state (Engine.capture_session - what it changed in the world, its
+interrupts and clock, the parser state) is written to a small compressed record and the session is dropped.  The
+next command for it rebuilds the session over the shared base world (Engine.restore_session) before running, so
+callers never see the difference.  The output sink stays in memory, so a hibernated connection keeps its socket.
+"""
+
+import logging
+import os
+import pickle
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from core.engine import Engine
+from game_io.interface import GameInterface
+from game_io.output import OutputSink
+
+
+logger = logging.getLogger(__name__)
+
+
+# Resident memory estimate for a session: a fixed part (engine, API, overlay objects, scheduler) plus a cost
+# per world entry the session has changed.  Measured on Deadline; close enough to budget by.
+SESSION_OVERHEAD = 8 * 1024
+ENTRY_COST = 100
+
+
+class SessionPool:
+    """
+    LRU pool of resident sessions with hibernation to disk.
+    """
+
+    def __init__(self, engine: Engine, directory: Path, memory_budget: int = 64 * 1024 * 1024,
+                 idle_timeout: float = 300.0):
+        """
+        Args:
+            engine: Engine with the world loaded and initialized - the shared base for every session
+            directory: Where hibernated session records are written
+            memory_budget: Estimated bytes the resident sessions may use before the least recently used are hibernated
+            idle_timeout: Seconds without a command after which evict_idle() hibernates a session
+        """
+        self.engine: Engine = engine
+        self.directory: Path = Path(directory)
+        self.memory_budget: int = memory_budget
+        self.idle_timeout: float = idle_timeout
+        self.resident: OrderedDict[int, GameInterface] = OrderedDict()   # least recently used first
+        self.last_used: Dict[int, float] = {}                           # session id -> time of its last command
+        self.sinks: Dict[int, Optional[OutputSink]] = {}                # every open session, resident or not
+        self.sizes: Dict[int, int] = {}                                 # resident session id -> its last estimate
+        self.resident_bytes: int = 0                                    # sum of sizes
+        self.hibernations: int = 0
+        self.rehydrations: int = 0
+        self._ids = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+
+    def _path(self, session_id: int) -> Path:
+        return self.directory / f"session-{session_id}.hib"
+
+
+    @staticmethod
+    def estimate(interface: GameInterface) -> int:
+        """Estimated resident bytes of one session"""
+        return SESSION_OVERHEAD + ENTRY_COST * interface.engine.world_manager.delta_entries()
+
+
+    def _measure(self, session_id: int) -> None:
+        """Re-estimate one resident session (after it ran a command) and update the running total"""
+        size = self.estimate(self.resident[session_id])
+        self.resident_bytes += size - self.sizes.get(session_id, 0)
+        self.sizes[session_id] = size
+
+
+    def _forget(self, session_id: int) -> None:
+        self.resident_bytes -= self.sizes.pop(session_id, 0)
+
+
+    # ========== SESSIONS ==========
+    def open(self, sink: Optional[OutputSink] = None) -> Tuple[int, GameInterface]:
+        """
+        Start a session.
+
+        Returns:
+            (session id, the session's interface)
+        """
+        self._ids += 1
+        session_id = self._ids
+        interface = GameInterface(self.engine.new_session(sink))
+        self.sinks[session_id] = sink
+        self.resident[session_id] = interface
+        self.last_used[session_id] = time.monotonic()
+        self._measure(session_id)
+        self._enforce_budget(session_id)
+        return session_id, interface
+
+
+    def interface(self, session_id: int) -> GameInterface:
+        """The interface of an open session, rehydrated from disk if it was hibernated"""
+        interface = self.resident.get(session_id)
+        if interface is None:
+            interface = self._rehydrate(session_id)
+        self.resident.move_to_end(session_id)
+        self.last_used[session_id] = time.monotonic()
+        return interface
+
+
+    def handle_line(self, session_id: int, line: str) -> bool:
+        """
+        Run one line of input for a session (see GameInterface.handle_line).
+
+        Returns:
+            False once the session is over
+        """
+        playing = self.interface(session_id).handle_line(line)
+        if session_id in self.resident:
+            self._measure(session_id)
+        self._enforce_budget(session_id)
+        return playing
+
+
+    def close(self, session_id: int) -> None:
+        """End a session and drop its record"""
+        self.resident.pop(session_id, None)
+        self._forget(session_id)
+        self.last_used.pop(session_id, None)
+        self.sinks.pop(session_id, None)
+        self._path(session_id).unlink(missing_ok=True)
+
+
+    def __contains__(self, session_id: int) -> bool:
+        return session_id in self.sinks
+
+
+    def __len__(self) -> int:
+        return len(self.sinks)
+
+
+    # ========== HIBERNATION ==========
+    def hibernate(self, session_id: int) -> None:
+        """Write a resident session to disk and drop it from memory"""
+        interface = self.resident.pop(session_id)
+        self._forget(session_id)
+        record = interface.engine.capture_session()
+        data = zlib.compress(pickle.dumps(record, pickle.HIGHEST_PROTOCOL))
+
+        # Write then rename, so a crash never leaves a half-written record behind
+        path = self._path(session_id)
+        temp = path.with_suffix(".tmp")
+        temp.write_bytes(data)
+        os.replace(temp, path)
+
+        self.hibernations += 1
+        logger.info(f"Hibernated session {session_id} ({len(data)} bytes, {len(self.resident)} resident)")
+
+
+    def _rehydrate(self, session_id: int) -> GameInterface:
+        if session_id not in self.sinks:
+            raise KeyError(f"No session {session_id}")
+
+        path = self._path(session_id)
+        record = pickle.loads(zlib.decompress(path.read_bytes()))
+        interface = GameInterface(self.engine.restore_session(record, self.sinks[session_id]))
+        path.unlink()
+
+        self.resident[session_id] = interface
+        self._measure(session_id)
+        self.rehydrations += 1
+        logger.info(f"Rehydrated session {session_id} ({len(self.resident)} resident)")
+        return interface
+
+
+    def _enforce_budget(self, keep: int) -> None:
+        """Hibernate the least recently used sessions (other than keep) until the rest fit in the budget"""
+        while self.resident_bytes > self.memory_budget and len(self.resident) > 1:
+            oldest = iter(self.resident)
+            session_id = next(oldest)
+            if session_id == keep:
+                session_id = next(oldest)
+            self.hibernate(session_id)
+
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Hibernate the sessions idle for longer than idle_timeout.
+
+        Returns:
+            The number of sessions hibernated
+        """
+        cutoff = (now if now is not None else time.monotonic()) - self.idle_timeout
+        idle = [session_id for session_id in self.resident if self.last_used[session_id] < cutoff]
+        for session_id in idle:
+            self.hibernate(session_id)
+        return len(idle)
@@ -0,0 +1,186 @@
+"""
+Session host - shards game sessions across worker processes forked from a preloaded parent.
+
+The parent loads the world and the action modules and runs init_globals once, then forks the workers.  Each
+worker inherits the loaded world as copy-on-write memory pages (the parent freezes the garbage collector's view
+of those objects first so collections in the workers do not touch them), so a worker never re-runs
+initialize_world and a new session is just an overlay (Engine.new_session).  Sessions are assigned to workers by
+session id and every command for a session goes to the same worker over a pipe.
+"""
+
+import gc
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+from multiprocessing.connection import Connection
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.engine import Engine
+from core.exceptions import WorkerLostError
+from game_io.interface import GameInterface
+from game_io.output import MemorySink
+
+
+logger = logging.getLogger(__name__)
+
+
+def _worker(engine: Engine, conn: Connection) -> None:
+    """Worker process loop - runs the sessions of one shard"""
+    sessions: Dict[int, Tuple[GameInterface, MemorySink]] = {}
+
+    def output(sink: MemorySink) -> str:
+        text = sink.text
+        sink.clear()
+        return text
+
+    while True:
+        try:
+            op, session_id, line = conn.recv()
+        except EOFError:
+            break
+
+        try:
+            if op == "open":
+                sink = MemorySink()
+                interface = GameInterface(engine.new_session(sink, seed=engine.rng.child_seed(session_id)))
+                sessions[session_id] = (interface, sink)
+                interface.prompt()
+                conn.send((output(sink), True))
+            elif op == "turn":
+                interface, sink = sessions[session_id]
+                playing = interface.handle_line(line)
+                conn.send((output(sink), playing))
+            elif op == "close":
+                sessions.pop(session_id, None)
+                conn.send(("", False))
+            elif op == "stop":
+                conn.send(("", False))
+                break
+        except Exception as e:
+            logger.error(f"Worker {os.getpid()} failed running {op} for session {session_id}: {e}")
+            conn.send((f"[Internal error: {e}]\n", False))
+
+    conn.close()
+
+
+class SessionHost:
+    """
+    Pool of forked worker processes, each hosting a shard of the sessions.
+    """
+
+    def __init__(self, engine: Engine, workers: Optional[int] = None):
+        """
+        Args:
+            engine: Engine with the world loaded and initialized - inherited by every worker
+            workers: Number of worker processes (one per CPU by default)
+        """
+        self.engine: Engine = engine
+        self.worker_count: int = workers if workers else (os.cpu_count() or 1)
+        self.processes: List[multiprocessing.Process] = []
+        self._conns: List[Connection] = []
+        self._locks: List[threading.Lock] = []          # one request at a time per worker pipe
+        self._dead: Set[int] = set()                    # shards whose worker has exited
+        self._ids = itertools.count(1)
+
+
+    def start(self) -> None:
+        """Fork the workers"""
+        context = multiprocessing.get_context("fork")
+
+        # Everything loaded so far is shared with the workers - keep the collector from writing to it
+        gc.collect()
+        gc.freeze()
+
+        for shard in range(self.worker_count):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=_worker, args=(self.engine, child_conn), daemon=True,
+                                      name=f"session-worker-{shard}")
+            process.start()
+            child_conn.close()
+            self.processes.append(process)
+            self._conns.append(parent_conn)
+            self._locks.append(threading.Lock())
+
+        gc.unfreeze()
+        logger.info(f"Started {self.worker_count} session workers")
+
+
+    def shard(self, session_id: int) -> int:
+        return session_id % self.worker_count
+
+
+    def _call(self, session_id: int, op: str, line: str = "") -> Tuple[str, bool]:
+        shard = self.shard(session_id)
+        if shard in self._dead:
+            raise WorkerLostError(f"Session worker {shard} has exited")
+        with self._locks[shard]:
+            try:
+                self._conns[shard].send((op, session_id, line))
+                return self._conns[shard].recv()
+            except (EOFError, OSError) as e:
+                self._dead.add(shard)
+                logger.error(f"Session worker {shard} exited (exit code {self.processes[shard].exitcode})")
+                raise WorkerLostError(f"Session worker {shard} has exited") from e
+
+
+    def new_session_id(self) -> int:
+        return next(self._ids)
+
+
+    def open_session(self, session_id: Optional[int] = None) -> Tuple[int, str]:
+        """
+        Start a session on its worker.
+
+        Args:
+            session_id: Id from new_session_id (a new one if None)
+
+        Returns:
+            (session id, the session's opening output)
+
+        Raises:
+            WorkerLostError: The session's worker has exited
+        """
+        if session_id is None:
+            session_id = self.new_session_id()
+        text, _ = self._call(session_id, "open")
+        return session_id, text
+
+
+    def send(self, session_id: int, line: str) -> Tuple[str, bool]:
+        """
+        Run one line of input for a session.
+
+        Returns:
+            (the turn's output, False once the session is over)
+
+        Raises:
+            WorkerLostError: The session's worker has exited
+        """
+        return self._call(session_id, "turn", line)
+
+
+    def close_session(self, session_id: int) -> None:
+        try:
+            self._call(session_id, "close")
+        except WorkerLostError:
+            pass                                        # the session went with its worker
+
+
+    def stop(self) -> None:
+        """Stop the workers"""
+        for shard, conn in enumerate(self._conns):
+            try:
+                with self._locks[shard]:
+                    conn.send(("stop", 0, ""))
+                    conn.recv()
+            except (EOFError, OSError):
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.processes.clear()
+        self._conns.clear()
+        self._locks.clear()
+        self._dead.clear()
@@ -2,17 +2,58 @@
 Game interface - handles input/output with the player
 """
 
-from core.engine import Engine
+import sys
+from typing import Optional, TextIO
+
+from core.engine import Engine, GameState
+
+
+# Commands that end the session without going through the game
+QUIT_COMMANDS = ("quit", "q")
+
+PROMPT = "\n>"
 
 
 class GameInterface:
     """
     Main interface for player interaction.  Handles input, output, and display formatting
-    XXX A LOT needs to be done in here - but stub this out until things start working...
+    One interface drives one engine session - from the console, or from the session server for a connection.
     """
-    
+
     def __init__(self, engine:Engine):
         """Initialize interface with game engine reference"""
         self.engine = engine
 
-    
\ No newline at end of file
+    def prompt(self) -> None:
+        """Send the input prompt"""
+        self.engine.output.write(PROMPT)
+        self.engine.output.flush()
+
+    def handle_line(self, line: str) -> bool:
+        """
+        Run the turn for one line of player input.  The turn's output goes to the session's output sink.
+
+        Returns:
+            False once the session is over
+        """
+        command = line.strip()
+        if command.lower() in QUIT_COMMANDS:
+            self.engine.state = GameState.QUIT
+            self.engine.output.write("Thanks for playing!\n")
+            self.engine.output.flush()
+            return False
+
+        self.engine.run_turn(command)
+        if self.engine.state != GameState.PLAYING:
+            return False
+
+        self.prompt()
+        return True
+
+    def run(self, stream: Optional[TextIO] = None) -> None:
+        """Console loop - read commands until the input ends or the game is over"""
+        stream = stream if stream else sys.stdin
+        self.prompt()
+        for line in stream:
+            if not self.handle_line(line):
+                break
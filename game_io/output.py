@@ -0,0 +1,109 @@
+"""
+Output pipeline - TELL and friends write into a per-session buffer that is flushed once per turn to a sink
+"""
+
+import socket
+import sys
+from typing import Any, List, Optional, TextIO
+
+
+class OutputSink:
+    """
+    Where flushed output goes.  Subclasses implement write().
+    """
+
+    def write(self, text: str) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class StdoutSink(OutputSink):
+    """Console output (or any text stream)"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream: Optional[TextIO] = stream      # None means whatever sys.stdout is at the time
+
+    def write(self, text: str) -> None:
+        stream = self.stream if self.stream else sys.stdout
+        stream.write(text)
+        stream.flush()
+
+
+class MemorySink(OutputSink):
+    """Collects output in memory - for tests, transcripts and headless runs"""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.chunks.append(text)
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.chunks)
+
+    def clear(self) -> None:
+        self.chunks.clear()
+
+
+class SocketSink(OutputSink):
+    """Output for a hosted session connected over a socket"""
+
+    def __init__(self, sock: socket.socket, encoding: str = "utf-8"):
+        self.sock: socket.socket = sock
+        self.encoding: str = encoding
+
+    def write(self, text: str) -> None:
+        self.sock.sendall(text.encode(self.encoding))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+class StreamSink(OutputSink):
+    """
+    Output for a session served by asyncio - writes into a StreamWriter's transport buffer without blocking.
+    The server awaits drain() after each turn, which is where backpressure from a slow client is applied.
+    """
+
+    def __init__(self, writer: Any, encoding: str = "utf-8"):
+        self.writer: Any = writer                   # asyncio.StreamWriter (anything with write(bytes))
+        self.encoding: str = encoding
+
+    def write(self, text: str) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(text.encode(self.encoding))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class OutputBuffer:
+    """
+    Per-session output buffer.  Writes are just list appends; flush() hands a turn's output to the sink in a
+    single write.
+    """
+
+    def __init__(self, sink: Optional[OutputSink] = None):
+        self.sink: OutputSink = sink if sink else StdoutSink()
+        self.parts: List[str] = []
+        self.write = self.parts.append              # bound once - TELL is called a lot
+
+    @property
+    def pending(self) -> str:
+        """Output written since the last flush"""
+        return ''.join(self.parts)
+
+    def flush(self) -> str:
+        """Send everything written since the last flush to the sink, and return it"""
+        if not self.parts:
+            return ""
+        text = ''.join(self.parts)
+        self.parts.clear()
+        self.sink.write(text)
+        return text
+
+    def discard(self) -> None:
+        self.parts.clear()
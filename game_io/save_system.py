@@ -0,0 +1,160 @@
+"""
+Save system - incremental saved games built on the world's change journal.
+
+A save file is a chain of pickled records.  The first is a full checkpoint of the world state; every later save
+to the same file appends a delta holding only the objects, rooms and globals written since the previous save
+(WorldManager.capture_changes), plus the small non-world state (interrupts, clock, parser state).  After
+COMPACT_EVERY deltas the next save rewrites the file as a single full checkpoint again, so a restore never has
+to read a long chain.  Restoring folds the chain into one set of changes and applies it in a single pass.
+"""
+
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from core.exceptions import GameException
+
+if TYPE_CHECKING:
+    from core.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+
+# Save file format version
+SAVE_FORMAT = 1
+
+# Deltas appended to a save file before the next save compacts it back to a full checkpoint
+COMPACT_EVERY = 16
+
+
+class SaveManager:
+    """
+    Full/delta saves and restores for one engine (or session).
+    """
+
+    def __init__(self, engine: 'Engine', compact_every: int = COMPACT_EVERY):
+        self.engine: 'Engine' = engine
+        self.compact_every: int = compact_every
+        self.path: Optional[Path] = None            # save file the journal is relative to (None: next save is full)
+        self.deltas: int = 0                        # deltas appended to it since its full checkpoint
+        self._same_slots: bool = True               # the last restored file numbers globals as this world does
+
+
+    def save(self, filename: str) -> bool:
+        """
+        Save the game.  Writes a delta if the last save or restore used the same file, a full checkpoint otherwise.
+        """
+        path = Path(filename)
+        world = self.engine.world_manager
+        full = path != self.path or self.deltas >= self.compact_every or not path.exists()
+
+        record = self.engine.capture_state()
+        record["format"] = SAVE_FORMAT
+        record["full"] = full
+        record["world"] = world.capture_changes(full)
+        if full:
+            record["handles"] = len(world.entities)
+
+        if full:
+            # Write then rename, so a crash never leaves the only save half written
+            temp = path.with_suffix(path.suffix + ".tmp")
+            with open(temp, "wb") as f:
+                pickle.dump(record, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, path)
+            self.deltas = 0
+        else:
+            with open(path, "ab") as f:
+                pickle.dump(record, f, pickle.HIGHEST_PROTOCOL)
+            self.deltas += 1
+
+        world.checkpoint()
+        self.path = path
+        logger.info(f"Saved {'checkpoint' if full else 'delta'} to {path} ({len(record['world']['flags'])} flag words, "
+                    f"{len(record['world']['globals'])} globals)")
+        return True
+
+
+    def _read(self, path: Path) -> List[Dict[str, Any]]:
+        records = []
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    records.append(pickle.load(f))
+                except EOFError:
+                    break
+                except pickle.UnpicklingError as e:
+                    # A save interrupted while appending - the records before it are intact
+                    logger.warning(f"Ignoring truncated record at the end of {path}: {e}")
+                    break
+
+        if not records or not records[0].get("full"):
+            raise GameException(f"{path} does not start with a full checkpoint")
+        if records[0].get("format") != SAVE_FORMAT:
+            raise GameException(f"{path} has save format {records[0].get('format')}, expected {SAVE_FORMAT}")
+        return records
+
+
+    def _fold(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine a chain of world records into one, translating saved global slots and property handles to this
+        world's (they may have been interned in a different order by the saving process).
+        """
+        world = self.engine.world_manager
+        if records[0]["handles"] != len(world.entities):
+            raise GameException(f"Saved game has {records[0]['handles']} objects, this world {len(world.entities)}")
+
+        folded: Dict[str, Any] = {"tree": [{}, {}, {}, {}], "flag_names": None, "flags": {}, "properties": {},
+                                  "global_names": None, "globals": {}, "goals": {}, "occupancy": {}}
+        flag_names: List[str] = []
+        slots: List[int] = [0]                      # saved slot -> slot in this world
+        for record in records:
+            delta = record["world"]
+            for name in delta["flag_names"]:
+                if world.flags.bit(name) != len(flag_names):
+                    raise GameException(f"Saved flag {name} does not match this world's flags")
+                flag_names.append(name)
+            for name in delta["global_names"]:
+                slots.append(world.global_handle(name))
+            props = [0] + [world.property_symbols.intern(name) for name in delta["property_names"]]
+
+            for links, changes in zip(folded["tree"], delta["tree"]):
+                links.update(changes)
+            folded["flags"].update(delta["flags"])
+            folded["properties"].update((handle, {props[prop]: value for prop, value in values.items()})
+                                        for handle, values in delta["properties"].items())
+            folded["globals"].update((slots[slot], value) for slot, value in delta["globals"].items())
+            folded["goals"] = delta["goals"]
+            folded["occupancy"].update(delta["occupancy"])
+
+        # The checkpoint lists every occupied room and the deltas the rooms they touched, so rooms occupied now
+        # but in none of them are empty in the saved game
+        for room in world.occupancy.rooms():
+            folded["occupancy"].setdefault(room, [])
+
+        # Deltas continue the file's slot numbering, which only holds if it is this world's numbering too
+        self._same_slots = slots == list(range(len(world.globals.names)))
+        return folded
+
+
+    def load(self, filename: str) -> bool:
+        """
+        Restore a saved game, replacing the current world state.  Later saves to the same file are deltas.
+        """
+        path = Path(filename)
+        records = self._read(path)
+        world = self.engine.world_manager
+
+        world.apply_delta(self._fold(records))
+        self.engine.restore_state(records[-1], interrupts=True)
+        self.engine.output.discard()
+        if self.engine.undo_log is not None:
+            self.engine.undo_log.clear()
+
+        world.checkpoint()
+        self.path = path if self._same_slots else None
+        self.deltas = len(records) - 1
+        logger.info(f"Restored {path} (checkpoint and {self.deltas} deltas)")
+        return True
@@ -0,0 +1,229 @@
+"""
+Session server - hosts many game sessions from one process with asyncio.
+
+Each connection (TCP or Unix socket) gets its own engine session layered over one loaded world (see
+Engine.new_session) and a GameInterface.  A reader task feeds the connection's lines into a small per-session
+command queue and a worker task runs the turns in order, streaming each turn's buffered output back.  When a
+session falls behind the queue fills, the reader stops reading and TCP flow control pushes back on the client;
+when a client reads slowly the worker waits on drain() before running its next turn.  An idle session is just
+two suspended tasks, so one event loop holds thousands of them.
+
+With a SessionHost the sessions run in forked worker processes instead, and the event loop only moves lines and
+output between the connections and the workers.  The blocking pipe calls run on a thread pool with one thread per
+worker, and a lock per worker keeps every other call for that worker waiting on the event loop rather than on a
+thread, so a busy worker cannot starve the others.  If a worker dies, every session it hosted is closed with an
+error.  With a SessionPool idle sessions are hibernated to disk and rehydrated on their next command.
+"""
+
+import asyncio
+import itertools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from core.engine import Engine
+from core.exceptions import WorkerLostError
+from game_io.hibernation import SessionPool
+from game_io.host import SessionHost
+from game_io.interface import GameInterface
+from game_io.output import StreamSink
+
+
+logger = logging.getLogger(__name__)
+
+
+class SessionServer:
+    """
+    Asyncio server mapping connections to engine sessions.
+    """
+
+    def __init__(self, engine: Engine, queue_size: int = 8, host: Optional[SessionHost] = None,
+                 pool: Optional[SessionPool] = None):
+        """
+        Args:
+            engine: Engine with the world loaded and initialized - the shared base for every session
+            queue_size: Commands a session may have waiting before the server stops reading from it
+            host: Started SessionHost to run the sessions in worker processes (in this process if None)
+            pool: SessionPool to hibernate idle sessions to (sessions in this process only)
+        """
+        self.engine: Engine = engine
+        self.queue_size: int = queue_size
+        self.host: Optional[SessionHost] = host
+        self.pool: Optional[SessionPool] = pool
+        self.sessions: Dict[int, Optional[GameInterface]] = {}     # session id -> interface (None when hosted/pooled)
+        self._ids = itertools.count(1)
+        self.server: Optional[asyncio.AbstractServer] = None
+
+        # Hosted sessions - one pipe call in flight per worker, on a thread of its own
+        worker_count = host.worker_count if host else 0
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(worker_count, thread_name_prefix="session-host") if host else None)
+        self._shard_locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(worker_count)]
+        self._hosted: Dict[int, asyncio.StreamWriter] = {}         # hosted session id -> its connection
+
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 4000) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_server(self._connection, host, port)
+        logger.info(f"Serving sessions on {host}:{port}")
+        return self.server
+
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_unix_server(self._connection, path)
+        logger.info(f"Serving sessions on {path}")
+        return self.server
+
+
+    async def serve_forever(self) -> None:
+        evictor = asyncio.create_task(self._evict_idle()) if self.pool is not None else None
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            if evictor:
+                evictor.cancel()
+            if self._executor:
+                self._executor.shutdown(wait=False)
+
+
+    async def _evict_idle(self) -> None:
+        """Hibernate idle pooled sessions every so often"""
+        while True:
+            await asyncio.sleep(max(self.pool.idle_timeout / 4, 1.0))
+            self.pool.evict_idle()
+
+
+    def _local_session(self, writer: asyncio.StreamWriter) -> Callable[[Optional[str]], Awaitable[bool]]:
+        """Session in this process - the turn's output goes straight to the connection"""
+        if self.pool is not None:
+            return self._pooled_session(writer)
+
+        session_id = next(self._ids)
+        interface = GameInterface(self.engine.new_session(StreamSink(writer)))
+        self.sessions[session_id] = interface
+        interface.prompt()
+
+        async def run(line: Optional[str]) -> bool:
+            if line is None:
+                del self.sessions[session_id]
+                return False
+            return interface.handle_line(line)
+
+        return run
+
+
+    def _pooled_session(self, writer: asyncio.StreamWriter) -> Callable[[Optional[str]], Awaitable[bool]]:
+        """Session in this process that may be hibernated between commands"""
+        session_id, interface = self.pool.open(StreamSink(writer))
+        self.sessions[session_id] = None
+        interface.prompt()
+
+        async def run(line: Optional[str]) -> bool:
+            if line is None:
+                del self.sessions[session_id]
+                self.pool.close(session_id)
+                return False
+            return self.pool.handle_line(session_id, line)
+
+        return run
+
+
+    async def _host_call(self, session_id: int, method: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking SessionHost call on the host's threads, one call at a time per worker"""
+        async with self._shard_locks[self.host.shard(session_id)]:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, method, *args)
+
+
+    def _worker_lost(self, session_id: int, error: WorkerLostError) -> None:
+        """Close every session on the dead worker of a session, not just the one that found it dead"""
+        shard = self.host.shard(session_id)
+        for other_id, writer in list(self._hosted.items()):
+            if self.host.shard(other_id) == shard:
+                writer.write(f"\n[Session ended: {error}]\n".encode("utf-8"))
+                writer.close()                              # the reader sees the end of the connection and cleans up
+
+
+    async def _hosted_session(self, writer: asyncio.StreamWriter) -> Callable[[Optional[str]], Awaitable[bool]]:
+        """Session in a worker process - lines and output are passed through the host"""
+        session_id = self.host.new_session_id()
+        _, text = await self._host_call(session_id, self.host.open_session, session_id)
+        self.sessions[session_id] = None
+        self._hosted[session_id] = writer
+        writer.write(text.encode("utf-8"))
+
+        async def run(line: Optional[str]) -> bool:
+            if line is None:
+                del self.sessions[session_id]
+                del self._hosted[session_id]
+                await self._host_call(session_id, self.host.close_session, session_id)
+                return False
+            try:
+                text, playing = await self._host_call(session_id, self.host.send, session_id, line)
+            except WorkerLostError as e:
+                self._worker_lost(session_id, e)
+                return False
+            writer.write(text.encode("utf-8"))
+            return playing
+
+        return run
+
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.host is None:
+            run = self._local_session(writer)
+        else:
+            try:
+                run = await self._hosted_session(writer)
+            except WorkerLostError as e:
+                logger.error(f"Could not open a session: {e}")
+                writer.write(f"[Session ended: {e}]\n".encode("utf-8"))
+                writer.close()
+                return
+        logger.info(f"Session connected ({len(self.sessions)} active)")
+
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        worker = asyncio.create_task(self._run_commands(run, queue, writer))
+
+        notice = b""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Waits while the queue is full - the socket is not read until the session catches up
+                await queue.put(line.decode("utf-8", errors="replace"))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.info(f"Session connection lost: {e}")
+        except (asyncio.LimitOverrunError, ValueError) as e:
+            # A line longer than the stream limit - readline raises rather than returning part of it
+            logger.warning(f"Session sent an over-long line, closing it: {e}")
+            notice = b"\n[Line too long - closing the session]\n"
+        finally:
+            await queue.put(None)
+            await worker
+            writer.write(notice)                            # after the output of the commands already queued
+            await run(None)
+            writer.close()
+            logger.info(f"Session closed ({len(self.sessions)} active)")
+
+
+    async def _run_commands(self, run: Callable[[Optional[str]], Awaitable[bool]], queue: asyncio.Queue,
+                            writer: asyncio.StreamWriter) -> None:
+        playing = True
+        while True:
+            line = await queue.get()
+            if line is None:
+                return
+            if not playing:
+                continue                                    # keep draining so the reader never blocks on a full queue
+
+            try:
+                playing = await run(line)
+                await writer.drain()
+            except ConnectionError:
+                playing = False
+            except Exception as e:
+                logger.error(f"Error running command {line.strip()!r}: {e}")
+
+            if not playing:
+                writer.close()
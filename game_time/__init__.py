@@ -0,0 +1,12 @@
+"""
+Game clock and interrupt (ZIL QUEUE/ENABLE) scheduling
+"""
+
+from .interrupts import Interrupt, InterruptScheduler
+from .time_manager import TimeManager
+
+__all__ = [
+    'Interrupt',
+    'InterruptScheduler',
+    'TimeManager',
+]
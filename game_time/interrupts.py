@@ -0,0 +1,311 @@
+###############################################################################
+#   game_time/interrupts.py
+#
+#   Interrupt scheduler for ZIL's QUEUE / INT / ENABLE / DISABLE and the
+#   per-turn CLOCKER.  An interrupt is named after its routine ("I-MAIL-2"
+#   runs I_MAIL_2) and its tick count works like ZIL's C-TICK:
+#
+#       n > 0   - run once, n turns from now
+#       -1      - run every turn
+#       0       - not scheduled (QUEUE with 0 cancels)
+#
+#   Timed interrupts are kept in a heap keyed by the absolute turn they fall
+#   due on, so a turn only looks at the interrupts that are actually due.
+#   Requeueing or cancelling bumps the interrupt's generation instead of
+#   searching the heap; stale heap entries are dropped when they surface.
+#   Routines are looked up in the function registry once, when the interrupt
+#   is first created.
+#
+#   A disabled interrupt does not count down, as in ZIL.
+#
+###############################################################################
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, MutableMapping, Optional, Tuple
+
+from core.exceptions import ActionRegistryError
+from world.fingerprint import interrupt_key, name_key
+
+
+logger = logging.getLogger(__name__)
+
+
+EVERY_TURN = -1
+
+
+@dataclass
+class Interrupt:
+    """One named interrupt (ZIL's interrupt table entry)"""
+    name: str
+    routine: Optional[Callable]         # resolved action routine, None if there is no such routine
+    enabled: bool = True
+    ticks: int = 0                      # C-TICK when last set (or remaining ticks while disabled)
+    due: Optional[int] = None           # absolute turn a timed, enabled interrupt runs on
+    generation: int = 0                 # bumped on every change so stale heap entries are skipped
+
+
+class InterruptScheduler:
+    """
+    Heap based interrupt queue with a name index.
+    """
+
+    def __init__(self, function_registry: MutableMapping[str, Callable]):
+        self.function_registry: MutableMapping[str, Callable] = function_registry
+        self.turn: int = 0                                  # turns run so far
+        self.interrupts: Dict[str, Interrupt] = {}          # name -> interrupt
+        self._heap: List[Tuple[int, int, str, int]] = []    # (due turn, sequence, name, generation)
+        self._every_turn: Dict[str, None] = {}              # names of enabled every-turn interrupts, in queue order
+        self._sequence = itertools.count()                  # keeps interrupts due on the same turn in queue order
+        self.undo_log: Any = None                           # core.undo.UndoLog told about changes, if recording
+        self.zobrist: int = 0                               # incremental hash of the pending interrupts
+        self._zobrist_keys: Dict[str, int] = {}             # name -> its current contribution to zobrist
+        self._name_keys: Dict[str, int] = {}                # name -> name_key (shared by copies)
+
+
+    def copy(self) -> 'InterruptScheduler':
+        """Independent scheduler with the same interrupts and turn count (for a new session)"""
+        scheduler = InterruptScheduler(self.function_registry)
+        scheduler.turn = self.turn
+        scheduler.interrupts = {name: replace(entry) for name, entry in self.interrupts.items()}
+        scheduler._heap = list(self._heap)
+        scheduler._every_turn = dict(self._every_turn)
+        scheduler._sequence = itertools.count(max((item[1] for item in self._heap), default=-1) + 1)
+        scheduler.zobrist = self.zobrist
+        scheduler._zobrist_keys = dict(self._zobrist_keys)
+        scheduler._name_keys = self._name_keys
+        return scheduler
+
+
+    def capture(self) -> Tuple[int, List[Tuple[str, bool, int]]]:
+        """
+        The scheduler's state as plain data (routines are saved by name): the turn count and
+        (name, enabled, ticks remaining) for every interrupt, in the order restore() must queue them.
+        """
+        order = {item[2]: (item[0], item[1]) for item in self._heap
+                 if self.interrupts[item[2]].generation == item[3]}
+        every_turn = list(self._every_turn)
+        timed = sorted(order, key=order.get)
+        rest = [name for name in self.interrupts if name not in order and name not in self._every_turn]
+        return self.turn, [(name, self.interrupts[name].enabled, self.remaining(self.interrupts[name]))
+                           for name in every_turn + timed + rest]
+
+
+    @classmethod
+    def restore(cls, function_registry: MutableMapping[str, Callable],
+                state: Tuple[int, List[Tuple[str, bool, int]]]) -> 'InterruptScheduler':
+        """Scheduler rebuilt from capture() data - interrupts due on the same turn keep their order"""
+        scheduler = cls(function_registry)
+        scheduler.load(state)
+        return scheduler
+
+
+    def load(self, state: Tuple[int, List[Tuple[str, bool, int]]]) -> None:
+        """Replace this scheduler's interrupts and turn count with capture() data"""
+        self.turn, entries = state
+        self.interrupts = {}
+        self._heap = []
+        self._every_turn = {}
+        self.zobrist = 0
+        self._zobrist_keys = {}
+        for name, enabled, ticks in entries:
+            entry = self.interrupt(name)
+            entry.enabled = enabled
+            entry.ticks = ticks
+            self._schedule(entry)
+
+
+    def state_of(self, name: str) -> Optional[Tuple[bool, int, Optional[int]]]:
+        """(enabled, ticks, due) of an interrupt, None if it does not exist - for UNDO"""
+        entry = self.interrupts.get(name)
+        return None if entry is None else (entry.enabled, entry.ticks, entry.due)
+
+
+    def put_state(self, name: str, state: Optional[Tuple[bool, int, Optional[int]]]) -> None:
+        """Put back a state_of() result (None leaves the interrupt unscheduled)"""
+        enabled, ticks, due = state if state is not None else (False, 0, None)
+        entry = self.interrupt(name)
+        entry.enabled = enabled
+        entry.ticks = ticks
+        entry.generation += 1
+        if enabled and due is not None:
+            # Never due in the past - next_due() would go to 0 or below and the clock would skip backwards
+            due = max(due, self.turn + 1)
+        entry.due = due
+        self._every_turn.pop(name, None)
+        if enabled and ticks < 0:
+            self._every_turn[name] = None
+        elif enabled and due is not None:
+            heapq.heappush(self._heap, (due, next(self._sequence), name, entry.generation))
+        self._rehash(entry)
+
+
+    def _rehash(self, entry: Interrupt) -> None:
+        """Bring the hash up to date with an interrupt's schedule"""
+        key = self._name_keys.get(entry.name)
+        if key is None:
+            key = self._name_keys[entry.name] = name_key(f"int:{entry.name}")
+        new = interrupt_key(key, entry.enabled, entry.ticks, entry.due)
+        self.zobrist ^= self._zobrist_keys.get(entry.name, 0) ^ new
+        self._zobrist_keys[entry.name] = new
+
+
+    # ========== SCHEDULING ==========
+    def _resolve(self, name: str) -> Optional[Callable]:
+        routine_name = name.replace("-", "_")
+        try:
+            return self.function_registry[routine_name]
+        except KeyError:
+            logger.warning(f"Interrupt {name} has no routine {routine_name}")
+        except ActionRegistryError as e:
+            logger.error(f"Interrupt {name} routine failed to load: {e}")
+        return None
+
+
+    def interrupt(self, name: str) -> Interrupt:
+        """The interrupt with a name, created (unscheduled) on first use - ZIL's INT"""
+        entry = self.interrupts.get(name)
+        if entry is None:
+            entry = Interrupt(name=name, routine=self._resolve(name))
+            self.interrupts[name] = entry
+        return entry
+
+
+    def _schedule(self, entry: Interrupt) -> None:
+        """Put an enabled interrupt on the heap or the every turn list according to its ticks"""
+        entry.generation += 1
+        entry.due = None
+        self._every_turn.pop(entry.name, None)
+
+        if entry.enabled and entry.ticks > 0:
+            entry.due = self.turn + entry.ticks
+            heapq.heappush(self._heap, (entry.due, next(self._sequence), entry.name, entry.generation))
+        elif entry.enabled and entry.ticks < 0:
+            self._every_turn[entry.name] = None
+        self._rehash(entry)
+
+        # Requeueing leaves stale entries behind - rebuild once they outnumber the live ones
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self.interrupts):
+            self._heap = [item for item in self._heap if self.interrupts[item[2]].generation == item[3]]
+            heapq.heapify(self._heap)
+
+
+    def queue(self, name: str, ticks: int) -> Interrupt:
+        """
+        Set an interrupt's tick count - ZIL's QUEUE.
+
+        Args:
+            name: Interrupt name ("I-MAIL-2")
+            ticks: Turns until it runs, -1 for every turn, 0 to cancel
+
+        Returns:
+            The interrupt, for ENABLE/DISABLE
+        """
+        if self.undo_log is not None:
+            self.undo_log.touch_interrupt(name)
+        entry = self.interrupt(name)
+        entry.ticks = EVERY_TURN if ticks < 0 else ticks
+        self._schedule(entry)
+        return entry
+
+
+    def enable(self, entry: Interrupt) -> None:
+        if not entry.enabled:
+            if self.undo_log is not None:
+                self.undo_log.touch_interrupt(entry.name)
+            entry.enabled = True
+            self._schedule(entry)
+
+
+    def disable(self, entry: Interrupt) -> None:
+        if entry.enabled:
+            if self.undo_log is not None:
+                self.undo_log.touch_interrupt(entry.name)
+            entry.ticks = self.remaining(entry)
+            entry.enabled = False
+            self._schedule(entry)
+
+
+    def remaining(self, entry: Interrupt) -> int:
+        """Current tick count of an interrupt (as ZIL's C-TICK would read)"""
+        if entry.enabled and entry.due is not None:
+            return entry.due - self.turn
+        return entry.ticks
+
+
+    def is_queued(self, name: str) -> bool:
+        """True if the interrupt is enabled and will run"""
+        entry = self.interrupts.get(name)
+        return entry is not None and entry.enabled and entry.ticks != 0
+
+
+    def next_due(self) -> Optional[int]:
+        """
+        Turns until the next turn on which an interrupt runs (1 if any run every turn), or None if nothing is
+        scheduled.
+        """
+        if self._every_turn:
+            return 1
+        while self._heap:
+            _, _, name, generation = self._heap[0]
+            if self.interrupts[name].generation == generation:
+                return self._heap[0][0] - self.turn
+            heapq.heappop(self._heap)
+        return None
+
+
+    def advance(self, turns: int) -> None:
+        """Skip idle turns without running anything.  The caller must not skip past next_due()."""
+        due = self.next_due()
+        if due is not None and due <= turns:
+            raise ValueError(f"Cannot skip {turns} turns - an interrupt is due in {due}")
+        self.turn += turns
+
+
+    # ========== DISPATCH ==========
+    def tick(self, game: Any) -> bool:
+        """
+        Advance one turn and run the interrupts due on it - ZIL's CLOCKER.  Every turn interrupts run first,
+        then the timed ones in the order they fall due.  An interrupt cancelled or requeued by an earlier
+        routine in the same turn is skipped.
+
+        Args:
+            game: The API passed to the routines
+
+        Returns:
+            True if any routine returned true (it printed something)
+        """
+        self.turn += 1
+
+        runs: List[Tuple[Interrupt, int]] = []
+        for name in self._every_turn:
+            entry = self.interrupts[name]
+            runs.append((entry, entry.generation))
+
+        while self._heap and self._heap[0][0] <= self.turn:
+            _, _, name, generation = heapq.heappop(self._heap)
+            entry = self.interrupts[name]
+            if entry.generation == generation:
+                runs.append((entry, generation))
+
+        result = False
+        for entry, generation in runs:
+            if entry.generation != generation or not entry.enabled:
+                continue
+            if entry.ticks > 0:
+                # A one-shot is spent before its routine runs, so the routine may queue it again
+                if self.undo_log is not None:
+                    self.undo_log.touch_interrupt(entry.name)
+                entry.ticks = 0
+                self._schedule(entry)
+            if entry.routine is None:
+                continue
+
+            try:
+                if entry.routine(game):
+                    result = True
+            except Exception as e:
+                logger.error(f"Error running interrupt {entry.name}: {e}")
+
+        return result
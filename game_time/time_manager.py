@@ -0,0 +1,116 @@
+###############################################################################
+#   game_time/time_manager.py
+#
+#   The game clock.  Every turn is one minute of PRESENT-TIME, NPCs with a
+#   goal take one step, and the interrupts due on that turn run.
+#
+#   Waiting (ZIL's INT-WAIT, WAIT/"wait until" commands and headless runs)
+#   does not have to tick through every minute.  A turn on which no NPC can
+#   step and no interrupt is due changes nothing but the clock, so the clock
+#   jumps straight to the next turn on which something does happen.
+#
+###############################################################################
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from world.symbols import NOTHING
+from game_time.interrupts import InterruptScheduler
+
+if TYPE_CHECKING:
+    from world.world_manager import WorldManager
+
+
+logger = logging.getLogger(__name__)
+
+
+# Global holding the time of day in minutes since midnight
+PRESENT_TIME = "PRESENT-TIME"
+
+
+class TimeManager:
+    """
+    Turn clock with fast-forward over idle turns.
+    """
+
+    def __init__(self, world: 'WorldManager', interrupts: InterruptScheduler):
+        self.world: 'WorldManager' = world
+        self.interrupts: InterruptScheduler = interrupts
+        self.clock: int = world.global_handle(PRESENT_TIME)
+        self.turns_skipped: int = 0                     # idle turns fast-forwarded over (for profiling)
+
+
+    @property
+    def present_time(self) -> int:
+        return self.world.get_global(self.clock, 0)
+
+
+    def _advance_clock(self, minutes: int) -> None:
+        self.world.set_global(self.clock, self.present_time + minutes)
+
+
+    # ========== TURNS ==========
+    def turn(self, game: Any) -> bool:
+        """
+        Run one turn - advance the clock, step the NPCs toward their goals and run the due interrupts.
+
+        Returns:
+            True if any interrupt routine returned true (it printed something)
+        """
+        self._advance_clock(1)
+        self.world.advance_goals()
+        return self.interrupts.tick(game)
+
+
+    def idle_turns(self) -> Optional[int]:
+        """
+        Number of turns that will pass before one on which something happens, or None if nothing ever will
+        (no NPC can move and no interrupt is scheduled).
+        """
+        world = self.world
+        for person, goal in world.goals.items():
+            if world.navigation.next_hop(world.tree.parent[person], goal) != NOTHING:
+                return 0
+
+        due = self.interrupts.next_due()
+        return None if due is None else due - 1
+
+
+    def skip(self, turns: int) -> None:
+        """Let idle turns pass at once.  Only the clock changes."""
+        if turns > 0:
+            self.interrupts.advance(turns)
+            self._advance_clock(turns)
+            self.turns_skipped += turns
+
+
+    def wait(self, game: Any, turns: int, interruptible: bool = True) -> bool:
+        """
+        Let a number of turns pass, skipping the idle ones - ZIL's INT-WAIT.
+
+        Args:
+            game: The API passed to the interrupt routines
+            turns: Number of turns to wait
+            interruptible: Stop early when an interrupt prints something
+
+        Returns:
+            True if the whole wait passed, False if it was interrupted
+        """
+        remaining = turns
+        while remaining > 0:
+            idle = self.idle_turns()
+            if idle is None or idle >= remaining:
+                self.skip(remaining)
+                return True
+
+            self.skip(idle)
+            remaining -= idle + 1
+            if self.turn(game) and interruptible:
+                logger.debug(f"Wait interrupted with {remaining} turns to go")
+                return False
+
+        return True
+
+
+    def wait_until(self, game: Any, time: int, interruptible: bool = True) -> bool:
+        """Wait until PRESENT-TIME reaches a time of day (minutes since midnight)"""
+        return self.wait(game, time - self.present_time, interruptible)
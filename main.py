@@ -1,5 +1,6 @@
 import logging
 import argparse
+import asyncio
 import sys
 
 from pathlib import Path
@@ -15,6 +16,56 @@ def setup_logging(debug: bool = False):
     logging.basicConfig(level=level, format=format_str)
 
 
+def serve(engine, address, socket_path, workers=None, hibernate=None, memory_budget=None, idle_timeout=None,
+          initialize=True):
+    """Run the session server until interrupted"""
+    from game_io.hibernation import SessionPool
+    from game_io.host import SessionHost
+    from game_io.server import SessionServer
+
+    # A loaded saved game is the starting state of every session
+    if initialize:
+        engine.initialize_game()
+    host = None
+    if workers:
+        host = SessionHost(engine, workers)
+        host.start()
+    pool = None
+    if hibernate:
+        pool = SessionPool(engine, Path(hibernate), memory_budget=(memory_budget or 64) * 1024 * 1024,
+                           idle_timeout=idle_timeout or 300.0)
+    server = SessionServer(engine, host=host, pool=pool)
+
+    async def run():
+        if socket_path:
+            await server.start_unix(socket_path)
+        else:
+            host, _, port = address.rpartition(':')
+            await server.start_tcp(host or "127.0.0.1", int(port))
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    finally:
+        if host:
+            host.stop()
+
+
+def batch(engine, scripts_dir, output_dir, seed=None, workers=None, initialize=True):
+    """Play every script in a directory headlessly and print the totals"""
+    from game_io.batch import BatchRunner, DEFAULT_SEED, format_summary
+
+    if initialize:
+        engine.initialize_game()
+    runner = BatchRunner(engine, Path(output_dir) if output_dir else Path(scripts_dir).parent / "transcripts",
+                         seed=DEFAULT_SEED if seed is None else seed, workers=workers)
+    results = runner.run(Path(scripts_dir))
+    print(format_summary(results))
+    print(f"Transcripts and timings written to {runner.output_dir}")
+    if any(result.error for result in results):
+        sys.exit(1)
+
+
 def main():
     """Main entry point"""
 
@@ -23,8 +74,25 @@ def main():
     parser.add_argument('--debug', action='store_true', help='Enable debug mode')
     parser.add_argument('--load', type=str, help='Load a saved game')
     parser.add_argument('--data-path', type=str, help='Path to game data directory')
+    parser.add_argument('--serve', type=str, metavar='[HOST:]PORT', help='Host game sessions over TCP')
+    parser.add_argument('--socket', type=str, metavar='PATH', help='Host game sessions on a Unix socket')
+    parser.add_argument('--workers', type=int, metavar='N', help='Run hosted sessions or batch scripts in N worker processes')
+    parser.add_argument('--hibernate', type=str, metavar='DIR', help='Hibernate idle hosted sessions to DIR')
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help='Memory for resident hosted sessions before the least recently used are hibernated')
+    parser.add_argument('--idle-timeout', type=float, metavar='SECONDS', help='Hibernate sessions idle this long')
+    parser.add_argument('--seed', type=int, metavar='N', help='Seed the random numbers (replays exactly)')
+    parser.add_argument('--batch', type=str, metavar='DIR',
+                        help='Play every command script in DIR headlessly, one fresh session each')
+    parser.add_argument('--transcripts', type=str, metavar='DIR',
+                        help='Where --batch writes transcripts and timings (default: transcripts next to DIR)')
+    parser.add_argument('--trace', type=int, nargs='?', const=100, metavar='N',
+                        help='Trace API calls and print the last N (default 100, 0 for all) on exit')
     
     args = parser.parse_args()
+    if args.workers and (args.hibernate or args.memory_budget or args.idle_timeout) and (args.serve or args.socket):
+        parser.error("--hibernate, --memory-budget and --idle-timeout cannot be combined with --workers "
+                     "(hibernation runs in the server process)")
 
     # Setup logging
     setup_logging(args.debug)
@@ -70,15 +138,31 @@ def main():
         
         # Initialize subsystems
         engine.initialize_subsystems()
+        if args.seed is not None:
+            engine.reseed(args.seed)
+        if args.trace is not None:
+            engine.set_tracing(True)
+
+        try:
+            # Load saved game if specified
+            loaded = False
+            if args.load:
+                loaded = engine.load_game(args.load)
+                if not loaded:
+                    print(f"Warning: Could not load save file '{args.load}'. Starting new game.")
+
+            # Run scripts, host sessions, or start the game
+            if args.batch:
+                batch(engine, args.batch, args.transcripts, args.seed, args.workers, initialize=not loaded)
+            elif args.serve or args.socket:
+                serve(engine, args.serve, args.socket, args.workers, args.hibernate, args.memory_budget,
+                      args.idle_timeout, initialize=not loaded)
+            else:
+                engine.start_game(initialize=not loaded)
+        finally:
+            if args.trace is not None:
+                engine.tracer.dump(last=args.trace or None)
 
-        # Load saved game if specified
-        if args.load:
-            if not engine.load_game(args.load):
-                print(f"Warning: Could not load save file '{args.load}'. Starting new game.")
-        
-        # Start the game
-        engine.start_game()
-        
 
     except KeyboardInterrupt:
         print("\n\nGame interrupted. Thanks for playing!")
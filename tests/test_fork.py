@@ -0,0 +1,56 @@
+"""
+Forked sessions must hold exactly the state of the session they were forked from.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from core.engine import Engine
+from game_io.output import MemorySink
+
+
+GAME_PATH = Path(__file__).resolve().parent.parent / "Deadline"
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = Engine(GAME_PATH)
+    engine.load_game_data()
+    engine.initialize_subsystems()
+    engine.output.sink = MemorySink()
+    engine.initialize_game()
+    return engine
+
+
+def test_fork_keeps_value_types(engine):
+    session = engine.new_session(MemorySink())
+    session.api.SETG("LADDER-FLAG", 0)
+    session.api.PUTP("FOYER", "STATE", True)
+
+    fork = session.fork()
+    assert fork.api.GETG("LADDER-FLAG") is not False
+    assert fork.api.GETG("LADDER-FLAG") == 0
+    assert fork.api.GETP("FOYER", "STATE") is True
+
+
+def test_fork_fingerprint_matches_parent(engine):
+    session = engine.new_session(MemorySink())
+    game = session.api
+    world = session.world_manager
+    rng = random.Random(7)
+    names = ["LADDER-FLAG", "HOLE-SHOWN", "RST", "G-I-G"]
+    rooms = ["FOYER", "SOUTH-LAWN", "FRONT-PATH"]
+
+    for turn in range(100):
+        game.SETG(rng.choice(names), rng.choice([0, 1, False, True, None, 5]))
+        game.PUTP("FOYER", "STATE", rng.choice([0, False, 1, True]))
+        game.MOVE("DUNBAR", rng.choice(rooms))
+        (game.FSET if turn % 2 else game.FCLEAR)("FOYER", "OPENBIT")
+        game.QUEUE("I-MAIL-2", turn % 5)
+
+        fork = session.fork()
+        assert fork.api.FINGERPRINT() == game.FINGERPRINT()
+        assert fork.fingerprint() == session.fingerprint()
+        assert world.zobrist == world.zobrist_keys.full(world)
@@ -0,0 +1,285 @@
+###############################################################################
+#   world/action_index.py
+#
+#   Lazy loading of action modules.  Executing the whole of a game's
+#   actions.py at startup compiles a couple of hundred handlers when a
+#   session only touches a handful early on.  Instead the module source is
+#   indexed once (handler name -> line span, cached next to the module) and
+#   each handler is compiled into a shared module namespace the first time it
+#   is looked up through the function registry, together with the handlers
+#   it refers to by name.
+#
+###############################################################################
+import ast
+import builtins
+import logging
+import pickle
+import sys
+import types
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from core.exceptions import ActionRegistryError
+from world.snapshot import SourceStamp, source_stamp, stamp_is_current
+
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_FORMAT = 2
+
+# (first line, last line) of a top level statement, 1 based and inclusive
+Span = Tuple[int, int]
+
+
+@dataclass
+class ActionIndex:
+    """
+    Index of the top level definitions in an action module.
+    """
+    source_file: Path
+    stamp: SourceStamp
+    handlers: Dict[str, Span] = field(default_factory=dict)     # def/class name -> span
+    preamble: List[Span] = field(default_factory=list)          # everything else (constants, imports), in order
+    global_names: List[str] = field(default_factory=list)       # globals named in SETG/GETG calls, init_globals' first
+
+    @classmethod
+    def build(cls, source_file: Path) -> 'ActionIndex':
+        """Parse the module and record where every top level definition lives"""
+        with open(source_file, 'r') as f:
+            tree = ast.parse(f.read(), filename=str(source_file))
+
+        index = cls(source_file=source_file, stamp=source_stamp(source_file))
+        for node in tree.body:
+            start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+            span = (start, node.end_lineno)
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                # A later definition with the same name replaces the earlier one, just like exec would
+                index.handlers[node.name] = span
+            else:
+                index.preamble.append(span)
+
+        index.global_names = cls._global_names(tree)
+        return index
+
+
+    @staticmethod
+    def _global_names(tree: ast.Module) -> List[str]:
+        """Names of the globals the module sets or reads with a literal name, those set by init_globals first"""
+        names: Dict[str, None] = {}
+        init = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "init_globals"]
+        for root, calls in [(init, ("SETG",)), ([tree], ("SETG", "GETG"))]:
+            for node in (n for r in root for n in ast.walk(r)):
+                if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr in calls
+                        and node.args and isinstance(node.args[0], ast.Constant)
+                        and isinstance(node.args[0].value, str)):
+                    names.setdefault(node.args[0].value, None)
+        return list(names)
+
+
+    @classmethod
+    def load(cls, source_file: Path, cache_dir: Optional[Path] = None) -> 'ActionIndex':
+        """
+        Return the index for a module, reading it from the cache if the module is unchanged and
+        rebuilding (and re-caching) it otherwise.
+        """
+        cache_dir = cache_dir if cache_dir else source_file.parent / "__pycache__"
+        cache_file = cache_dir / f"{source_file.stem}.index.pickle"
+
+        try:
+            if cache_file.exists():
+                with open(cache_file, 'rb') as f:
+                    fmt, index = pickle.load(f)
+                if fmt == INDEX_FORMAT and stamp_is_current(source_file, index.stamp):
+                    index.source_file = source_file
+                    return index
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable action index {cache_file}: {e}")
+
+        index = cls.build(source_file)
+
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump((INDEX_FORMAT, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Unable to write action index {cache_file}: {e}")
+
+        return index
+
+
+
+def _referenced_names(code: types.CodeType) -> Set[str]:
+    """Every global (or attribute) name a code object and the functions nested in it refer to"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+
+class LazyNamespace:
+    """
+    Globals shared by all handlers of one action module.  The globals are a plain dict, so name lookups in a
+    running handler cost what they would in an imported module.  Instead a handler is compiled the first time
+    it is looked up, along with every not yet compiled handler its code names, so that everything it can
+    refer to is in place before it runs.
+    """
+
+    def __init__(self, index: ActionIndex, module_name: str):
+        self.index: ActionIndex = index
+        self.globals: Dict[str, Any] = {
+            "__name__": module_name,
+            "__file__": str(index.source_file),
+            "__builtins__": builtins,
+        }
+        self._lines: Optional[List[str]] = None
+        self._compiling: Set[str] = set()               # handlers whose dependencies are being compiled
+
+        for span in index.preamble:
+            self._exec_span(span)
+        self.preamble_names: List[str] = [name for name in self.globals if name not in index.handlers]
+
+
+    def _exec_span(self, span: Span) -> None:
+        if self._lines is None:
+            with open(self.index.source_file, 'r') as f:
+                self._lines = f.readlines()
+
+        start, end = span
+        # Pad with blank lines so tracebacks report the real line numbers in the module
+        source = "\n" * (start - 1) + "".join(self._lines[start - 1:end])
+        code = compile(source, str(self.index.source_file), "exec")
+        for name in _referenced_names(code):
+            if name not in self.globals and name not in self._compiling and name in self.index.handlers:
+                self._compile(name)
+        exec(code, self.globals)
+
+
+    def _compile(self, name: str) -> None:
+        self._compiling.add(name)
+        try:
+            self._exec_span(self.index.handlers[name])
+        finally:
+            self._compiling.discard(name)
+        logger.debug(f"Compiled action handler: {name}")
+
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.globals:
+            if name not in self.index.handlers:
+                raise KeyError(name)
+            self._compile(name)
+        return self.globals[name]
+
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.globals or name in self.index.handlers
+
+
+
+class LazyFunctionRegistry(MutableMapping):
+    """
+    Function registry that knows every handler name up front but only compiles a handler the first
+    time it is looked up.  Handlers can still be registered directly.
+    """
+
+    def __init__(self):
+        self._resolved: Dict[str, Callable] = {}
+        self._namespaces: Dict[str, LazyNamespace] = {}      # handler name -> namespace that can compile it
+
+
+    def add_module(self, namespace: LazyNamespace) -> None:
+        """Make every handler in a lazily loaded module available by name"""
+        for name in namespace.index.handlers:
+            self._resolved.pop(name, None)
+            self._namespaces[name] = namespace
+
+        # The callables the preamble binds (imports, aliases) are registered as the eager loader registers them
+        for name in namespace.preamble_names:
+            value = namespace.globals[name]
+            if callable(value):
+                self._namespaces.pop(name, None)
+                self._resolved[name] = value
+
+
+    def __getitem__(self, name: str) -> Callable:
+        func = self._resolved.get(name)
+        if func is not None:
+            return func
+
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            raise KeyError(name)
+
+        try:
+            func = namespace[name]
+        except Exception as e:
+            logger.error(f"Error compiling action handler {name}: {e}")
+            raise ActionRegistryError(f"Cannot load action handler {name}: {e}")
+
+        self._resolved[name] = func
+        return func
+
+
+    def __setitem__(self, name: str, func: Callable) -> None:
+        self._resolved[name] = func
+
+
+    def __delitem__(self, name: str) -> None:
+        found = name in self._resolved or name in self._namespaces
+        self._resolved.pop(name, None)
+        self._namespaces.pop(name, None)
+        if not found:
+            raise KeyError(name)
+
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._resolved or name in self._namespaces
+
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._namespaces
+        yield from (name for name in self._resolved if name not in self._namespaces)
+
+
+    def __len__(self) -> int:
+        return len(self._namespaces) + sum(1 for name in self._resolved if name not in self._namespaces)
+
+
+    @property
+    def resolved_count(self) -> int:
+        """Number of handlers that have actually been compiled or registered"""
+        return len(self._resolved)
+
+
+
+def make_lazy_module(namespace: LazyNamespace) -> types.ModuleType:
+    """
+    Wrap a lazy namespace in a module object (for sys.modules / loaded_modules) whose attribute access
+    resolves through the namespace.
+    """
+    module = types.ModuleType(namespace.globals["__name__"])
+    module.__file__ = namespace.globals["__file__"]
+
+    def __getattr__(name: str) -> Any:
+        try:
+            return namespace[name]
+        except KeyError:
+            raise AttributeError(f"module {module.__name__!r} has no attribute {name!r}")
+
+    module.__getattr__ = __getattr__
+    return module
+
+
+def load_lazy_module(module_name: str, module_file: Path) -> Tuple[types.ModuleType, LazyNamespace]:
+    """Index an action module and return the module object and its lazy namespace"""
+    index = ActionIndex.load(module_file)
+    namespace = LazyNamespace(index, module_name)
+    module = make_lazy_module(namespace)
+    sys.modules[module_name] = module
+    return module, namespace
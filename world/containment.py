@@ -0,0 +1,102 @@
+###############################################################################
+#   world/containment.py
+#
+#   ZIL style containment tree.  Every handle has a parent, a first child
+#   and a next sibling (plus a previous sibling so unlinking does not need to
+#   walk the sibling chain), which makes LOC, FIRST?, NEXT?, MOVE and REMOVE
+#   constant time no matter how crowded a room gets.
+#
+###############################################################################
+from array import array
+from typing import Iterator
+
+from world.symbols import NOTHING
+from world.overlay import OverlayList
+
+
+class ContainmentTree:
+    """
+    Parent / first-child / next-sibling links for every world handle.
+    """
+
+    def __init__(self, size: int = 0):
+        self.parent: array = array('i', bytes(4 * size))
+        self.first: array = array('i', bytes(4 * size))
+        self.next: array = array('i', bytes(4 * size))
+        self.prev: array = array('i', bytes(4 * size))
+
+
+    def overlay(self) -> 'ContainmentTree':
+        """Copy-on-write view of the tree for a session (see world/overlay.py)"""
+        tree = ContainmentTree.__new__(ContainmentTree)
+        tree.parent = OverlayList(self.parent)
+        tree.first = OverlayList(self.first)
+        tree.next = OverlayList(self.next)
+        tree.prev = OverlayList(self.prev)
+        return tree
+
+
+    def grow(self, size: int) -> None:
+        """Make room for handles up to size - 1"""
+        extra = size - len(self.parent)
+        if extra > 0:
+            for links in (self.parent, self.first, self.next, self.prev):
+                links.extend(array('i', bytes(4 * extra)))
+
+
+    def _unlink(self, handle: int) -> None:
+        parent = self.parent[handle]
+        if parent == NOTHING:
+            return
+
+        prev = self.prev[handle]
+        nxt = self.next[handle]
+        if prev != NOTHING:
+            self.next[prev] = nxt
+        else:
+            self.first[parent] = nxt
+        if nxt != NOTHING:
+            self.prev[nxt] = prev
+
+        self.parent[handle] = NOTHING
+        self.next[handle] = NOTHING
+        self.prev[handle] = NOTHING
+
+
+    def move(self, handle: int, dest: int) -> None:
+        """Move a handle into dest.  Like ZIL's MOVE it becomes the first thing in its new container."""
+        self._unlink(handle)
+        if dest == NOTHING:
+            return
+
+        head = self.first[dest]
+        self.parent[handle] = dest
+        self.next[handle] = head
+        if head != NOTHING:
+            self.prev[head] = handle
+        self.first[dest] = handle
+
+
+    def remove(self, handle: int) -> None:
+        """Take a handle out of its container (ZIL's REMOVE)"""
+        self._unlink(handle)
+
+
+    def children(self, handle: int) -> Iterator[int]:
+        """Iterate the direct contents of a handle, first to last"""
+        child = self.first[handle]
+        while child != NOTHING:
+            # Read the link before yielding so callers may move the child while iterating
+            nxt = self.next[child]
+            yield child
+            child = nxt
+
+
+    def is_inside(self, handle: int, container: int) -> bool:
+        """True if handle is anywhere below container, not just directly in it"""
+        parent = self.parent[handle]
+        while parent != NOTHING:
+            if parent == container:
+                return True
+            parent = self.parent[parent]
+        return False
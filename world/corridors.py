@@ -0,0 +1,154 @@
+###############################################################################
+#   world/corridors.py
+#
+#   Corridor index for line of sight.  Each room's P?CORRIDOR property is a
+#   bitmask of the corridors it lies on (Room.navigation.corridor), and the
+#   COR-n globals set up by the game list each corridor's rooms in order,
+#   preceded by the two directions along it:
+#
+#       COR-32 = [P?WEST, P?EAST, WEST-LAWN, WEST-OF-DOOR, FRONT-PATH, ..., 0]
+#
+#   Two rooms can see each other when their masks share a bit, and the
+#   direction from one to the other is the first direction if the target is
+#   earlier in the corridor's list and the second if it is later.
+#
+###############################################################################
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from world.symbols import NOTHING
+
+if TYPE_CHECKING:
+    from world.world_manager import WorldManager
+
+
+logger = logging.getLogger(__name__)
+
+
+# Globals holding corridor tables - COR-1, COR-2, COR-4 ... (the number is the corridor's bit)
+CORRIDOR_TABLE = re.compile(r"^COR-(\d+)$")
+
+
+@dataclass
+class Corridor:
+    """One corridor compiled from its COR-n table"""
+    bit: int
+    toward_start: str                                       # direction toward the first room in the list
+    toward_end: str                                         # direction toward the last room in the list
+    rooms: List[int] = field(default_factory=list)          # room handles in corridor order
+    position: Dict[int, int] = field(default_factory=dict)  # room handle -> index in rooms
+
+
+class CorridorIndex:
+    """
+    Room -> corridor mask and corridor -> ordered rooms, for constant time visibility checks.
+    """
+
+    def __init__(self, world: 'WorldManager'):
+        self.world: 'WorldManager' = world
+        self.masks: List[int] = []                  # room handle -> corridor bitmask
+        self.corridors: Dict[int, Corridor] = {}    # corridor bit -> corridor
+        self.table_globals: Dict[int, int] = {}     # global handle of a COR-n table -> corridor bit
+        self.corridor_prop: int = NOTHING
+        self._shared: bool = False                  # tables belong to the base world (overlays)
+
+
+    def overlay(self, world: 'WorldManager') -> 'CorridorIndex':
+        """Index for a session world, sharing the base tables until the session changes one"""
+        index = CorridorIndex(world)
+        index.masks = self.masks
+        index.corridors = self.corridors
+        index.table_globals = self.table_globals
+        index.corridor_prop = self.corridor_prop
+        index._shared = True
+        return index
+
+
+    def _own(self) -> None:
+        if self._shared:
+            self.masks = list(self.masks)
+            self.corridors = dict(self.corridors)
+            self.table_globals = dict(self.table_globals)
+            self._shared = False
+
+
+    def build(self) -> None:
+        """Read every room's corridor mask (P?CORRIDOR) into a flat array"""
+        world = self.world
+        self.corridor_prop = world.property_symbols.intern("CORRIDOR")
+        self.masks = [0] * len(world.entities)
+        self._shared = False
+        for handle, props in enumerate(world.properties):
+            self.masks[handle] = props.get(self.corridor_prop) or 0
+
+
+    def mask_changed(self, handle: int, value) -> None:
+        """Called by the world when a P?CORRIDOR property is written"""
+        self._own()
+        if handle >= len(self.masks):
+            self.masks.extend([0] * (handle + 1 - len(self.masks)))
+        self.masks[handle] = value or 0
+
+
+    def global_interned(self, name: str, handle: int) -> None:
+        """Called by the world for every new global name, to spot the corridor tables"""
+        match = CORRIDOR_TABLE.match(name)
+        if match:
+            self._own()
+            self.table_globals[handle] = int(match.group(1))
+
+
+    def load_table(self, handle: int, table) -> None:
+        """Compile a COR-n table that has just been set"""
+        self._own()
+        bit = self.table_globals[handle]
+        if not table or len(table) < 2:
+            self.corridors.pop(bit, None)
+            return
+
+        corridor = Corridor(bit=bit, toward_start=table[0], toward_end=table[1])
+        for room in table[2:]:
+            if not room:
+                break                                   # tables are 0 terminated like the ZIL LTABLEs
+            if room not in self.world.symbols:
+                logger.warning(f"Corridor COR-{bit} lists unknown room {room}")
+                continue
+            room_handle = self.world.symbols.handle(room)
+            corridor.position[room_handle] = len(corridor.rooms)
+            corridor.rooms.append(room_handle)
+
+        self.corridors[bit] = corridor
+
+
+    # ========== QUERIES ==========
+    def mask(self, room: int) -> int:
+        return self.masks[room] if room < len(self.masks) else 0
+
+
+    def can_see(self, room: int, other: int) -> bool:
+        """True if the rooms are the same or lie on a common corridor"""
+        return room == other or self.mask(room) & self.mask(other) != 0
+
+
+    def shared(self, room: int, other: int) -> Optional[Corridor]:
+        """The compiled corridor both rooms lie on (lowest bit first), if any"""
+        common = self.mask(room) & self.mask(other)
+        while common:
+            bit = common & -common
+            corridor = self.corridors.get(bit)
+            if corridor is not None and room in corridor.position and other in corridor.position:
+                return corridor
+            common ^= bit
+        return None
+
+
+    def direction(self, room: int, other: int) -> Optional[str]:
+        """Direction to look/walk along the shared corridor to get from room to other"""
+        corridor = self.shared(room, other)
+        if corridor is None or room == other:
+            return None
+        if corridor.position[other] < corridor.position[room]:
+            return corridor.toward_start
+        return corridor.toward_end
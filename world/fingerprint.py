@@ -0,0 +1,226 @@
+###############################################################################
+#   world/fingerprint.py
+#
+#   State fingerprints, for solvers and searches that need to recognise a
+#   game state they have already seen.  A fingerprint covers everything that
+#   decides how the game plays on from a state - containment (including the
+#   order of contents), flags, properties, global values by name, NPC goals,
+#   the pending interrupts with their remaining ticks, and where the player
+#   is - and nothing that does not (handle numbering, the absolute turn
+#   count, caches).  It is a 64-bit BLAKE2 digest, so it is the same in
+#   every process and on every run, unlike Python's hash().
+#
+#   state_fingerprint() reads the whole world.  For hash tables of millions
+#   of visited states there is also a Zobrist hash that the world and the
+#   interrupt scheduler keep up to date as they change: every (object,
+#   container), (object, flag), (object, property, value), (global, value)
+#   and (interrupt, schedule) pair has a 64-bit key derived from its names,
+#   and the hash is the XOR of the keys of the pairs that currently hold, so
+#   each MOVE/FSET/FCLEAR/PUTP/SETG/QUEUE updates it with a couple of XORs.
+#   The Zobrist hash ignores the order of a container's contents.
+#
+###############################################################################
+import functools
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from game_time.interrupts import InterruptScheduler
+    from world.world_manager import WorldManager
+
+
+MASK64 = (1 << 64) - 1
+
+
+def mix64(x: int) -> int:
+    """SplitMix64 finalizer - spreads the bits of a 64-bit int"""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+@functools.lru_cache(maxsize=4096)
+def name_key(text: str) -> int:
+    """Stable 64-bit key of a name"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def value_key(value: Any) -> int:
+    """
+    Stable 64-bit key of a value.  Ints and bools are only multiplied out (the pair keys mix them), anything
+    else is hashed by its repr.
+    """
+    if value is None:
+        return 0
+    if type(value) is int:
+        return (value * 0x9E3779B97F4A7C15) & MASK64
+    if type(value) is bool:
+        return 0x5BD1E995 if value else 0x1B873593
+    return int.from_bytes(hashlib.blake2b(f"{type(value).__name__}:{value!r}".encode(), digest_size=8).digest(), "big")
+
+
+def state_fingerprint(world: 'WorldManager', interrupts: Optional['InterruptScheduler'] = None,
+                      player: Iterable[Any] = ()) -> int:
+    """
+    Stable 64-bit fingerprint of a game state.
+
+    Args:
+        world: The world (a session overlay or a base world)
+        interrupts: The interrupt queue to include
+        player: Extra player state to include (HERE, WINNER)
+
+    Returns:
+        The fingerprint as an unsigned 64-bit int
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    update = digest.update
+    tree = world.tree
+    name_of = world.symbols.name
+
+    for handle in range(1, len(world.entities)):
+        # Names, not handles, so the fingerprint does not depend on the order things were interned in
+        update(f"{name_of(handle)}<{name_of(tree.parent[handle])}>{name_of(tree.next[handle])}|"
+               f"{world.flags.words[handle]:x}|".encode())
+        for prop, value in sorted(world.properties[handle].items()):
+            update(f"{world.property_symbols.name(prop)}={value!r};".encode())
+
+    for slot in sorted(range(1, len(world.globals.names)), key=world.globals.names.__getitem__):
+        value = world.globals.values[slot]
+        if value is not None:
+            update(f"{world.globals.names[slot]}={value!r};".encode())
+
+    for person, room in sorted((name_of(person), name_of(room)) for person, room in world.goals.items()):
+        update(f"goal:{person}>{room};".encode())
+
+    if interrupts is not None:
+        for name, enabled, ticks in sorted(interrupts.capture()[1]):
+            if enabled or ticks:
+                update(f"int:{name}:{int(enabled)}:{ticks};".encode())
+
+    for value in player:
+        update(f"player:{value};".encode())
+
+    return int.from_bytes(digest.digest(), "big")
+
+
+class ZobristKeys:
+    """
+    Keys for the incremental world hash.  Built for the base world and shared by its session overlays; the
+    keys depend only on names, so equal states hash equally in every process.
+    """
+
+    def __init__(self, world: 'WorldManager'):
+        self.world: 'WorldManager' = world
+        self.handles: List[int] = []                # handle -> key of its name
+        self.containers: List[int] = []             # handle -> key of the handle as a container
+        self._flags: Dict[str, int] = {}            # flag name -> key
+        self._properties: Dict[str, int] = {}       # property name -> key
+        self._globals: Dict[str, int] = {}          # global name -> key
+
+
+    def overlay(self, world: 'WorldManager') -> 'ZobristKeys':
+        """The same keys for a session world (names are looked up in the session's own tables)"""
+        keys = ZobristKeys.__new__(ZobristKeys)
+        keys.__dict__.update(self.__dict__)
+        keys.world = world
+        return keys
+
+
+    def build(self) -> None:
+        """Key every handle.  Called once the symbols are interned (and again if more are added)."""
+        name_of = self.world.symbols.name
+        self.handles = [0] + [name_key(f"obj:{name_of(handle)}") for handle in range(1, len(self.world.entities))]
+        self.containers = [0] + [mix64(key) for key in self.handles[1:]]
+
+
+    def grow(self) -> None:
+        """Key the handles interned since build()"""
+        name_of = self.world.symbols.name
+        for handle in range(len(self.handles), len(self.world.entities)):
+            key = name_key(f"obj:{name_of(handle)}")
+            self.handles.append(key)
+            self.containers.append(mix64(key))
+
+
+    def _flag(self, bit: int) -> int:
+        name = self.world.flags.names[bit]
+        key = self._flags.get(name)
+        if key is None:
+            key = self._flags[name] = name_key(f"flag:{name}")
+        return key
+
+
+    def _property(self, prop: int) -> int:
+        name = self.world.property_symbols.name(prop)
+        key = self._properties.get(name)
+        if key is None:
+            key = self._properties[name] = name_key(f"prop:{name}")
+        return key
+
+
+    def _global(self, name: str) -> int:
+        key = self._globals.get(name)
+        if key is None:
+            key = self._globals[name] = name_key(f"global:{name}")
+        return key
+
+
+    # ========== PAIR KEYS ==========
+    def location(self, handle: int, parent: int) -> int:
+        return mix64(self.handles[handle] ^ self.containers[parent]) if parent else 0
+
+
+    def flag(self, handle: int, bit: int) -> int:
+        return mix64(self.handles[handle] ^ self._flag(bit))
+
+
+    def flags(self, handle: int, word: int) -> int:
+        """XOR of the keys of every flag set in a word"""
+        key = 0
+        while word:
+            low = word & -word
+            key ^= self.flag(handle, low.bit_length() - 1)
+            word ^= low
+        return key
+
+
+    def property(self, handle: int, prop: int, value: Any) -> int:
+        return mix64(self.handles[handle] ^ self._property(prop) ^ value_key(value))
+
+
+    def properties(self, handle: int, props: Dict[int, Any]) -> int:
+        key = 0
+        for prop, value in props.items():
+            key ^= self.property(handle, prop, value)
+        return key
+
+
+    def global_value(self, slot: int, value: Any) -> int:
+        if value is None:
+            return 0
+        return mix64(self._global(self.world.globals.names[slot]) ^ value_key(value))
+
+
+    def full(self, world: 'WorldManager') -> int:
+        """The hash of a world computed from scratch (world may be an overlay sharing these keys)"""
+        key = 0
+        parent = world.tree.parent
+        for handle in range(1, len(world.entities)):
+            key ^= self.location(handle, parent[handle])
+            key ^= self.flags(handle, world.flags.words[handle])
+            key ^= self.properties(handle, world.properties[handle])
+        for slot in range(1, len(world.globals.names)):
+            key ^= self.global_value(slot, world.globals.values[slot])
+        return key
+
+
+def interrupt_key(name: int, enabled: bool, ticks: int, due: Optional[int]) -> int:
+    """
+    Key of an interrupt's schedule (name is the name_key() of the interrupt's name).  0 when it is not pending,
+    so cancelled interrupts do not count.
+    """
+    if ticks == 0:
+        return 0
+    when = due if enabled and due is not None else ticks
+    return mix64(name ^ mix64((when & MASK64) ^ (1 if enabled else 2)))
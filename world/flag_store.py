@@ -0,0 +1,133 @@
+###############################################################################
+#   world/flag_store.py
+#
+#   Flag storage for every world handle.  Each object/room keeps its flags in
+#   one 64 bit word of a flat array, and flag names are resolved to bit
+#   positions once.  Alongside the rows the store keeps one bitset per flag
+#   (bit n set = handle n has the flag) so bulk queries such as "every PERSON"
+#   or "every TAKEBIT object in this room" are big-int mask operations rather
+#   than loops over objects.
+#
+###############################################################################
+from array import array
+from typing import Dict, Iterable, Iterator, List, Union
+
+from core.flags import ObjectFlag
+from core.exceptions import GameException
+from world.overlay import OverlayList
+
+
+# A flag may be given by name ("OPENBIT") or by its resolved bit position
+FlagRef = Union[int, str]
+
+
+class FlagStore:
+    """
+    Handle indexed flag words with per-flag bitsets for bulk queries.
+    """
+    MAX_FLAGS = 64
+
+    def __init__(self, size: int = 0):
+        self.bits: Dict[str, int] = {}                      # flag name -> bit position
+        self.names: List[str] = []                          # bit position -> flag name
+        self.words: array = array('Q', bytes(8 * size))     # handle -> flag word
+        self.columns: List[int] = []                        # bit position -> bitset of handles
+        self._shared_names: bool = False                    # bits/names belong to the base store (overlays)
+
+        # The flags the engine knows about get the low, stable bit positions.  Any other flag names found in
+        # the world files are allocated on first use.
+        for member in ObjectFlag:
+            if member.name != "NONE":
+                self.bit(member.name)
+
+
+    def overlay(self) -> 'FlagStore':
+        """
+        Copy-on-write view of the flag words for a session.  The per-flag bitsets are at most 64 ints, so they are
+        copied; the flag names are only copied if the session allocates a new one.
+        """
+        store = FlagStore.__new__(FlagStore)
+        store.bits = self.bits
+        store.names = self.names
+        store.words = OverlayList(self.words)
+        store.columns = list(self.columns)
+        store._shared_names = True
+        return store
+
+
+    def bit(self, flag: FlagRef) -> int:
+        """Resolve a flag name to its bit position, allocating one for names not seen before"""
+        if isinstance(flag, int):
+            return flag
+
+        bit = self.bits.get(flag)
+        if bit is None:
+            bit = len(self.names)
+            if bit >= self.MAX_FLAGS:
+                raise GameException(f"Too many distinct flags, cannot add {flag}")
+            if self._shared_names:
+                self.bits = dict(self.bits)
+                self.names = list(self.names)
+                self._shared_names = False
+            self.bits[flag] = bit
+            self.names.append(flag)
+            self.columns.append(0)
+        return bit
+
+
+    def grow(self, size: int) -> None:
+        """Make room for handles up to size - 1"""
+        if size > len(self.words):
+            self.words.extend(array('Q', bytes(8 * (size - len(self.words)))))
+
+
+    # ========== SINGLE HANDLE ==========
+    def test(self, handle: int, bit: int) -> bool:
+        return (self.words[handle] >> bit) & 1 == 1
+
+    def set(self, handle: int, bit: int) -> None:
+        self.words[handle] |= 1 << bit
+        self.columns[bit] |= 1 << handle
+
+    def clear(self, handle: int, bit: int) -> None:
+        self.words[handle] &= ~(1 << bit)
+        self.columns[bit] &= ~(1 << handle)
+
+    def load(self, handle: int, flag_names: Iterable[str]) -> None:
+        """Set a handle's initial flags from the names in the world files"""
+        for name in flag_names:
+            self.set(handle, self.bit(name))
+
+    def flag_names(self, handle: int) -> List[str]:
+        word = self.words[handle]
+        return [name for bit, name in enumerate(self.names) if (word >> bit) & 1]
+
+
+    # ========== BULK QUERIES ==========
+    def having(self, flag: FlagRef, within: int = -1) -> int:
+        """
+        Bitset of the handles with a flag set, optionally restricted to another bitset of handles.
+        """
+        return self.columns[self.bit(flag)] & within
+
+    def having_all(self, flags: Iterable[FlagRef], within: int = -1) -> int:
+        result = within
+        for flag in flags:
+            result &= self.columns[self.bit(flag)]
+        return result
+
+    @staticmethod
+    def bitset(handles: Iterable[int]) -> int:
+        """Build a handle bitset (for use as `within`) from handles"""
+        result = 0
+        for handle in handles:
+            result |= 1 << handle
+        return result
+
+    @staticmethod
+    def handles(bitset: int) -> Iterator[int]:
+        """Iterate the handles in a bitset in ascending order"""
+        while bitset:
+            low = bitset & -bitset
+            yield low.bit_length() - 1
+            bitset ^= low
@@ -0,0 +1,104 @@
+###############################################################################
+#   world/globals_table.py
+#
+#   Global variables (ZIL's SETG/GVAL) in fixed slots.  The names a game
+#   uses are known before it runs - the action index records every global
+#   set up by init_globals and every other literal SETG/GETG name - so they
+#   are given slots when the action modules are loaded and a lookup is one
+#   dictionary hit plus a list index.  Names first seen at run time are
+#   given the next free slot.
+#
+#   Each slot carries a version counter that is bumped on every write, so
+#   anything caching a value derived from a global can check whether it is
+#   still current without comparing values.
+#
+###############################################################################
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.exceptions import ObjectNotFoundError
+from world.overlay import OverlayList
+
+
+class GlobalsTable:
+    """
+    Slot indexed global variables with per-slot write versions.  Slot 0 is unused.
+    """
+
+    def __init__(self):
+        self.slots: Dict[str, int] = {}             # name -> slot
+        self.names: List[Optional[str]] = [None]    # slot -> name
+        self.values: List[Any] = [None]             # slot -> value (None when never set)
+        self.versions: List[int] = [0]              # slot -> number of writes
+        self._shared_names: bool = False            # slots/names belong to the base table (overlays)
+
+
+    def overlay(self) -> 'GlobalsTable':
+        """Copy-on-write view of the table for a session.  The name index is only copied if a new name is added."""
+        table = GlobalsTable.__new__(GlobalsTable)
+        table.slots = self.slots
+        table.names = self.names
+        table.values = OverlayList(self.values)
+        table.versions = OverlayList(self.versions)
+        table._shared_names = True
+        return table
+
+
+    def intern(self, name: str) -> int:
+        """Slot for a name, allocating one if the name is new"""
+        slot = self.slots.get(name)
+        if slot is None:
+            if self._shared_names:
+                self.slots = dict(self.slots)
+                self.names = list(self.names)
+                self._shared_names = False
+            slot = len(self.names)
+            self.slots[name] = slot
+            self.names.append(name)
+            self.values.append(None)
+            self.versions.append(0)
+        return slot
+
+
+    def reserve(self, names: Iterable[str]) -> int:
+        """Allocate slots for known names up front.  Returns the number of new slots."""
+        before = len(self.names)
+        for name in names:
+            self.intern(name)
+        return len(self.names) - before
+
+
+    def slot(self, ref) -> int:
+        """Resolve a name (interning it) or validate a slot number"""
+        if isinstance(ref, int):
+            if not 0 < ref < len(self.names):
+                raise ObjectNotFoundError(f"No global in slot {ref}")
+            return ref
+        return self.intern(ref)
+
+
+    def name(self, slot: int) -> Optional[str]:
+        return self.names[slot]
+
+
+    def get(self, slot: int, default: Any = None) -> Any:
+        value = self.values[slot]
+        return default if value is None else value
+
+
+    def set(self, slot: int, value: Any) -> None:
+        self.values[slot] = value
+        self.versions[slot] += 1
+
+
+    def version(self, slot: int) -> int:
+        return self.versions[slot]
+
+
+    def __contains__(self, ref: object) -> bool:
+        if isinstance(ref, int):
+            return 0 < ref < len(self.names)
+        return ref in self.slots
+
+
+    def __len__(self) -> int:
+        return len(self.names)
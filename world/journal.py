@@ -0,0 +1,38 @@
+###############################################################################
+#   world/journal.py
+#
+#   Change journal - which handles and global slots the world has written
+#   since the last checkpoint.  The world marks them as it goes (a set add per
+#   write), so a save only has to look at what actually changed instead of
+#   walking every object and room.
+#
+###############################################################################
+from typing import Set
+
+
+class ChangeJournal:
+    """
+    Dirty sets of the handle indexed runtime state.
+    """
+
+    def __init__(self):
+        self.tree: Set[int] = set()             # handles whose containment links were written
+        self.flags: Set[int] = set()            # handles whose flag word was written
+        self.properties: Set[int] = set()       # handles whose property dict was replaced
+        self.globals: Set[int] = set()          # global slots that were set
+        self.flag_count: int = 0                # flag names that existed at the checkpoint
+        self.global_count: int = 0              # global names that existed at the checkpoint
+
+
+    def clear(self, flag_count: int = 0, global_count: int = 0) -> None:
+        """Start a new checkpoint"""
+        self.flag_count = flag_count
+        self.global_count = global_count
+        self.tree = set()
+        self.flags = set()
+        self.properties = set()
+        self.globals = set()
+
+
+    def __len__(self) -> int:
+        return len(self.tree) + len(self.flags) + len(self.properties) + len(self.globals)
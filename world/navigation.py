@@ -0,0 +1,294 @@
+###############################################################################
+#   world/navigation.py
+#
+#   Room graph for NPC movement.  The graph is compiled from Room.exits:
+#
+#       Normal_Exit         - always passable
+#       Door_Exit           - passable unless the door is a hidden one that
+#                             is still closed (NPCs open ordinary doors)
+#       Conditional_Exit    - passable while its cond_var global is true
+#       Non_Exit            - not an edge at all
+#
+#   For every destination room the graph keeps a breadth first tree giving,
+#   for each source room, the distance and the next room to step to.  That
+#   makes an NPC step toward its goal a dictionary lookup.  When a door is
+#   opened/closed or a condition global changes, only the destinations
+#   whose trees are affected by the edges that flipped are recomputed.
+#
+###############################################################################
+import logging
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from core.game_object import ExitType, Room
+from world.symbols import NOTHING
+
+if TYPE_CHECKING:
+    from world.world_manager import WorldManager
+
+
+logger = logging.getLogger(__name__)
+
+
+# A door object with DOOR_HIDDEN_FLAG (Deadline's secret panels, HIDDEN-DOOR-L/-B) stops NPCs while it is closed
+DOOR_HIDDEN_FLAG = "INVISIBLE"
+DOOR_OPEN_FLAG = "OPENBIT"
+
+
+@dataclass
+class Edge:
+    """One exit from a room, compiled to handles"""
+    direction: str
+    source: int
+    dest: int
+    kind: ExitType
+    door: int = NOTHING         # door object handle for DOOR exits
+    cond: int = NOTHING         # global handle for CONDITIONAL exits
+    open: bool = True           # current passability
+
+
+class NavigationGraph:
+    """
+    Typed room graph with a per-destination next-hop table.
+    """
+
+    def __init__(self, world: 'WorldManager'):
+        self.world: 'WorldManager' = world
+        self.door_mask: int = 0                             # flags whose changes can open or close a door edge
+        self._hidden_mask: int = 0
+        self._open_mask: int = 0
+
+        self.edges: Dict[int, Dict[int, List[Edge]]] = {}   # source -> dest -> edges (several exits may share a dest)
+        self.reverse: Dict[int, Set[int]] = {}              # dest -> sources with an exit to it
+        self.door_edges: Dict[int, List[Edge]] = {}         # door handle -> edges through it
+        self.cond_edges: Dict[int, List[Edge]] = {}         # global handle -> edges guarded by it
+
+        # destination -> source -> (distance, next room)
+        self.hops: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        self._shared: bool = False                          # graph belongs to the base world (overlays)
+
+
+    def overlay(self, world: 'WorldManager') -> 'NavigationGraph':
+        """
+        Graph for a session world.  It shares the base graph until a door or condition change in the session
+        actually opens or closes a link, and only then takes its own copy.
+        """
+        graph = NavigationGraph(world)
+        graph.door_mask = self.door_mask
+        graph._hidden_mask = self._hidden_mask
+        graph._open_mask = self._open_mask
+        graph.edges = self.edges
+        graph.reverse = self.reverse
+        graph.door_edges = self.door_edges
+        graph.cond_edges = self.cond_edges
+        graph.hops = self.hops
+        graph._shared = True
+        return graph
+
+
+    def _own(self, edges: List[Edge]) -> List[Edge]:
+        """Copy the shared edges and next-hop table, returning the copies of the given edges"""
+        copies: Dict[int, Edge] = {}
+        for dests in self.edges.values():
+            for links in dests.values():
+                for edge in links:
+                    copies[id(edge)] = replace(edge)
+
+        self.edges = {source: {dest: [copies[id(edge)] for edge in links] for dest, links in dests.items()}
+                      for source, dests in self.edges.items()}
+        self.door_edges = {door: [copies[id(edge)] for edge in links] for door, links in self.door_edges.items()}
+        self.cond_edges = {cond: [copies[id(edge)] for edge in links] for cond, links in self.cond_edges.items()}
+        self.hops = dict(self.hops)
+        self._shared = False
+        return [copies[id(edge)] for edge in edges]
+
+
+    # ========== BUILDING ==========
+    def build(self) -> None:
+        """Compile the graph from Room.exits and compute the full next-hop table"""
+        world = self.world
+        self._hidden_mask = 1 << world.flags.bit(DOOR_HIDDEN_FLAG)
+        self._open_mask = 1 << world.flags.bit(DOOR_OPEN_FLAG)
+        self.door_mask = self._hidden_mask | self._open_mask
+
+        self.edges = {}
+        self.reverse = {}
+        self.door_edges = {}
+        self.cond_edges = {}
+        self._shared = False
+
+        for room_name, room in world.rooms.items():
+            self._compile_room(world.symbols.handle(room_name), room)
+
+        self.hops = {}
+        for dest in self.edges:
+            self._solve(dest)
+
+        logger.info(f"Navigation graph compiled: {sum(len(d) for d in self.edges.values())} room links")
+
+
+    def _compile_room(self, source: int, room: Room) -> None:
+        self.edges[source] = {}
+        for exit in room.exits.values():
+            edge = self._compile(source, room, exit)
+            if edge is not None:
+                self.edges[source].setdefault(edge.dest, []).append(edge)
+                self.reverse.setdefault(edge.dest, set()).add(source)
+
+
+    def rooms_changed(self, sources: Set[int]) -> None:
+        """
+        Recompile the exits of some rooms whose descriptions were reloaded (or that are new), and recompute only
+        the routes the changed links can affect.
+        """
+        world = self.world
+        before = {source: {dest for dest in self.edges.get(source, {}) if self._linked(source, dest)}
+                  for source in sources}
+
+        for source in sources:
+            for dest in self.edges.pop(source, {}):
+                self.reverse[dest].discard(source)
+        self.door_edges = {door: [edge for edge in links if edge.source not in sources]
+                           for door, links in self.door_edges.items()}
+        self.cond_edges = {cond: [edge for edge in links if edge.source not in sources]
+                           for cond, links in self.cond_edges.items()}
+
+        flipped = []
+        for source in sources:
+            self._compile_room(source, world.entities[source])
+            after = {dest for dest in self.edges[source] if self._linked(source, dest)}
+            flipped.extend((source, dest, True) for dest in after - before[source])
+            flipped.extend((source, dest, False) for dest in before[source] - after)
+
+        self._reroute(flipped)
+        for source in sources:
+            if source not in self.hops:
+                self._solve(source)                         # a new room as a destination
+
+        logger.info(f"Navigation: {len(sources)} rooms recompiled, {len(flipped)} links changed")
+
+
+    def _compile(self, source: int, room: Room, exit) -> Optional[Edge]:
+        world = self.world
+        if exit.type == ExitType.NON_EXIT:
+            return None
+
+        if not exit.dest or exit.dest not in world.rooms:
+            logger.warning(f"Exit {exit.name} from {room.name} leads to unknown room {exit.dest!r}")
+            return None
+
+        edge = Edge(direction=exit.name, source=source, dest=world.symbols.handle(exit.dest), kind=exit.type)
+
+        if exit.type == ExitType.DOOR and exit.door_obj in world.symbols:
+            edge.door = world.symbols.handle(exit.door_obj)
+            self.door_edges.setdefault(edge.door, []).append(edge)
+        elif exit.type == ExitType.CONDITIONAL and exit.cond_var:
+            edge.cond = world.global_handle(exit.cond_var)
+            self.cond_edges.setdefault(edge.cond, []).append(edge)
+
+        edge.open = self._passable(edge)
+        return edge
+
+
+    def _passable(self, edge: Edge) -> bool:
+        if edge.kind == ExitType.DOOR and edge.door != NOTHING:
+            word = self.world.flags.words[edge.door]
+            return not word & self._hidden_mask or bool(word & self._open_mask)
+        if edge.kind == ExitType.CONDITIONAL and edge.cond != NOTHING:
+            return bool(self.world.globals.values[edge.cond])
+        return True
+
+
+    def _linked(self, source: int, dest: int) -> bool:
+        return any(edge.open for edge in self.edges.get(source, {}).get(dest, ()))
+
+
+    def _solve(self, dest: int) -> None:
+        """Breadth first search backwards from dest over the passable edges"""
+        tree: Dict[int, Tuple[int, int]] = {dest: (0, dest)}
+        frontier = deque([dest])
+        while frontier:
+            room = frontier.popleft()
+            distance = tree[room][0] + 1
+            for source in self.reverse.get(room, ()):
+                if source not in tree and self._linked(source, room):
+                    tree[source] = (distance, room)
+                    frontier.append(source)
+        self.hops[dest] = tree
+
+
+    # ========== INVALIDATION ==========
+    def _refresh(self, edges: List[Edge]) -> None:
+        if self._shared:
+            if all(edge.open == self._passable(edge) for edge in edges):
+                return
+            edges = self._own(edges)
+
+        flipped = []
+        for edge in edges:
+            was_linked = self._linked(edge.source, edge.dest)
+            edge.open = self._passable(edge)
+            if self._linked(edge.source, edge.dest) != was_linked:
+                flipped.append((edge.source, edge.dest, not was_linked))
+
+        self._reroute(flipped)
+
+
+    def _reroute(self, flipped: List[Tuple[int, int, bool]]) -> None:
+        """Recompute the next-hop trees that links opening or closing (source, dest, opened) can change"""
+        if not flipped:
+            return
+
+        stale: Set[int] = set()
+        for dest, tree in self.hops.items():
+            for source, target, opened in flipped:
+                if opened:
+                    # A new link only matters if it gives source a shorter route than it has now
+                    via = tree.get(target)
+                    if via is not None and (source not in tree or via[0] + 1 < tree[source][0]):
+                        stale.add(dest)
+                elif tree.get(source, (0, NOTHING))[1] == target and source != dest:
+                    # A closed link only matters if some route in this tree used it
+                    stale.add(dest)
+
+        for dest in stale:
+            self._solve(dest)
+
+        logger.debug(f"Navigation: {len(flipped)} links changed, {len(stale)} destinations recomputed")
+
+
+    def door_changed(self, door: int) -> None:
+        """Called by the world when a flag on a door object changes"""
+        edges = self.door_edges.get(door)
+        if edges:
+            self._refresh(edges)
+
+
+    def global_changed(self, handle: int) -> None:
+        """Called by the world when a global variable changes"""
+        edges = self.cond_edges.get(handle)
+        if edges:
+            self._refresh(edges)
+
+
+    # ========== QUERIES ==========
+    def next_hop(self, source: int, dest: int) -> int:
+        """Next room on a shortest passable route from source to dest (NOTHING if unreachable or there)"""
+        step = self.hops.get(dest, {}).get(source)
+        if step is None or source == dest:
+            return NOTHING
+        return step[1]
+
+
+    def distance(self, source: int, dest: int) -> Optional[int]:
+        step = self.hops.get(dest, {}).get(source)
+        return step[0] if step is not None else None
+
+
+    def direction(self, source: int, dest: int) -> Optional[str]:
+        """Direction of an open exit from source leading directly to dest"""
+        for edge in self.edges.get(source, {}).get(dest, ()):
+            if edge.open:
+                return edge.direction
+        return None
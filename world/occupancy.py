@@ -0,0 +1,90 @@
+###############################################################################
+#   world/occupancy.py
+#
+#   Per-room index of the PERSON objects in it.  IS_INHABITED, POPULATION,
+#   the window handlers and the NPC sequences all want to know who is in a
+#   room; rather than scanning the room's contents for PERSON flags every
+#   time, the world keeps this index current as people move.
+#
+###############################################################################
+from typing import Dict, List, Optional, Set
+
+
+class OccupancyIndex:
+    """
+    Room handle -> the PERSON handles directly in it, in arrival order.
+    """
+
+    def __init__(self):
+        # Dicts are used as insertion ordered sets
+        self._occupants: Dict[int, Dict[int, None]] = {}
+        self._shared: Set[int] = set()          # rooms whose occupant dict still belongs to the base index
+
+
+    def overlay(self) -> 'OccupancyIndex':
+        """Copy-on-write view of the index for a session - a room's occupants are copied when they change"""
+        index = OccupancyIndex()
+        index._occupants = dict(self._occupants)
+        index._shared = set(self._occupants)
+        return index
+
+
+    def _own(self, room: int) -> Optional[Dict[int, None]]:
+        people = self._occupants.get(room)
+        if room in self._shared:
+            self._shared.discard(room)
+            if people is not None:
+                people = self._occupants[room] = dict(people)
+        return people
+
+
+    def add(self, person: int, room: int) -> None:
+        people = self._own(room)
+        if people is None:
+            people = self._occupants[room] = {}
+        people[person] = None
+
+
+    def discard(self, person: int, room: int) -> None:
+        people = self._own(room)
+        if people is not None:
+            people.pop(person, None)
+            if not people:
+                del self._occupants[room]
+
+
+    def occupants(self, room: int) -> List[int]:
+        """Handles of the people in a room"""
+        people = self._occupants.get(room)
+        return list(people) if people else []
+
+
+    def count(self, room: int) -> int:
+        """Number of people in a room"""
+        people = self._occupants.get(room)
+        return len(people) if people else 0
+
+
+    def capture(self) -> Dict[int, List[int]]:
+        """Room -> occupants in arrival order, as plain data"""
+        return {room: list(people) for room, people in self._occupants.items()}
+
+
+    def rooms(self) -> List[int]:
+        """Handles of the rooms with someone in them"""
+        return list(self._occupants)
+
+
+    def load_rooms(self, occupants: Dict[int, List[int]]) -> None:
+        """Replace the occupants of the given rooms (capture() form - an empty list empties the room)"""
+        for room, people in occupants.items():
+            self._shared.discard(room)
+            if people:
+                self._occupants[room] = dict.fromkeys(people)
+            else:
+                self._occupants.pop(room, None)
+
+
+    def clear(self) -> None:
+        self._occupants = {}
+        self._shared = set()
@@ -0,0 +1,67 @@
+###############################################################################
+#   world/overlay.py
+#
+#   Copy-on-write list for per-session world state.  Many sessions can play
+#   in one process on top of a single loaded world: each session's state
+#   arrays (containment links, flag words, properties, global values) are
+#   overlays that keep only the entries that session has written, and read
+#   everything else from the shared base array.  A session's memory is then
+#   proportional to what it changed rather than to the size of the world.
+#
+#   The base must not be written to once overlays have been made over it.
+#
+###############################################################################
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+
+class OverlayList:
+    """
+    Indexable, appendable view over a base sequence that records writes in its own dictionary.
+    Supports what the world's state arrays are used for: indexing, assignment, len, iteration and
+    append/extend.  Indexes must be non-negative.
+    """
+    __slots__ = ("base", "changes", "_length")
+
+    def __init__(self, base: Sequence):
+        self.base: Sequence = base
+        self.changes: Dict[int, Any] = {}       # index -> value written through this overlay
+        self._length: int = len(base)
+
+
+    def __getitem__(self, index: int) -> Any:
+        changes = self.changes
+        if index in changes:
+            return changes[index]
+        if index >= self._length:
+            raise IndexError("overlay index out of range")
+        return self.base[index]
+
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        if index >= self._length:
+            raise IndexError("overlay assignment index out of range")
+        self.changes[index] = value
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self._length):
+            yield self[index]
+
+
+    def append(self, value: Any) -> None:
+        self.changes[self._length] = value
+        self._length += 1
+
+
+    def extend(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self.append(value)
+
+
+    def materialize(self) -> list:
+        """Plain list of the current contents (base with the changes applied)"""
+        return list(self)
@@ -0,0 +1,174 @@
+###############################################################################
+#   world/scope.py
+#
+#   Scope resolution - "what can the player refer to right now".  See the
+#   notes in world_manager.py for the three tiers:
+#
+#       Local         - the room, its contents, and the contents of anything
+#                       open/transparent/a surface, plus the actor's inventory
+#       Local-Global  - the LOCAL-GLOBALS listed in Room.global_objects
+#       Global        - everything in GLOBAL-OBJECTS
+#
+#   The Local-Global and Global tiers are precomputed per room.  The Local
+#   tier is cached per room and only recomputed for rooms where something
+#   moved or a container was opened/closed since the last query.
+#
+###############################################################################
+import logging
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Set
+
+from world.symbols import NOTHING
+from world.flag_store import FlagStore
+
+if TYPE_CHECKING:
+    from world.world_manager import WorldManager
+
+
+logger = logging.getLogger(__name__)
+
+
+# Flags that let the parser see into a container
+SEE_INSIDE_FLAGS = ("OPEN", "OPENBIT", "TRANSPARENT", "TRANSBIT", "SURFACE", "SURFACEBIT")
+
+
+class ScopeResolver:
+    """
+    Per-room object scope as handle bitsets (see FlagStore.handles to iterate them).
+    """
+
+    def __init__(self, world: 'WorldManager'):
+        self.world: 'WorldManager' = world
+        self.rooms_handle: int = NOTHING
+        self.globals_handle: int = NOTHING
+
+        self.see_inside_mask: int = 0                   # flag word mask of SEE_INSIDE_FLAGS
+        self.global_tier: int = 0                       # bitset of GLOBAL-OBJECTS
+        self.room_globals: Dict[int, int] = {}          # room handle -> bitset of its LOCAL-GLOBALS
+        self._local: Dict[int, int] = {}                # room handle -> cached Local tier bitset
+        self._dirty: Set[int] = set()                   # rooms whose Local tier must be recomputed
+
+
+    def overlay(self, world: 'WorldManager') -> 'ScopeResolver':
+        """Resolver for a session world.  The static tiers are shared; the Local tier caches are the session's own."""
+        scope = ScopeResolver(world)
+        scope.rooms_handle = self.rooms_handle
+        scope.globals_handle = self.globals_handle
+        scope.see_inside_mask = self.see_inside_mask
+        scope.global_tier = self.global_tier
+        scope.room_globals = self.room_globals
+        scope._local = dict(self._local)
+        scope._dirty = set(self._dirty)
+        return scope
+
+
+    def build(self, rooms_handle: int, globals_handle: int) -> None:
+        """Precompute the static tiers.  Called once the containment tree has been populated."""
+        world = self.world
+        self.rooms_handle = rooms_handle
+        self.globals_handle = globals_handle
+
+        self.see_inside_mask = 0
+        for flag in SEE_INSIDE_FLAGS:
+            self.see_inside_mask |= 1 << world.flags.bit(flag)
+
+        self.global_tier = FlagStore.bitset(world.tree.children(globals_handle))
+
+        self.room_globals = {}
+        for room_name, room in world.rooms.items():
+            self.room_changed(world.symbols.handle(room_name))
+
+        self._local = {}
+        self._dirty = set()
+
+
+    def room_changed(self, room: int) -> None:
+        """Re-read the LOCAL-GLOBALS of one room (at build, and when its description is reloaded)"""
+        world = self.world
+        handles = []
+        for name in world.entities[room].global_objects:
+            if name in world.symbols:
+                handles.append(world.symbols.handle(name))
+            else:
+                logger.warning(f"Room {world.symbols.name(room)} lists unknown local-global {name}")
+        self.room_globals[room] = FlagStore.bitset(handles)
+
+
+    # ========== INCREMENTAL UPDATES ==========
+    def room_of(self, handle: int) -> int:
+        """The room a handle is (possibly indirectly) inside, or NOTHING"""
+        parent = self.world.tree.parent
+        while handle != NOTHING:
+            container = parent[handle]
+            if container == self.rooms_handle:
+                return handle
+            handle = container
+        return NOTHING
+
+
+    def _touch(self, handle: int) -> None:
+        room = self.room_of(handle)
+        if room != NOTHING and room in self._local:
+            self._dirty.add(room)
+
+
+    def moved(self, handle: int, old_parent: int, new_parent: int) -> None:
+        """Called by the world for every MOVE/REMOVE, with the containers before and after"""
+        if old_parent == self.globals_handle:
+            self.global_tier &= ~(1 << handle)
+        if new_parent == self.globals_handle:
+            self.global_tier |= 1 << handle
+
+        if old_parent != NOTHING:
+            self._touch(old_parent)
+        if new_parent != NOTHING:
+            self._touch(new_parent)
+
+
+    def flag_changed(self, handle: int, bit: int) -> None:
+        """Called by the world for every FSET/FCLEAR"""
+        if (self.see_inside_mask >> bit) & 1:
+            self._touch(handle)
+
+
+    # ========== QUERIES ==========
+    def _reachable(self, container: int, actor: int) -> int:
+        """Bitset of everything reachable inside container through open/transparent/surface containers"""
+        tree = self.world.tree
+        words = self.world.flags.words
+        found = 0
+        stack = [container]
+        while stack:
+            for child in tree.children(stack.pop()):
+                found |= 1 << child
+                if tree.first[child] != NOTHING and (words[child] & self.see_inside_mask or child == actor):
+                    stack.append(child)
+        return found
+
+
+    def local(self, room: int) -> int:
+        """Local tier of a room (the room itself and what can be seen in it)"""
+        if room in self._dirty or room not in self._local:
+            player = self.world.player_handle
+            self._local[room] = (1 << room) | self._reachable(room, player)
+            self._dirty.discard(room)
+        return self._local[room]
+
+
+    def scope(self, room: int, actor: Optional[int] = None) -> int:
+        """
+        Bitset of everything that can be referred to from a room.  The actor's inventory is always in scope,
+        even when the actor is not the player.
+        """
+        result = self.local(room) | self.room_globals.get(room, 0) | self.global_tier
+        # The player's inventory is part of the cached Local tier of the room the player is in
+        if actor is not None and (actor != self.world.player_handle or self.room_of(actor) != room):
+            result |= self._reachable(actor, actor)
+        return result
+
+
+    def in_scope(self, handle: int, room: int, actor: Optional[int] = None) -> bool:
+        return (self.scope(room, actor) >> handle) & 1 == 1
+
+
+    def handles(self, room: int, actor: Optional[int] = None) -> Iterator[int]:
+        return FlagStore.handles(self.scope(room, actor))
@@ -0,0 +1,171 @@
+###############################################################################
+#   world/snapshot.py
+#
+#   Compiled world snapshot cache.  Parsing every JSON world file and pushing
+#   each entry through Object.from_json / Room.from_json dominates a cold
+#   start, so once a world has been built from JSON the resulting registries
+#   are pickled next to the data files.  The snapshot is keyed on the Manifest
+#   and on the size/mtime/content hash of every file it lists - if any of
+#   those change the snapshot is ignored and the world is rebuilt from JSON.
+#
+###############################################################################
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.game_object import BaseObj, Manifest
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bump this whenever the layout of the pickled registries (or the classes in
+# core.game_object) changes in a way that makes old snapshots unusable.
+SNAPSHOT_FORMAT = 3
+
+# (mtime_ns, size, sha256) for a single source file
+SourceStamp = Tuple[int, int, str]
+
+
+def _hash_file(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def source_stamp(path: Path) -> SourceStamp:
+    """Record the size, mtime and content hash of a source file"""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, _hash_file(path))
+
+
+def stamp_is_current(path: Path, stamp: SourceStamp) -> bool:
+    """
+    Check a recorded stamp against the file on disk.  The mtime/size pair is the fast path; the content
+    hash is only computed when the mtime moved without the size changing (touch, checkout, copy).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+
+    mtime_ns, size, digest = stamp
+    if st.st_size != size:
+        return False
+    if st.st_mtime_ns == mtime_ns:
+        return True
+
+    return _hash_file(path) == digest
+
+
+class WorldSnapshot:
+    """
+    Reads and writes the compiled snapshot of the world registries for a single game module.
+    """
+
+    def __init__(self, manifest: Manifest, data_path: Path, cache_dir: Optional[Path] = None):
+        self.manifest: Manifest = manifest
+        self.data_path: Path = data_path
+        self.cache_dir: Path = cache_dir if cache_dir else data_path / "__pycache__"
+        self.cache_file: Path = self.cache_dir / f"{manifest.game_name.lower()}.world.pickle"
+
+
+    @property
+    def source_files(self) -> List[str]:
+        """All world data files listed in the manifest, in load order"""
+        return list(self.manifest.object_files) + list(self.manifest.room_files)
+
+
+    def manifest_key(self) -> str:
+        """Hash of the parts of the manifest that affect what gets loaded"""
+        key = repr((SNAPSHOT_FORMAT,
+                    self.manifest.game_name,
+                    self.manifest.version,
+                    self.source_files))
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+    def _stamp(self, filename: str) -> SourceStamp:
+        return source_stamp(self.data_path / filename)
+
+
+    def _is_current(self, filename: str, stamp: SourceStamp) -> bool:
+        return stamp_is_current(self.data_path / filename, stamp)
+
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the registries from the snapshot if it is still valid for the manifest and source files.
+
+        Returns:
+            The registries dictionary, or None if there is no usable snapshot
+        """
+        if not self.cache_file.exists():
+            logger.debug(f"No world snapshot at {self.cache_file}")
+            return None
+
+        try:
+            with open(self.cache_file, 'rb') as f:
+                record: Dict[str, Any] = pickle.load(f)
+
+            if record.get("format") != SNAPSHOT_FORMAT or record.get("manifest") != self.manifest_key():
+                logger.info("World snapshot is for a different manifest - rebuilding from JSON")
+                return None
+
+            sources: Dict[str, SourceStamp] = record.get("sources", {})
+            if set(sources.keys()) != set(self.source_files):
+                logger.info("World snapshot source list changed - rebuilding from JSON")
+                return None
+
+            for filename, stamp in sources.items():
+                if not self._is_current(filename, stamp):
+                    logger.info(f"World source {filename} changed - rebuilding from JSON")
+                    return None
+
+            # Object IDs are handed out by a class counter; make sure anything created after the
+            # snapshot is restored does not collide with the IDs stored in it.
+            BaseObj._classid = max(BaseObj._classid, record.get("classid", 0))
+
+            logger.info(f"Loaded world snapshot from {self.cache_file}")
+            return record["registries"]
+
+        except Exception as e:
+            logger.warning(f"Unable to read world snapshot {self.cache_file}: {e}")
+            return None
+
+
+    def save(self, registries: Dict[str, Any]) -> bool:
+        """
+        Write the registries out as a snapshot stamped with the current state of the source files.
+
+        Args:
+            registries: Registry name -> registry contents, as built from JSON
+
+        Returns:
+            True if the snapshot was written
+        """
+        try:
+            record = {
+                "format": SNAPSHOT_FORMAT,
+                "manifest": self.manifest_key(),
+                "sources": {filename: self._stamp(filename) for filename in self.source_files},
+                "classid": BaseObj._classid,
+                "registries": registries,
+            }
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Write to a temp file and rename so concurrent workers never see a partial snapshot
+            tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.cache_file)
+
+            logger.info(f"Saved world snapshot to {self.cache_file}")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Unable to write world snapshot {self.cache_file}: {e}")
+            return False
@@ -0,0 +1,85 @@
+###############################################################################
+#   world/symbols.py
+#
+#   Symbol table interning world names ("MRS-ROBNER", "P?CORRIDOR",
+#   "LADDER-FLAG") to dense integer handles.  The world state is kept in
+#   handle indexed arrays so the hot paths never hash the string names; the
+#   API accepts either form and converts at the boundary.
+#
+###############################################################################
+from typing import Dict, Iterator, List, Optional, Union
+
+from core.exceptions import ObjectNotFoundError
+
+
+# Anything the API accepts as a reference to a symbol
+SymbolRef = Union[int, str]
+
+# Handle 0 is never assigned to a name - like ZIL's false object it means "nothing"
+NOTHING = 0
+
+
+class SymbolTable:
+    """
+    Bidirectional name <-> handle mapping.  Handles are assigned densely from 1 in interning order and
+    never reused, so they can index flat arrays.
+    """
+
+    def __init__(self, prefix: str = ""):
+        self.prefix: str = prefix                   # Optional ZIL prefix stripped from names (e.g. "P?")
+        self._handles: Dict[str, int] = {}
+        self._names: List[Optional[str]] = [None]   # slot 0 is NOTHING
+
+    def _normalize(self, name: str) -> str:
+        if self.prefix and name.startswith(self.prefix):
+            return name[len(self.prefix):]
+        return name
+
+    def intern(self, name: str) -> int:
+        """Return the handle for a name, assigning the next free handle if it is new"""
+        name = self._normalize(name)
+        handle = self._handles.get(name)
+        if handle is None:
+            handle = len(self._names)
+            self._handles[name] = handle
+            self._names.append(name)
+        return handle
+
+    def get(self, name: str) -> Optional[int]:
+        """Return the handle for a name, or None if it has never been interned"""
+        return self._handles.get(self._normalize(name))
+
+    def handle(self, ref: SymbolRef) -> int:
+        """
+        Resolve a name or handle to a handle.
+
+        Raises:
+            ObjectNotFoundError if the name was never interned or the handle is out of range
+        """
+        if isinstance(ref, int):
+            if 0 < ref < len(self._names):
+                return ref
+            raise ObjectNotFoundError(f"Invalid handle {ref}")
+
+        handle = self._handles.get(self._normalize(ref))
+        if handle is None:
+            raise ObjectNotFoundError(f"Unknown symbol {ref}")
+        return handle
+
+    def name(self, handle: int) -> Optional[str]:
+        """Return the name for a handle (None for NOTHING)"""
+        return self._names[handle]
+
+    def __contains__(self, ref: object) -> bool:
+        if isinstance(ref, int):
+            return 0 < ref < len(self._names)
+        if isinstance(ref, str):
+            return self._normalize(ref) in self._handles
+        return False
+
+    def __len__(self) -> int:
+        """Size of a handle indexed array for this table (includes the NOTHING slot)"""
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._handles)
@@ -0,0 +1,102 @@
+###############################################################################
+#   world/vocabulary.py
+#
+#   Vocabulary index for noun phrase matching.  Every Object and Room carries
+#   synonyms and adjectives from the world files; this indexes them once as
+#   word -> bitset of handles so that resolving "small red button" is an
+#   intersection of precomputed bitsets (restricted to the current scope)
+#   instead of a scan over every object.
+#
+###############################################################################
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.game_object import BaseObj
+
+
+# Words the parser drops from a noun phrase
+ARTICLES = frozenset(("the", "a", "an", "some"))
+
+
+class VocabularyIndex:
+    """
+    Noun (synonym) and adjective bitsets over world handles.
+    """
+
+    def __init__(self):
+        self.nouns: Dict[str, int] = {}                         # word -> bitset of handles
+        self.adjectives: Dict[str, int] = {}                    # word -> bitset of handles
+        self._words: Dict[int, Tuple[List[str], List[str]]] = {}  # handle -> (nouns, adjectives) indexed
+
+
+    @staticmethod
+    def _add(table: Dict[str, int], word: str, bit: int) -> None:
+        table[word] = table.get(word, 0) | bit
+
+    @staticmethod
+    def _drop(table: Dict[str, int], word: str, bit: int) -> None:
+        remaining = table.get(word, 0) & ~bit
+        if remaining:
+            table[word] = remaining
+        else:
+            table.pop(word, None)
+
+
+    def add(self, handle: int, entity: BaseObj) -> None:
+        """Index (or re-index) an entity's synonyms and adjectives"""
+        self.remove(handle)
+
+        nouns = [word.lower() for word in entity.synonyms or []]
+        adjectives = [word.lower() for word in entity.adjectives or []]
+        bit = 1 << handle
+        for word in nouns:
+            self._add(self.nouns, word, bit)
+        for word in adjectives:
+            self._add(self.adjectives, word, bit)
+        self._words[handle] = (nouns, adjectives)
+
+
+    def remove(self, handle: int) -> None:
+        """Drop an entity's words from the index"""
+        words = self._words.pop(handle, None)
+        if words is None:
+            return
+
+        bit = 1 << handle
+        nouns, adjectives = words
+        for word in nouns:
+            self._drop(self.nouns, word, bit)
+        for word in adjectives:
+            self._drop(self.adjectives, word, bit)
+
+
+    def is_noun(self, word: str) -> bool:
+        return word.lower() in self.nouns
+
+    def is_adjective(self, word: str) -> bool:
+        return word.lower() in self.adjectives
+
+
+    def match(self, words: Iterable[str], within: int = -1) -> int:
+        """
+        Bitset of the handles matching a noun phrase.  The last word is the noun and any words before it are
+        adjectives; articles are ignored.  A phrase that is only adjectives ("take the red") matches on the
+        adjectives alone.
+
+        Args:
+            words: The words of the noun phrase
+            within: Bitset to restrict the match to (normally the current scope)
+        """
+        phrase: List[str] = [word.lower() for word in words if word.lower() not in ARTICLES]
+        if not phrase:
+            return 0
+
+        noun: Optional[str] = phrase[-1] if phrase[-1] in self.nouns else None
+        adjectives = phrase[:-1] if noun else phrase
+
+        result = self.nouns[noun] & within if noun else within
+        for word in adjectives:
+            if not result:
+                break
+            result &= self.adjectives.get(word, 0)
+
+        return result
@@ -72,26 +72,74 @@ on context, making the game world feel more coherent and realistic.
 
 
 import sys
+import copy
 import logging
 import importlib
 import importlib.util
 import inspect
 import json
 
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, List, Set
 from pathlib import Path
 
 
 
-from core.game_object import Manifest, Object, Room
-from core.flags import ObjectFlag
+from core.game_object import Manifest, BaseObj, Object, Room
+from core.exceptions import ObjectNotFoundError, InvalidStateException
+from world.snapshot import WorldSnapshot
+from world.action_index import ActionIndex, LazyFunctionRegistry, load_lazy_module
+from world.symbols import SymbolTable, SymbolRef, NOTHING
+from world.flag_store import FlagStore, FlagRef
+from world.containment import ContainmentTree
+from world.occupancy import OccupancyIndex
+from world.scope import ScopeResolver
+from world.vocabulary import VocabularyIndex
+from world.navigation import NavigationGraph
+from world.corridors import CorridorIndex
+from world.globals_table import GlobalsTable
+from world.overlay import OverlayList
+from world.journal import ChangeJournal
+from world.fingerprint import ZobristKeys
 
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# ZIL's pseudo containers - objects in their own right that hold rooms and the two global object tiers
+ROOMS = "ROOMS"
+GLOBAL_OBJECTS = "GLOBAL-OBJECTS"
+LOCAL_GLOBALS = "LOCAL-GLOBALS"
+
+# ZIL property name -> attribute the value is loaded from (GETP/PUTP)
+OBJECT_PROPERTIES = {
+    "ACTION": "action",
+    "CAPACITY": "capacity",
+    "CHARACTER": "character",
+    "COUNT": "count",
+    "DESCFCN": "descfcn",
+    "FDESC": "fdesc",
+    "LDESC": "ldesc",
+    "SIZE": "size",
+    "STATE": "state",
+    "TEXT": "text",
+}
+ROOM_PROPERTIES = {
+    "ACTION": "action",
+    "LINE": "line",
+    "STATION": "station",
+    "CORRIDOR": "corridor",
+}
+
+
+def _same_value(old: Any, new: Any) -> bool:
+    """Whether a restore can skip writing a value.  0 == False, but the two print differently, so types must match."""
+    return type(old) is type(new) and old == new
+
+
+def _same_properties(old: Dict[int, Any], new: Dict[int, Any]) -> bool:
+    return old.keys() == new.keys() and all(_same_value(value, new[prop]) for prop, value in old.items())
+
+
 class WorldManager:
     """
     Central manager for the game world
@@ -106,7 +154,7 @@ class WorldManager:
 
         # Object registries
         self.loaded_modules: Dict[str, Any] = {}            # not really needed
-        self.function_registry: Dict[str, Callable] = {}
+        self.function_registry: LazyFunctionRegistry = LazyFunctionRegistry()
 
         self.objects: Dict[str, Object] = {}                # objects (local)
         self.local_globals: Dict[str, Object] = {}          # local global objects
@@ -118,6 +166,31 @@ class WorldManager:
 
         # Player
         self.player: Optional[Object] = None                # The player
+
+        # Symbol tables - every name used by the API is interned to a dense integer handle
+        self.symbols: SymbolTable = SymbolTable()                       # objects, rooms and pseudo containers
+        self.property_symbols: SymbolTable = SymbolTable(prefix="P?")   # property names
+
+        # Runtime world state, indexed by handle.  The Object/Room instances describe the world as loaded;
+        # everything that changes during play lives here.
+        self.entities: List[Optional[BaseObj]] = [None]     # handle -> Object/Room (None for pseudo containers)
+        self.tree: ContainmentTree = ContainmentTree(1)     # handle -> parent / first child / next sibling
+        self.occupancy: OccupancyIndex = OccupancyIndex()   # room handle -> PERSON handles in it
+        self.properties: List[Dict[int, Any]] = [{}]        # handle -> property handle -> value
+        self.globals: GlobalsTable = GlobalsTable()         # global handle (slot) -> value and write version
+        self.flags: FlagStore = FlagStore(1)                # handle -> flag word
+        self._person_bit: int = self.flags.bit("PERSON")
+        self.scope: ScopeResolver = ScopeResolver(self)     # what can be referred to from each room
+        self.vocabulary: VocabularyIndex = VocabularyIndex()  # synonyms/adjectives -> handles
+        self.navigation: NavigationGraph = NavigationGraph(self)  # room graph and next-hop table
+        self.corridors: CorridorIndex = CorridorIndex(self) # corridor masks and COR-n tables (line of sight)
+        self.goals: Dict[int, int] = {}                     # person handle -> room handle they are heading to
+        self.journal: ChangeJournal = ChangeJournal()       # what changed since the last save
+        self.undo_log: Any = None                           # core.undo.UndoLog told about writes, if recording
+        self.base: Optional['WorldManager'] = None          # world this one is an overlay of (see overlay())
+        self.zobrist_keys: ZobristKeys = ZobristKeys(self)  # keys of the incremental state hash
+        self.zobrist: int = 0                               # incremental hash of locations, flags, properties, globals
+        self.player_handle: int = NOTHING
         
         # Subsystem managers
         #self.room_manager = RoomManager()
@@ -141,17 +214,12 @@ class WorldManager:
                     logger.warning(f"Failed to load action module: {module_name}")
                     success = False
 
-            # 2. Load the objects (this includes doors)
-            for obj_file in self.manifest.object_files:
-                if not self._load_objects(self.data_path / obj_file):
-                    logger.error("Failed to load objects")
-                    success = False
+            # 2/3. Load the objects (this includes doors) and rooms - from the compiled snapshot if it is current
+            if not self._load_world_data():
+                success = False
 
-            # 3. Load the room objects
-            for room_file in self.manifest.room_files:
-                if not self._load_rooms(self.data_path / room_file):
-                    logger.error("Failed to load rooms")
-                    success = False
+            # 4. Intern every name and build the handle indexed runtime state
+            self._build_world_state()
 
             logger.info(f"Game module loaded: {success}")
             logger.info(f"World initialized with {len(self.objects)} objects, {len(self.local_globals)} local-globals, {len(self.global_objects)} global objects, {len(self.rooms)} rooms, and {len(self.function_registry)} functions")
@@ -184,6 +252,595 @@ class WorldManager:
 
 
 
+    def _load_world_data(self) -> bool:
+        """
+        Populate the object and room registries.  Uses the compiled world snapshot when it matches the manifest
+        and the files on disk, otherwise parses the JSON files and refreshes the snapshot.
+        """
+        use_snapshot = self.manifest.config.get("world_snapshot", True)
+        snapshot = WorldSnapshot(self.manifest, self.data_path)
+
+        if use_snapshot:
+            registries = snapshot.load()
+            if registries is not None:
+                self._restore_registries(registries)
+                return True
+
+        success = True
+
+        # Load the objects (this includes doors)
+        for obj_file in self.manifest.object_files:
+            if not self._load_objects(self.data_path / obj_file):
+                logger.error("Failed to load objects")
+                success = False
+
+        # Load the room objects
+        for room_file in self.manifest.room_files:
+            if not self._load_rooms(self.data_path / room_file):
+                logger.error("Failed to load rooms")
+                success = False
+
+        # Only cache a world that loaded cleanly
+        if use_snapshot and success:
+            snapshot.save(self._capture_registries())
+
+        return success
+
+
+    def _capture_registries(self) -> Dict[str, Any]:
+        """Registries that make up the loaded (pre game) world, for the snapshot"""
+        return {
+            "objects": self.objects,
+            "local_globals": self.local_globals,
+            "global_objects": self.global_objects,
+            "characters": self.characters,
+            "rooms": self.rooms,
+            "player": self.player,
+        }
+
+
+    def _restore_registries(self, registries: Dict[str, Any]) -> None:
+        """Install registries read back from the snapshot"""
+        self.objects = registries["objects"]
+        self.local_globals = registries["local_globals"]
+        self.global_objects = registries["global_objects"]
+        self.characters = registries["characters"]
+        self.rooms = registries["rooms"]
+        self.player = registries["player"]
+
+
+    def _build_world_state(self) -> None:
+        """
+        Intern all object, room and property names and populate the handle indexed state arrays from the
+        loaded registries.
+        """
+        def add(name: str, entity: Optional[BaseObj]) -> int:
+            handle = self.symbols.intern(name)
+            while len(self.entities) <= handle:
+                self.entities.append(None)
+                self.properties.append({})
+            self.flags.grow(len(self.entities))
+            self.tree.grow(len(self.entities))
+            if entity is not None and self.entities[handle] is None:
+                self.entities[handle] = entity
+                self.flags.load(handle, entity.flags)
+                self.vocabulary.add(handle, entity)
+            return handle
+
+        placements: List[tuple] = []                        # (handle, container handle) in load order
+
+        rooms_handle = add(ROOMS, None)
+        add(GLOBAL_OBJECTS, None)
+        add(LOCAL_GLOBALS, None)
+
+        for room_name, room in self.rooms.items():
+            handle = add(room_name, room)
+            placements.append((handle, rooms_handle))
+            self._load_properties(handle, room)
+
+        all_objects: List[Object] = list(self.objects.values()) + list(self.local_globals.values()) + \
+                                    list(self.global_objects.values()) + list(self.characters.values())
+        if self.player:
+            all_objects.append(self.player)
+
+        for obj in all_objects:
+            handle = add(obj.name, obj)
+            self._load_properties(handle, obj)
+
+        # Locations are resolved after every object has a handle since containers can be defined after
+        # their contents
+        for obj in all_objects:
+            if obj.location:
+                if obj.location not in self.symbols:
+                    logger.warning(f"Object {obj.name} is in unknown location {obj.location}")
+                placements.append((self.symbols.intern(obj.name), add(obj.location, None)))
+
+        # MOVE puts an object at the head of its container, so place them in reverse to keep load order
+        for handle, container in reversed(placements):
+            self.tree.move(handle, container)
+
+        if self.player:
+            self.player_handle = self.symbols.handle(self.player.name)
+        self.scope.build(rooms_handle, self.symbols.handle(GLOBAL_OBJECTS))
+        self.navigation.build()
+        self.corridors.build()
+        self.zobrist_keys.build()
+        self.zobrist = self.zobrist_keys.full(self)
+
+        self.occupancy.clear()
+        for person in FlagStore.handles(self.flags.having(self._person_bit)):
+            if self.tree.parent[person] != NOTHING:
+                self.occupancy.add(person, self.tree.parent[person])
+
+        logger.info(f"Interned {len(self.symbols) - 1} world symbols and {len(self.property_symbols) - 1} properties")
+
+
+    def _load_properties(self, handle: int, entity: BaseObj) -> None:
+        """Set an entry's initial property values (OBJECT_PROPERTIES / ROOM_PROPERTIES) from its description"""
+        if isinstance(entity, Room):
+            sources = [(entity, ROOM_PROPERTIES), (entity.navigation, ROOM_PROPERTIES)]
+        else:
+            sources = [(entity, OBJECT_PROPERTIES)]
+
+        for source, mapping in sources:
+            for prop_name, attr in mapping.items():
+                value = getattr(source, attr, None)
+                if value:
+                    self.properties[handle][self.property_symbols.intern(prop_name)] = value
+
+
+    def reload_world_file(self, filename: str) -> bool:
+        """
+        Re-read one of the manifest's object or room files during play.  The static descriptions (text,
+        vocabulary, exits...) of its entries are replaced and only those entries are re-indexed; the runtime
+        state (locations, flags, properties) of existing objects is kept.  New entries are added to the world.
+        The derived indexes are updated for what changed - the exits and LOCAL-GLOBALS of the reloaded rooms,
+        the routes those exits can affect, and the hash keys, corridor masks and scope of the new entries.
+
+        Args:
+            filename: File name as listed in the manifest
+
+        Returns:
+            True if the file was reloaded
+        """
+        if filename in self.manifest.object_files:
+            if not self._load_objects(self.data_path / filename):
+                return False
+        elif filename in self.manifest.room_files:
+            if not self._load_rooms(self.data_path / filename):
+                return False
+        else:
+            logger.error(f"{filename} is not a world file in the manifest")
+            return False
+
+        registries = [self.rooms, self.objects, self.local_globals, self.global_objects, self.characters]
+        changed = [entity for registry in registries for entity in registry.values()
+                   if entity is not self.lookup(entity.name)]
+        if self.player and self.player is not self.lookup(self.player.name):
+            changed.append(self.player)
+
+        placements: List[tuple] = []                        # (handle, container handle) of new entries
+        rooms: Set[int] = set()                             # rooms whose exits must be recompiled
+        for entity in changed:
+            handle = self.symbols.get(entity.name)
+            if handle is None or self.entities[handle] is None:
+                # Brand new entry - give it a handle, flags and a place in the world like the initial load does
+                handle = self.symbols.intern(entity.name)
+                location = ROOMS if isinstance(entity, Room) else getattr(entity, "location", None)
+                container = self.symbols.intern(location) if location else NOTHING
+
+                size = len(self.symbols)
+                self.entities.extend([None] * (size - len(self.entities)))
+                self.properties.extend({} for _ in range(size - len(self.properties)))
+                self.flags.grow(size)
+                self.tree.grow(size)
+
+                self.flags.load(handle, entity.flags)
+                self._load_properties(handle, entity)
+                placements.append((handle, container))
+
+            self.entities[handle] = entity
+            self.vocabulary.add(handle, entity)
+            if isinstance(entity, Room):
+                rooms.add(handle)
+
+        # The new handles need their hash keys before they can be moved or hashed
+        self.zobrist_keys.grow()
+        keys = self.zobrist_keys
+        for handle, container in reversed(placements):
+            props = self.properties[handle]
+            self.zobrist ^= keys.flags(handle, self.flags.words[handle]) ^ keys.properties(handle, props)
+            if self.corridors.corridor_prop in props:
+                self.corridors.mask_changed(handle, props[self.corridors.corridor_prop])
+            self.move(handle, container)
+
+        # Only the reloaded rooms can have new exits or LOCAL-GLOBALS, plus any existing room whose exits name a
+        # new room or door, which did not resolve before
+        added = {self.symbols.name(handle) for handle, _ in placements}
+        if added:
+            rooms.update(self.symbols.handle(name) for name, room in self.rooms.items()
+                         if any(getattr(exit, "dest", None) in added or getattr(exit, "door_obj", None) in added
+                                for exit in room.exits.values()))
+        for room in rooms:
+            self.scope.room_changed(room)
+        self.navigation.rooms_changed(rooms)
+
+        logger.info(f"Reloaded {filename}: {len(changed)} entries re-indexed")
+        return True
+
+
+    def overlay(self) -> 'WorldManager':
+        """
+        A world for one session layered over this one.  The loaded registries, symbols and static indexes are
+        shared; the runtime state (containment, flags, properties, globals and the indexes derived from them)
+        is copy-on-write, so the session only holds what it has changed.  This world becomes the shared base
+        and must not be played (or reloaded) once sessions have been made from it.
+        """
+        session = copy.copy(self)
+        session.tree = self.tree.overlay()
+        session.flags = self.flags.overlay()
+        session.properties = OverlayList(self.properties)
+        session.globals = self.globals.overlay()
+        session.occupancy = self.occupancy.overlay()
+        session.scope = self.scope.overlay(session)
+        session.navigation = self.navigation.overlay(session)
+        session.corridors = self.corridors.overlay(session)
+        session.goals = dict(self.goals)
+        session.journal = ChangeJournal()
+        session.undo_log = None
+        session.base = self
+        session.zobrist_keys = self.zobrist_keys.overlay(session)
+        return session
+
+
+    def fork(self) -> 'WorldManager':
+        """
+        An independent copy of this world's state for a search or what-if branch.  A session world is forked
+        into a sibling overlay of the same base holding a copy of its changes, so the cost is proportional to
+        what the session has changed, not to the size of the world.  Only session worlds can be forked - a base
+        world is shared by its overlays and must not be played, so start a session with overlay() instead.
+        """
+        if self.base is None:
+            raise InvalidStateException("Only a session world can be forked - start one with overlay()")
+        return self.base.restore_delta(self.capture_delta())
+
+
+    def delta_entries(self) -> int:
+        """Number of state entries a session world holds over its base (a rough measure of its memory)"""
+        overlays = (self.tree.parent, self.tree.first, self.tree.next, self.tree.prev, self.flags.words,
+                    self.properties, self.globals.values)
+        return sum(len(links.changes) for links in overlays if isinstance(links, OverlayList))
+
+
+    def capture_delta(self) -> Dict[str, Any]:
+        """
+        Everything a session world (see overlay()) has changed relative to its base, as plain data that can be
+        pickled.  The derived indexes (scope, navigation, corridors) are brought up to date from it on restore;
+        occupancy is included for every room occupied here or in the base, since arrival order is not derivable.
+        """
+        tree = self.tree
+        rooms = set(self.occupancy.rooms())
+        if self.base is not None:
+            rooms.update(self.base.occupancy.rooms())
+        return {
+            "tree": [dict(links.changes) for links in (tree.parent, tree.first, tree.next, tree.prev)],
+            "flag_names": None if self.flags._shared_names else list(self.flags.names),
+            "flags": dict(self.flags.words.changes),
+            "properties": dict(self.properties.changes),
+            "global_names": None if self.globals._shared_names else self.globals.names[1:],
+            "globals": dict(self.globals.values.changes),
+            "goals": dict(self.goals),
+            "occupancy": {room: self.occupancy.occupants(room) for room in rooms},
+        }
+
+
+    def restore_delta(self, delta: Dict[str, Any]) -> 'WorldManager':
+        """
+        Rebuild a session world over this (base) world from capture_delta() data.
+
+        Returns:
+            The restored session world
+        """
+        session = self.overlay()
+        session.apply_delta(delta)
+        return session
+
+
+    def checkpoint(self) -> None:
+        """Clear the change journal - capture_changes() reports what is written from here on"""
+        self.journal.clear(len(self.flags.names), len(self.globals.names))
+
+
+    def capture_changes(self, full: bool = False) -> Dict[str, Any]:
+        """
+        The state written since the last checkpoint() (or all of it), in capture_delta() form.  Only the flag
+        and global names added since the checkpoint, and the occupancy of the containers moved into or out of
+        (or of people whose flags changed), are included unless full is set.
+        """
+        journal = self.journal
+        tree = self.tree
+        handles = range(len(self.entities))
+        slots = range(1, len(self.globals.names))
+        tree_handles = handles if full else journal.tree
+        flag_handles = handles if full else journal.flags
+        property_handles = handles if full else journal.properties
+        global_slots = slots if full else journal.globals
+        if full:
+            occupancy = self.occupancy.capture()
+        else:
+            rooms = journal.tree | {tree.parent[handle] for handle in journal.flags}
+            occupancy = {room: self.occupancy.occupants(room) for room in rooms if room != NOTHING}
+        return {
+            "tree": [{handle: links[handle] for handle in tree_handles if handle != NOTHING}
+                     for links in (tree.parent, tree.first, tree.next, tree.prev)],
+            "flag_names": self.flags.names[0 if full else journal.flag_count:],
+            "flags": {handle: self.flags.words[handle] for handle in flag_handles},
+            "properties": {handle: self.properties[handle] for handle in property_handles},
+            "property_names": [self.property_symbols.name(prop) for prop in range(1, len(self.property_symbols))],
+            "global_names": self.globals.names[1 if full else max(journal.global_count, 1):],
+            "globals": {slot: self.globals.values[slot] for slot in global_slots},
+            "goals": dict(self.goals),
+            "occupancy": occupancy,
+        }
+
+
+    def apply_delta(self, delta: Dict[str, Any]) -> None:
+        """
+        Write capture_delta()/capture_changes() data into this world and bring the derived indexes (occupancy,
+        scope, navigation, corridors) up to date with it.  Entries that already hold the value are not
+        written, so applying a record to a session world only adds what actually differs to its overlay, and
+        the cost is proportional to the size of the record.  Restored globals get new write versions (they are
+        never set back), so a version seen before still means the value seen before.
+        """
+        tree = self.tree
+        journal = self.journal
+        keys = self.zobrist_keys
+        moved: List[tuple] = []                             # (handle, old parent, new parent)
+        for handle, parent in delta["tree"][0].items():
+            if tree.parent[handle] != parent:
+                self.zobrist ^= keys.location(handle, tree.parent[handle]) ^ keys.location(handle, parent)
+                moved.append((handle, tree.parent[handle], parent))
+        for links, changes in zip((tree.parent, tree.first, tree.next, tree.prev), delta["tree"]):
+            for handle, value in changes.items():
+                if links[handle] != value:
+                    links[handle] = value
+                    journal.tree.add(handle)
+
+        flags = self.flags
+        for name in delta["flag_names"] or ():
+            flags.bit(name)
+        for handle, word in delta["flags"].items():
+            changed = flags.words[handle] ^ word
+            if changed:
+                # Bring the per-flag bitsets in line with the restored word
+                for bit in FlagStore.handles(changed):
+                    flags.columns[bit] ^= 1 << handle
+                    self.scope.flag_changed(handle, bit)
+                self.zobrist ^= keys.flags(handle, changed)
+                flags.words[handle] = word
+                journal.flags.add(handle)
+
+        for handle, props in delta["properties"].items():
+            if not _same_properties(self.properties[handle], props):
+                self.zobrist ^= keys.properties(handle, self.properties[handle]) ^ keys.properties(handle, props)
+                self.properties[handle] = props
+                journal.properties.add(handle)
+        for name in delta["global_names"] or ():
+            self.global_handle(name)
+        for slot, value in delta["globals"].items():
+            if not _same_value(self.globals.values[slot], value):
+                self.zobrist ^= keys.global_value(slot, self.globals.values[slot]) ^ keys.global_value(slot, value)
+                self.globals.set(slot, value)
+                journal.globals.add(slot)
+        self.goals = dict(delta["goals"])
+
+        # Derived indexes
+        self.occupancy.load_rooms(delta["occupancy"])
+        for handle, old_parent, new_parent in moved:
+            self.scope.moved(handle, old_parent, new_parent)
+        for door in self.navigation.door_edges.keys() & delta["flags"].keys():
+            self.navigation.door_changed(door)
+        for slot in delta["globals"]:
+            if slot in self.navigation.cond_edges:
+                self.navigation.global_changed(slot)
+            if slot in self.corridors.table_globals:
+                self.corridors.load_table(slot, self.globals.values[slot])
+        for handle, props in delta["properties"].items():
+            if self.corridors.corridor_prop in props:
+                self.corridors.mask_changed(handle, props[self.corridors.corridor_prop])
+
+
+    # ========== NPC GOALS ==========
+    def establish_goal(self, person: int, room: int) -> None:
+        """Start a person walking toward a room (ZIL's ESTABLISH-GOAL)"""
+        if self.tree.parent[person] == room:
+            self.goals.pop(person, None)
+        else:
+            self.goals[person] = room
+
+    def goal_step(self, person: int) -> int:
+        """
+        Move a person one room along the shortest open route to their goal.
+
+        Returns:
+            The room moved into, or NOTHING if the person has no goal or cannot currently get there
+        """
+        goal = self.goals.get(person)
+        if goal is None:
+            return NOTHING
+
+        step = self.navigation.next_hop(self.tree.parent[person], goal)
+        if step == NOTHING:
+            return NOTHING
+
+        self.move(person, step)
+        if step == goal:
+            del self.goals[person]
+        return step
+
+    def advance_goals(self) -> List[tuple]:
+        """
+        Step every person with a goal once.
+
+        Returns:
+            (person, from room, to room) for everyone who moved
+        """
+        moves = []
+        for person in list(self.goals):
+            here = self.tree.parent[person]
+            step = self.goal_step(person)
+            if step != NOTHING:
+                moves.append((person, here, step))
+        return moves
+
+
+    def match_noun_phrase(self, words: List[str], room: Optional[SymbolRef] = None,
+                          actor: Optional[SymbolRef] = None) -> List[int]:
+        """
+        Handles of the objects a noun phrase ("small red button") can refer to, restricted to what is in
+        scope from a room when one is given.
+        """
+        within = -1
+        if room is not None:
+            within = self.scope.scope(self.handle(room), self.handle(actor) if actor is not None else None)
+        return list(FlagStore.handles(self.vocabulary.match(words, within)))
+
+
+    # ========== HANDLE RESOLUTION ==========
+    def handle(self, ref: SymbolRef) -> int:
+        """Resolve an object/room name or handle to a handle"""
+        return self.symbols.handle(ref)
+
+    def name_of(self, handle: int) -> Optional[str]:
+        """Name of the object/room with the given handle (None for NOTHING)"""
+        return self.symbols.name(handle)
+
+    def lookup(self, ref: SymbolRef) -> Optional[BaseObj]:
+        """Return the Object/Room for a name or handle, or None if unknown"""
+        handle = ref if isinstance(ref, int) else self.symbols.get(ref)
+        if handle is None or not 0 < handle < len(self.entities):
+            return None
+        return self.entities[handle]
+
+    def global_handle(self, ref: SymbolRef) -> int:
+        """Resolve a global variable name or handle, interning new names"""
+        if isinstance(ref, int):
+            return self.globals.slot(ref)
+        handle = self.globals.slots.get(ref)
+        if handle is None:
+            handle = self.globals.intern(ref)
+            self.corridors.global_interned(ref, handle)
+        return handle
+
+
+    # ========== STATE ACCESS (handles only) ==========
+    def location_of(self, handle: int) -> int:
+        return self.tree.parent[handle]
+
+    def first_in(self, handle: int) -> int:
+        return self.tree.first[handle]
+
+    def next_in(self, handle: int) -> int:
+        return self.tree.next[handle]
+
+    def move(self, handle: int, dest: int) -> None:
+        tree = self.tree
+        old = tree.parent[handle]
+        # Every handle whose links the move writes
+        touched = (handle, old, tree.prev[handle], tree.next[handle], dest, tree.first[dest])
+        self.journal.tree.update(touched)
+        if self.undo_log is not None:
+            self.undo_log.touch_tree(touched)
+        self.zobrist ^= self.zobrist_keys.location(handle, old) ^ self.zobrist_keys.location(handle, dest)
+        if self.flags.test(handle, self._person_bit):
+            self.occupancy.discard(handle, old)
+            if dest != NOTHING:
+                self.occupancy.add(handle, dest)
+        tree.move(handle, dest)
+        self.scope.moved(handle, old, dest)
+
+    def remove(self, handle: int) -> None:
+        self.move(handle, NOTHING)
+
+    def occupants(self, room: int) -> List[int]:
+        return self.occupancy.occupants(room)
+
+    def head_count(self, room: int) -> int:
+        return self.occupancy.count(room)
+
+    def get_property(self, handle: int, prop: int, default: Any = None) -> Any:
+        return self.properties[handle].get(prop, default)
+
+    def put_property(self, handle: int, prop: int, value: Any) -> None:
+        if self.undo_log is not None:
+            self.undo_log.touch_property(handle)
+        # Replace rather than update the property dict - it may belong to the base world of a session
+        props = dict(self.properties[handle])
+        if prop in props:
+            self.zobrist ^= self.zobrist_keys.property(handle, prop, props[prop])
+        self.zobrist ^= self.zobrist_keys.property(handle, prop, value)
+        props[prop] = value
+        self.properties[handle] = props
+        self.journal.properties.add(handle)
+        if prop == self.corridors.corridor_prop:
+            self.corridors.mask_changed(handle, value)
+
+    def get_global(self, handle: int, default: Any = None) -> Any:
+        value = self.globals.values[handle]
+        return default if value is None else value
+
+    def set_global(self, handle: int, value: Any) -> None:
+        if self.undo_log is not None:
+            self.undo_log.touch_global(handle)
+        keys = self.zobrist_keys
+        self.zobrist ^= keys.global_value(handle, self.globals.values[handle]) ^ keys.global_value(handle, value)
+        self.globals.set(handle, value)
+        self.journal.globals.add(handle)
+        if handle in self.navigation.cond_edges:
+            self.navigation.global_changed(handle)
+        if handle in self.corridors.table_globals:
+            self.corridors.load_table(handle, value)
+
+    def has_flag(self, handle: int, bit: int) -> bool:
+        return self.flags.test(handle, bit)
+
+    def set_flag(self, handle: int, bit: int) -> None:
+        if self.undo_log is not None:
+            self.undo_log.touch_flags(handle)
+        if not self.flags.test(handle, bit):
+            self.zobrist ^= self.zobrist_keys.flag(handle, bit)
+        if bit == self._person_bit and not self.flags.test(handle, bit) and self.tree.parent[handle] != NOTHING:
+            self.occupancy.add(handle, self.tree.parent[handle])
+        self.flags.set(handle, bit)
+        self.journal.flags.add(handle)
+        self.scope.flag_changed(handle, bit)
+        if (self.navigation.door_mask >> bit) & 1:
+            self.navigation.door_changed(handle)
+
+    def clear_flag(self, handle: int, bit: int) -> None:
+        if self.undo_log is not None:
+            self.undo_log.touch_flags(handle)
+        if self.flags.test(handle, bit):
+            self.zobrist ^= self.zobrist_keys.flag(handle, bit)
+        if bit == self._person_bit:
+            self.occupancy.discard(handle, self.tree.parent[handle])
+        self.flags.clear(handle, bit)
+        self.journal.flags.add(handle)
+        self.scope.flag_changed(handle, bit)
+        if (self.navigation.door_mask >> bit) & 1:
+            self.navigation.door_changed(handle)
+
+    def with_flag(self, flag: FlagRef, location: Optional[SymbolRef] = None) -> List[int]:
+        """
+        Handles of every object/room with a flag set, optionally only those directly in a location.
+        """
+        if location is None:
+            return list(FlagStore.handles(self.flags.having(flag)))
+
+        bit = self.flags.bit(flag)
+        return [handle for handle in self.tree.children(self.handle(location)) if self.flags.test(handle, bit)]
+
+
     def _load_python_module(self, module_name: str, module_path: Path) -> bool:
         """
         Dynamically load a Python module containing action handlers.
@@ -202,6 +859,16 @@ class WorldManager:
             if not module_file.exists():
                 logger.debug(f"Module file not found: {module_file}")
                 return False
+
+            # By default only index the module - handlers are compiled the first time they are looked up
+            if self.manifest.config.get("lazy_actions", True):
+                module, namespace = load_lazy_module(f"deadline.game_modules.{module_name}", module_file)
+                self.loaded_modules[module_name] = module
+                self.function_registry.add_module(namespace)
+                self._reserve_globals(namespace.index.global_names)
+
+                logger.info(f"Indexed Python module: {module_name} ({len(namespace.index.handlers)} handlers)")
+                return True
             
             # Load the module dynamically
             spec = importlib.util.spec_from_file_location(
@@ -223,6 +890,7 @@ class WorldManager:
                 
                 # Register action handlers
                 self._register_action_handlers(module)
+                self._reserve_globals(ActionIndex.load(module_file).global_names)
             
                 logger.info(f"Loaded Python module: {module_name}")
                 return True
@@ -234,6 +902,14 @@ class WorldManager:
             return False
         
 
+    def _reserve_globals(self, names: List[str]) -> None:
+        """Give the globals an action module uses their slots before it runs"""
+        before = len(self.globals)
+        for name in names:
+            self.global_handle(name)
+        logger.info(f"Reserved {len(self.globals) - before} global variable slots")
+
+
     def _register_action_handlers(self, module: Any) -> None:
         """
         Register action handlers from a module.  Looks for functions ending with _F (ZIL convention).
@@ -279,7 +955,7 @@ class WorldManager:
                     self.local_globals[obj_name] = new_object
                     logger.info(f"Created id [{new_object.id}]  object: {obj_name} put into LOCAL-GLOBALS")
 
-                elif ObjectFlag.PERSON in new_object.flags:
+                elif "PERSON" in new_object.flags:
                     if new_object.character == 0:
                         self.player = new_object
                         logger.info(f"Created id [{new_object.id}]  object: {obj_name} Player object created")